@@ -3,11 +3,54 @@ import os
 from dotenv import load_dotenv
 import utils  # 같은 폴더의 utils.py
 from tabs import tab1_forecast, tab2_card, tab3_tax  # tabs 폴더 내부 파일들
+from src.modules.cache import get_analysis_cache, file_fingerprint, source_key
+from src.modules.columnar_cache import load_or_build
+from src.modules.config import get_history_journal_files
+from src.modules.history_store import load_merchant_history
+from src.modules.merchant_ids import build_merchant_dictionary
+from src.modules.data_loader import optimize_journal_dtypes
+from src.modules.profiling import Profiler
+from src.modules.config import PROFILE_JSON_PATH
+from src import analysis
 import pandas as pd
 
 load_dotenv()
 st.set_page_config(page_title="AI 가결산 대시보드 Pro", layout="wide")
 
+# 위젯 조작(rerun)마다 파일을 다시 파싱하지 않도록 파일 지문 기반 캐시 사용
+cache = get_analysis_cache()
+CURRENT_YEAR = 2025
+# 단계별 계측 (APP_PROFILE=1 일 때만, 실행마다 새로 기록)
+profiler = Profiler()
+
+def load_cached(uploaded_file, default_path):
+    fp = file_fingerprint(uploaded_file, default_path)
+    if fp is None: return None, None
+    data = cache.get_or_compute(("json", fp), lambda: profiler.timed(
+        "json_load", lambda: utils.load_local_or_uploaded(uploaded_file, default_path)))
+    return fp, data
+
+def load_journal_cached(uploaded_file, default_path):
+    # 분개장은 필요한 컬럼만 스트리밍으로 읽어 바로 전처리 (원본 JSON 트리를 보관하지 않음)
+    fp = file_fingerprint(uploaded_file, default_path)
+    if fp is None: return None, pd.DataFrame()
+    # 프로세스 캐시 → 디스크 컬럼 캐시(Feather) → JSON 파싱 순으로 조회 (범주형/정수 축소 dtype으로 보관)
+    df = cache.get_or_compute(("journal", fp), lambda: load_or_build(
+        "journal", uploaded_file, default_path,
+        lambda: profiler.timed("preprocess_journal", lambda: optimize_journal_dtypes(utils.preprocess_journal(
+            profiler.timed("json_load", lambda: utils.load_frame_local_or_uploaded(
+                uploaded_file, default_path, utils.JOURNAL_COLUMNS), rows=len))), rows=len)))
+    return fp, df
+
+def load_card_cached(uploaded_file, default_path):
+    fp = file_fingerprint(uploaded_file, default_path)
+    if fp is None: return None, pd.DataFrame()
+    df = cache.get_or_compute(("card", fp), lambda: load_or_build(
+        "card", uploaded_file, default_path,
+        lambda: profiler.timed("json_load", lambda: utils.load_frame_local_or_uploaded(
+            uploaded_file, default_path, utils.CARD_COLUMNS), rows=len)))
+    return fp, df
+
 # --- 사이드바 ---
 with st.sidebar:
     st.header("⚙️ 설정")
@@ -21,40 +64,116 @@ with st.sidebar:
     file_2025_up = st.file_uploader("2025 분개장", type="json")
     file_card_up = st.file_uploader("신용카드 내역", type="json")
     file_rec_up = st.file_uploader("신고서 데이터", type="json")
+    file_tb_up = st.file_uploader("전년도 합계잔액시산표", type="json")
     
     # 데이터 로드 실행 (utils 함수 사용)
     # 주의: 로컬 파일명은 실제 파일명과 일치해야 합니다.
-    json_pl = utils.load_local_or_uploaded(file_pl_up, "jsons/손익계산서_24년_25년.json")
-    json_2024 = utils.load_local_or_uploaded(file_2024_up, "jsons/2024.json")
-    json_2025 = utils.load_local_or_uploaded(file_2025_up, "jsons/2025.json")
-    json_card = utils.load_local_or_uploaded(file_card_up, "jsons/신용카드_6.json") # 파일명 수정됨
-    json_rec = utils.load_local_or_uploaded(file_rec_up, "jsons/rec_prd.json")
+    with profiler.stage("load"):
+        fp_pl, json_pl = load_cached(file_pl_up, "jsons/손익계산서_24년_25년.json")
+        fp_2024, df_2024 = load_journal_cached(file_2024_up, "jsons/2024.json")
+        fp_2025, df_2025 = load_journal_cached(file_2025_up, "jsons/2025.json")
+        fp_card, df_card = load_card_cached(file_card_up, "jsons/신용카드_6.json") # 파일명 수정됨
+        fp_rec, json_rec = load_cached(file_rec_up, "jsons/rec_prd.json")
+        fp_tb, json_tb = load_cached(file_tb_up, "jsons/합계잔액시산표_24년.json")
     
-    if json_2025: st.success("✅ 데이터 로드 완료")
+    if not df_2025.empty: st.success("✅ 데이터 로드 완료")
     else: st.error("❌ 2025년 데이터가 필요합니다.")
 
-# --- 데이터 처리 (utils 함수 사용) ---
-df_2024 = utils.preprocess_journal(json_2024)
-df_2025 = utils.preprocess_journal(json_2025)
+    st.markdown("---")
+    st.header("🔗 카드 매칭 기준")
+    match_window = st.number_input("허용 일수 (±일)", min_value=0, max_value=7, value=2, help="입력 시차를 허용할 일수")
+    match_tol = st.number_input("허용 금액 오차 (원)", min_value=0, value=0, step=100)
 
-# 1. 전년도 학습
-history_map = utils.build_history_map(df_2024)
+    st.markdown("---")
+    st.header("🧾 세무 조정")
+    # 신고서(rec_prd)에 없는 조정 내역은 수기 입력
+    disallowed = st.number_input("필요경비 부인액 (원)", min_value=0, value=analysis.DEFAULT_DISALLOWED, step=100000,
+                                 help="신고서에 없는 조정 내역 (예: 차량비용 부인) - 기본값은 전년도 세무조정 금액")
 
-revenue_ytd, expense_ytd = 0, 0
-rev_24_total, exp_24_total = 0, 0
+# --- 데이터 처리 (utils 함수 사용) ---
+# 1. 과거 연도 학습: jsons/<연도>.json 이력은 바뀐 연도만 다시 집계해 디스크에 보관, 업로드한 전년도 분개장은 그 해를 교체
+with profiler.stage("history"):
+    history_files = get_history_journal_files(CURRENT_YEAR)
+    history_fps = tuple((year, file_fingerprint(None, str(path))) for year, path in history_files.items())
+    merchant_history = cache.get_or_compute(
+        ("merchant_history", history_fps),
+        lambda: load_merchant_history(history_files, lambda path: load_journal_cached(None, str(path))[1])
+    )
+    if file_2024_up is not None and not df_2024.empty:
+        merchant_history = cache.get_or_compute(("merchant_history", history_fps, fp_2024),
+                                                lambda: merchant_history.add_year(df_2024, CURRENT_YEAR - 1, source=fp_2024))
+    history_map = cache.get_or_compute(("history", history_fps, fp_2024), merchant_history.to_map)
 
-if json_pl:
-    rev_24_total, exp_24_total = utils.parse_income_statement(json_pl)
-if not df_2025.empty:
-    revenue_ytd, expense_ytd = utils.calculate_financials(df_2025)
+with profiler.stage("income_statement"):
+    # 손익계산서는 캐시된 색인 표로 한 번만 파싱하고, 전년도 매출/비용도 그 표의 구간 합계에서 읽음
+    statement = cache.get_or_compute(("income_statement", fp_pl), lambda: analysis.parse_income_statement_tree(json_pl))
+    rev_24_total, exp_24_total = analysis.prior_year_totals(statement)
+# 당해 분개장/카드는 같은 원본의 새 버전(월 추가분)이면 바뀐 전표·카드만 반영 (결과는 전체 재계산과 같음)
+# 증분 상태는 세션마다 따로 보관 (다른 세션이 같은 파일명으로 올린 다른 내용과 섞이지 않음)
+tracker_key = (source_key(file_2025_up, "jsons/2025.json"), source_key(file_card_up, "jsons/신용카드_6.json"),
+               match_window, match_tol)
+if st.session_state.get("tracker_key") != tracker_key:
+    st.session_state["tracker_key"] = tracker_key
+    st.session_state["tracker"] = analysis.IncrementalAnalysis(match_window, match_tol)
+tracker = st.session_state["tracker"]
+# 이후 결과는 모두 update가 잠금 안에서 만든 스냅샷에서 읽음 (df_2025/df_card 내용과 항상 일치)
+snapshot = profiler.timed("incremental_update", lambda: tracker.update(df_2025, None if df_card.empty else df_card),
+                          rows=len(df_2025))
+# 계정 × 월 큐브: 손익 집계/추정/월별 추이는 모두 큐브에서 읽음 (원본 분개장 재스캔 없음)
+cube = snapshot.cube
+with profiler.stage("seasonal"):
+    cube_2024 = cache.get_or_compute(("cube", fp_2024), lambda: analysis.build_monthly_cube(df_2024))
+    # 전년도 분개장이 있으면 계정별 월 프로파일로 남은 달을 예측
+    seasonal = None
+    if not cube_2024.empty:
+        seasonal = cache.get_or_compute(("seasonal", fp_2025, fp_2024), lambda: analysis.forecast_seasonal(cube, cube_2024))
 
-card_gap_amt = 0
-missing_df = pd.DataFrame() # 빈 데이터프레임 초기화 (pandas 필요)
-import pandas as pd # 여기서 import 하거나 맨 위에서 함
+# 전년도 시산표 기말 잔액 = 당해 기초 잔액 (재무상태 계정만 분개장 증감과 합산)
+with profiler.stage("trial_balance"):
+    trial_balance = cache.get_or_compute(("trial_balance", fp_tb), lambda: analysis.load_trial_balance(json_tb))
+    balances = None
+    if not trial_balance.empty:
+        balances = cache.get_or_compute(("balances", fp_tb, fp_2025), lambda: trial_balance.roll_forward(cube))
 
-if not df_2025.empty and json_card:
-    # history_map 전달
-    card_gap_amt, missing_df = utils.analyze_card_gap(df_2025, json_card, history_map)
+with profiler.stage("analyze_card_gap", rows=len(df_card)):
+    gap = analysis.GapResult()
+    if not df_2025.empty and not df_card.empty:
+        # 거래처 ID 사전: 분개장·카드의 정규화 이름/거래처코드/사업자번호를 한 ID로 묶어 이력 힌트를 정수 조인
+        merchants = cache.get_or_compute(("merchants", fp_2024, fp_2025, fp_card),
+                                         lambda: build_merchant_dictionary(df_2024, df_2025, df_card))
+        gap = cache.get_or_compute(
+            ("card_gap", fp_2025, fp_card, fp_2024, history_fps, match_window, match_tol),
+            lambda: snapshot.gap(history_map, merchants)
+        )
+    card_gap_amt, missing_df = gap.total_gap, gap.missing
+
+# 2. 손익 추정 및 세금 시나리오 (탭은 결과만 표시)
+# 타소득·소득공제는 전년도 신고서에서, 필요경비 부인액은 사이드바 입력에서
+with profiler.stage("forecast_tax"):
+    tax_return = cache.get_or_compute(("tax_return", fp_rec), lambda: analysis.parse_tax_return(json_rec))
+    other_income, deduction = analysis.tax_inputs_from_return(tax_return)
+    # 필요경비 부인액은 신고서에서 읽지 않으므로 세액 반영 여부를 함께 표시
+    disallowed_note = (f"필요경비 부인액 {disallowed:,.0f}원은 사이드바 입력값으로 세액에 반영" if disallowed
+                       else "필요경비 부인액은 세액에 포함되지 않음 (0원)")
+    if not tax_return.empty:
+        st.sidebar.caption(f"신고서 기준 타소득 {other_income:,.0f}원 · 소득공제 {deduction:,.0f}원 · {disallowed_note}")
+    else:
+        st.sidebar.caption(disallowed_note)
+    forecast = analysis.forecast_from_cube(cube, rev_24_total, card_gap_amt)
+    # 남은 달 부트스트랩 분포 (전년 + 당해 실적 월 리샘플링, 시드 고정으로 재실행해도 같은 밴드)
+    montecarlo = None
+    if not cube.empty:
+        montecarlo = cache.get_or_compute(
+            ("montecarlo", fp_2025, fp_2024, card_gap_amt, other_income, deduction, disallowed),
+            lambda: analysis.simulate_landing(
+                cube, cube_2024, card_gap_amt, other_income, deduction, disallowed, seed=0)
+        )
+    tax_results = analysis.simulate_all_scenarios(forecast, card_gap_amt, other_income, deduction, disallowed)
+    tax_sweep = analysis.sweep_scenarios(
+        forecast, card_gap_amt, other_income, deduction, disallowed,
+        gap_ratio=[0.0, 0.25, 0.5, 0.75, 1.0],
+        extra_spend=range(0, 20000001, 5000000)
+    )
 
 # --- 메인 화면 (탭 연결) ---
 if not df_2025.empty:
@@ -62,18 +181,25 @@ if not df_2025.empty:
     
     tab1, tab2, tab3 = st.tabs(["📈 손익 예측", "💳 카드 누락 분석", "💰 세금 시뮬레이터"])
     
-    with tab1:
-        # Tab 1 렌더링 및 예측값 받아오기
-        forecast_data = tab1_forecast.render(revenue_ytd, expense_ytd, rev_24_total, card_gap_amt)
+    with tab1, profiler.stage("render_forecast"):
+        tab1_forecast.render(forecast, cube, seasonal, montecarlo, balances, statement)
         
-    with tab2:
+    with tab2, profiler.stage("render_card"):
         # Tab 2 렌더링
-        tab2_card.render(card_gap_amt, missing_df, api_key)
+        tab2_card.render(card_gap_amt, missing_df, api_key, df_2024, gap.matches)
         
-    with tab3:
-        # Tab 3 렌더링 (Tab 1의 결과값 전달)
-        # 고정 변수들 (타소득 등)은 여기서 전달
-        tab3_tax.render(forecast_data, card_gap_amt, 7343097, 16581120, 2535610)
+    with tab3, profiler.stage("render_tax"):
+        tab3_tax.render(tax_results, tax_sweep)
 
 else:
-    st.info("👈 데이터를 로드해주세요.")
\ No newline at end of file
+    st.info("👈 데이터를 로드해주세요.")
+
+# --- 성능 패널 (APP_PROFILE=1) : 이번 실행의 단계별 소요 시간/행 수/메모리 증감 ---
+if profiler.enabled:
+    profile_json = profiler.to_json(PROFILE_JSON_PATH or None)
+    with st.sidebar:
+        st.markdown("---")
+        st.header("⏱️ 성능")
+        st.caption(f"이번 실행 {profiler.total_ms:,.0f} ms (캐시 적중 단계는 0에 가까움)")
+        st.dataframe(profiler.to_frame(), hide_index=True, use_container_width=True)
+        st.download_button("JSON 내보내기", profile_json, file_name="profile.json", mime="application/json")
\ No newline at end of file
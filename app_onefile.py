@@ -1,8 +1,7 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
-import google.generativeai as genai
-import plotly.graph_objects as go
 import os
 from dotenv import load_dotenv
 from collections import Counter
@@ -103,16 +102,29 @@ def build_history_map(df_2024):
         
     return history
 
+STATUS_NAMES = {
+    1: "미추천",
+    2: "확정",
+    3: "확정가능",
+    5: "삭제전표",
+    6: "불공제"
+}
+
 def get_status_name(code):
     """전표상태 코드 매핑"""
-    mapping = {
-        1: "미추천",
-        2: "확정",
-        3: "확정가능",
-        5: "삭제전표",
-        6: "불공제"
-    }
-    return mapping.get(code, f"기타({code})")
+    return STATUS_NAMES.get(code, f"기타({code})")
+
+def _card_text(df_card, col):
+    """카드 문자열 컬럼 (결측은 빈 문자열)"""
+    if col not in df_card.columns:
+        return pd.Series('', index=df_card.index)
+    return df_card[col].fillna('').astype(str).str.strip()
+
+def _card_number(df_card, col):
+    """카드 숫자 컬럼 (결측은 0)"""
+    if col not in df_card.columns:
+        return pd.Series(0, index=df_card.index)
+    return pd.to_numeric(df_card[col], errors='coerce').fillna(0)
 
 def analyze_card_gap(df_journal, card_data, history_map):
     """카드 내역 분석 (업종, 상태, 전년도 이력 포함)"""
@@ -122,60 +134,62 @@ def analyze_card_gap(df_journal, card_data, history_map):
     if not card_list: return 0, pd.DataFrame()
     
     df_card = pd.DataFrame(card_list)
+    card_date = _card_text(df_card, 'da_sbook')
+    card_amt = _card_number(df_card, 'mn_total')
+    status = _card_number(df_card, 'ty_jungstat').astype('int64')
     
+    # 일자+금액 기준 anti-join으로 장부 미반영 여부 판단 (행 단위 루프 없음)
     if 'da_date' in df_journal.columns and 'mn_bungae1' in df_journal.columns:
-        journal_keys = set(df_journal['da_date'] + "_" + df_journal['mn_bungae1'].astype(int).astype(str))
+        journal_keys = pd.DataFrame({
+            'date': df_journal['da_date'].astype(str),
+            'amt': df_journal['mn_bungae1'].astype('int64'),
+        }).drop_duplicates()
+        journal_keys['hit'] = True
+        card_keys = pd.DataFrame({'date': card_date, 'amt': card_amt.astype('int64')})
+        matched = card_keys.merge(journal_keys, on=['date', 'amt'], how='left')['hit'].notna().to_numpy()
     else:
-        journal_keys = set()
+        matched = np.zeros(len(df_card), dtype=bool)
     
-    unmatched_items = []
-    total_gap = 0
+    # 상태값 필터링 없이 모든 미반영 내역을 보여주되, 합계는 '확정'만 포함하거나 사용자가 선택하게 할 수 있음
+    # 여기서는 리스트에는 다 보여주고, gap 계산은 '확정'된 것만 수행
+    missing = ~matched
+    df_miss = df_card[missing]
+    if df_miss.empty: return 0, pd.DataFrame()
     
-    for _, row in df_card.iterrows():
-        key = str(row.get('da_sbook','')) + "_" + str(int(row.get('mn_total', 0)))
-        status_code = row.get('ty_jungstat', 0)
-        status_name = get_status_name(status_code)
-        
-        # 상태값 필터링 없이 모든 미반영 내역을 보여주되, 합계는 '확정'만 포함하거나 사용자가 선택하게 할 수 있음
-        # 여기서는 리스트에는 다 보여주고, gap 계산은 '확정'된 것만 수행
-        is_missing = key not in journal_keys
-        
-        if is_missing:
-            merchant = str(row.get('nm_trade', '')).strip()
-            
-            # 1. 업종 정보
-            biz_cond = str(row.get('bizcond', '')).strip()
-            biz_cate = str(row.get('bizcate', '')).strip()
-            industry = f"{biz_cond} / {biz_cate}" if biz_cond or biz_cate else ""
-            
-            # 2. 비고 (우선순위: 전년도 이력 > 카드사 추천 > 미분류)
-            history_hint = history_map.get(merchant, "")
-            acct_hint = str(row.get('nm_acctit_cha', '')).strip()
-            
-            remark_display = ""
-            if history_hint:
-                remark_display = f"💡전년도: {history_hint}"
-            elif acct_hint:
-                remark_display = f"추천: {acct_hint}"
-            else:
-                remark_display = "미분류"
-
-            item_data = {
-                "일자": row.get('da_sbook', ''),
-                "거래처": merchant,
-                "업종(업태/종목)": industry,
-                "금액": row.get('mn_total', 0),
-                "전표상태": status_name,
-                "비고(AI힌트)": remark_display,
-                "전년도이력": history_hint  # AI에게 보낼 데이터용
-            }
-            unmatched_items.append(item_data)
-            
-            # 갭 금액 합산은 '확정(2)'이면서 '장부미반영'인 것만
-            if status_code == 2:
-                total_gap += row.get('mn_total', 0)
+    merchant = _card_text(df_miss, 'nm_trade')
+    
+    # 1. 업종 정보
+    biz_cond = _card_text(df_miss, 'bizcond')
+    biz_cate = _card_text(df_miss, 'bizcate')
+    industry = (biz_cond + " / " + biz_cate).where((biz_cond != '') | (biz_cate != ''), '')
+    
+    # 2. 비고 (우선순위: 전년도 이력 > 카드사 추천 > 미분류)
+    history_hint = merchant.map(history_map).fillna('').astype(str)
+    acct_hint = _card_text(df_miss, 'nm_acctit_cha')
+    remark_display = np.select(
+        [history_hint != '', acct_hint != ''],
+        ["💡전년도: " + history_hint, "추천: " + acct_hint],
+        default="미분류"
+    )
+    
+    status_miss = status[missing]
+    status_name = status_miss.map(STATUS_NAMES).fillna("기타(" + status_miss.astype(str) + ")")
+    amount = df_card.loc[missing, 'mn_total'] if 'mn_total' in df_card.columns else card_amt[missing]
+    
+    missing_df = pd.DataFrame({
+        "일자": card_date[missing],
+        "거래처": merchant,
+        "업종(업태/종목)": industry,
+        "금액": amount,
+        "전표상태": status_name,
+        "비고(AI힌트)": remark_display,
+        "전년도이력": history_hint  # AI에게 보낼 데이터용
+    }).reset_index(drop=True)
+    
+    # 갭 금액 합산은 '확정(2)'이면서 '장부미반영'인 것만
+    total_gap = card_amt[missing & (status.to_numpy() == 2)].sum()
             
-    return total_gap, pd.DataFrame(unmatched_items)
+    return total_gap, missing_df
 
 def calculate_tax(base):
     if base <= 0: return 0
@@ -189,6 +203,7 @@ def calculate_tax(base):
 def categorize_expenses_with_ai(api_key, unknown_items):
     if not api_key: return "API 키가 필요합니다."
     try:
+        import google.generativeai as genai  # 무거운 SDK는 AI 호출 시점에만 로드
         genai.configure(api_key=api_key)
         prompt = f"""
         당신은 전문 회계사입니다. 아래 신용카드 사용 내역을 보고 적절한 '계정과목'을 추천해주세요.
@@ -409,6 +424,7 @@ if not df_2025.empty:
                 """)
 
         with col_res2:
+            import plotly.graph_objects as go  # 차트 렌더링 시점에만 로드
             fig = go.Figure(go.Waterfall(
                 name = "Tax Flow", orientation = "v",
                 measure = ["relative", "relative", "relative", "relative", "total", "total"],
@@ -450,6 +466,7 @@ if not df_2025.empty:
                     
                     # AI 호출
                     try:
+                        import google.generativeai as genai  # 무거운 SDK는 AI 호출 시점에만 로드
                         genai.configure(api_key=api_key)
                         model = genai.GenerativeModel('gemini-2.0-flash')
                         report_text = model.generate_content(report_prompt).text
@@ -0,0 +1,219 @@
+"""
+다중 고객사 일괄 가결산 (헤드리스 CLI)
+고객사별 폴더(jsons/ 와 같은 구성)를 프로세스 풀로 병렬 처리하고
+요약 테이블과 처리량(고객사/분), 단계별 소요 시간을 출력합니다.
+
+사용 예:
+    python batch_close.py clients/ -o summary.csv --workers 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+import utils
+from src import analysis
+from src.modules.data_loader import compare_memory, optimize_journal_dtypes
+from src.modules.profiling import Profiler
+
+# 고객사 폴더 내 파일명 (앞쪽 후보 우선)
+CLIENT_FILES = {
+    "journal": ["2025.json"],
+    "history": ["2024.json"],
+    "card": ["신용카드_6.json", "신용카드_2025.json"],
+    "pl": ["손익계산서_24년_25년.json"],
+    "rec": ["rec_prd.json"],
+}
+METRIC_COLUMNS = ["분개 건수", "마감 개월", "매출(YTD)", "비용(YTD)", "카드 누락 건수", "카드 누락 금액",
+                  "카드 분할 매칭 건수",                  "예상 연매출", "예상 영업이익", "계절성 예상 영업이익", "타소득", "소득공제", "과세표준", "예상 세액",
+                  "세액 P10", "세액 P50", "세액 P90"]
+STAGES = ["load", "preprocess_journal", "calculate_financials", "analyze_card_gap", "forecast", "calculate_tax",
+          "montecarlo"]
+
+
+def find_client_file(client_dir, kind):
+    for name in CLIENT_FILES[kind]:
+        path = Path(client_dir) / name
+        if path.exists():
+            return path
+    return None
+
+
+def list_clients(root):
+    """분개장(2025.json)이 있는 하위 폴더를 고객사로 간주합니다."""
+    return sorted(p for p in Path(root).iterdir() if p.is_dir() and find_client_file(p, "journal"))
+
+
+def run_client(client_dir, date_window=2, amount_tol=0, other_income=None, deduction=None,
+               disallowed=analysis.DEFAULT_DISALLOWED, scenario=analysis.DEFAULT_SCENARIO, mc_paths=0, profile_dir=None):
+    """
+    고객사 하나의 가결산 파이프라인을 실행합니다.
+    타소득/소득공제가 None이면 고객사 폴더의 전년도 신고서(rec_prd.json)에서 가져옵니다. (없으면 0)
+    mc_paths > 0 이면 몬테카를로 세액 밴드(P10/P50/P90)도 계산합니다. (시드 고정)
+    profile_dir가 있으면 단계별 계측(소요 시간·행 수·메모리 증감)을 <profile_dir>/<고객사>.json 으로 저장합니다.
+
+    Returns:
+        dict: 요약 지표 + 단계별 소요(ms) (실패 시 '오류' 포함)
+    """
+    client_dir = Path(client_dir)
+    row = {"고객사": client_dir.name}
+    profiler = Profiler(enabled=True)
+    timed = profiler.timed
+
+    try:
+        paths = {kind: find_client_file(client_dir, kind) for kind in CLIENT_FILES}
+
+        def load():
+            raw = {}
+            for kind in ("journal", "history"):
+                raw[kind] = utils.load_frame_local_or_uploaded(None, str(paths[kind] or ""), utils.JOURNAL_COLUMNS)
+            raw["card"] = utils.load_frame_local_or_uploaded(None, str(paths["card"] or ""), utils.CARD_COLUMNS)
+            raw["pl"] = utils.load_local_or_uploaded(None, str(paths["pl"])) if paths["pl"] else None
+            raw["rec"] = utils.load_local_or_uploaded(None, str(paths["rec"])) if paths["rec"] else None
+            return raw
+        raw = timed("load", load)
+
+        def preprocess():
+            journal = utils.preprocess_journal(raw["journal"])
+            history = optimize_journal_dtypes(utils.preprocess_journal(raw["history"]))
+            return journal, optimize_journal_dtypes(journal), history
+        journal, df_2025, df_2024 = timed("preprocess_journal", preprocess,
+                                          rows=len(raw["journal"]) + len(raw["history"]))
+        if df_2025.empty:
+            raise ValueError("2025 분개장이 비어 있습니다.")
+        # dtype 정규화 전후 분개장 메모리 (계측 구간 밖에서 측정)
+        memory = compare_memory(journal, df_2025)
+        del journal
+
+        cube = timed("calculate_financials", lambda: analysis.build_monthly_cube(df_2025), rows=len(df_2025))
+        cube_2024 = analysis.build_monthly_cube(df_2024)
+        revenue_ytd, expense_ytd = cube.financials()
+        rev_24_total, _ = analysis.parse_income_statement(raw["pl"])
+        rec_income, rec_deduction = analysis.tax_inputs_from_return(analysis.parse_tax_return(raw["rec"]))
+        other_income = rec_income if other_income is None else other_income
+        deduction = rec_deduction if deduction is None else deduction
+
+        gap = analysis.GapResult()
+        if not raw["card"].empty:
+            gap = timed("analyze_card_gap", lambda: analysis.analyze_card_gap(
+                df_2025, raw["card"], analysis.build_history_map(df_2024), date_window, amount_tol),
+                rows=len(raw["card"]))
+
+        forecast = timed("forecast", lambda: analysis.forecast_from_cube(
+            cube, rev_24_total, gap.total_gap))
+        seasonal = timed("forecast", lambda: analysis.forecast_seasonal(
+            cube, cube_2024)) if not df_2024.empty else None
+        tax = timed("calculate_tax", lambda: analysis.simulate_tax(
+            forecast, gap.total_gap, other_income, deduction, disallowed, scenario))
+        bands = {}
+        if mc_paths > 0:
+            mc = timed("montecarlo", lambda: analysis.simulate_landing(
+                cube, cube_2024, gap.total_gap, other_income, deduction, disallowed, n_paths=mc_paths, seed=0))
+            bands = {f"세액 {p}": round(v) for p, v in mc.percentiles().loc["예상 세액"].items()}
+
+        row.update({
+            "분개 건수": len(df_2025),
+            "마감 개월": cube.months_passed,
+            "매출(YTD)": int(revenue_ytd),
+            "비용(YTD)": int(expense_ytd),
+            "카드 누락 건수": gap.count,
+            "카드 분할 매칭 건수": gap.split_count,
+            "카드 누락 금액": int(gap.total_gap),
+            "예상 연매출": round(forecast.final_rev_baseline),
+            "예상 영업이익": round(forecast.final_profit),
+            "계절성 예상 영업이익": round(seasonal.totals()[2] - gap.total_gap) if seasonal else None,
+            "타소득": round(other_income),
+            "소득공제": round(deduction),
+            "과세표준": round(tax.tax_base),
+            "예상 세액": round(tax.total_tax),
+            **bands,
+            "분개장 메모리": f"{memory['변환 전']} → {memory['변환 후']}",
+            "dtype 절감률": memory["절감률"],
+            "오류": "",
+        })
+    except Exception as e:
+        row["오류"] = f"{type(e).__name__}: {e}"
+
+    totals = profiler.totals()
+    row.update({f"{stage}(ms)": round(totals.get(stage, 0.0), 1) for stage in STAGES})
+    if profile_dir:
+        profiler.to_json(Path(profile_dir) / f"{client_dir.name}.json")
+    return row
+
+
+def run_batch(client_dirs, workers=None, **options):
+    """
+    고객사 목록을 프로세스 풀로 처리합니다. (workers=1 이면 현재 프로세스에서 순차 실행)
+
+    Returns:
+        (요약 DataFrame, 통계 dict)
+    """
+    started = time.perf_counter()
+    if workers == 1 or len(client_dirs) <= 1:
+        rows = [run_client(d, **options) for d in client_dirs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_client, d, **options) for d in client_dirs]
+            rows = [f.result() for f in futures]
+    elapsed = time.perf_counter() - started
+
+    summary = pd.DataFrame(rows)
+    # 실패한 고객사가 섞여도 지표 컬럼은 정수로 유지
+    for col in METRIC_COLUMNS:
+        if col in summary.columns:
+            summary[col] = summary[col].astype("Int64")
+    stage_cols = [f"{stage}(ms)" for stage in STAGES]
+    stats = {
+        "고객사 수": len(rows),
+        "실패": int((summary["오류"] != "").sum()) if len(rows) else 0,
+        "소요(초)": round(elapsed, 2),
+        "처리량(고객사/분)": round(len(rows) / elapsed * 60, 1) if elapsed > 0 else 0.0,
+        "단계별 합계(ms)": summary[stage_cols].sum().round(1).to_dict() if len(rows) else {},
+    }
+    return summary, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="다중 고객사 일괄 가결산")
+    parser.add_argument("root", help="고객사 폴더들이 들어 있는 디렉토리")
+    parser.add_argument("-o", "--output", default="batch_summary.csv", help="요약 테이블 경로 (.csv 또는 .json)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="프로세스 수")
+    parser.add_argument("--window", type=int, default=2, help="카드 매칭 허용 일수 (±일)")
+    parser.add_argument("--tol", type=int, default=0, help="카드 매칭 허용 금액 오차 (원)")
+    parser.add_argument("--other-income", type=int, default=None, help="타소득 (기본: 고객사 신고서 값)")
+    parser.add_argument("--deduction", type=int, default=None, help="소득공제 (기본: 고객사 신고서 값)")
+    parser.add_argument("--disallowed", type=int, default=analysis.DEFAULT_DISALLOWED,
+                        help="필요경비 부인액 (0이면 세액에 반영하지 않음)")
+    parser.add_argument("--scenario", choices=analysis.SCENARIOS, default=analysis.DEFAULT_SCENARIO)
+    parser.add_argument("--paths", type=int, default=0, help="몬테카를로 경로 수 (0이면 세액 밴드 생략)")
+    parser.add_argument("--profile-dir", default=None, help="고객사별 단계 계측 JSON 저장 폴더")
+    args = parser.parse_args(argv)
+
+    clients = list_clients(args.root)
+    if not clients:
+        print(f"❌ 고객사 폴더가 없습니다: {args.root}", file=sys.stderr)
+        return 1
+
+    summary, stats = run_batch(
+        clients, workers=args.workers, date_window=args.window, amount_tol=args.tol,
+        other_income=args.other_income, deduction=args.deduction, disallowed=args.disallowed,
+        scenario=args.scenario, mc_paths=args.paths, profile_dir=args.profile_dir)
+
+    if args.output.endswith(".json"):
+        summary.to_json(args.output, orient="records", force_ascii=False, indent=1)
+    else:
+        summary.to_csv(args.output, index=False, encoding="utf-8-sig")
+
+    print(summary.drop(columns=[f"{stage}(ms)" for stage in STAGES]).to_string(index=False))
+    print(json.dumps(stats, ensure_ascii=False, indent=1))
+    print(f"✅ 요약 저장: {args.output}")
+    return 0 if stats["실패"] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+분석 핫패스 벤치마크 (합성 데이터)
+jsons/2025.json / jsons/신용카드_2025.json 과 같은 모양의 분개장·카드 내역을 행 수별(기본 10k/100k/1M)로 만들어
+전처리 → 손익 집계 → 거래처 이력 → 카드 누락 → 거래처 패턴/신뢰도 단계의 소요 시간, 처리량(행/초),
+최대 메모리(tracemalloc)를 측정하고 기준값(baselines/hot_paths.json) 대비 회귀 여부를 판단합니다.
+
+사용 예:
+    python -m benchmarks.hot_paths                        # 10k/100k/1M 측정 + 기준값 비교
+    python -m benchmarks.hot_paths --sizes 10k,100k       # 일부 크기만
+    python -m benchmarks.hot_paths --update               # 기준값 갱신
+    RUN_BENCHMARKS=1 pytest test/test_hot_paths.py         # 10k 회귀 검사 (기본 pytest 실행에서는 건너뜀)
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import utils
+from src import analysis
+from src.modules import ai_categorizer
+from src.modules.data_loader import optimize_journal_dtypes
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "hot_paths.json"
+
+SIZES = [10_000, 100_000, 1_000_000]
+STAGES = ["preprocess_journal", "calculate_financials", "build_history_map", "analyze_card_gap",
+          "analyze_company_patterns", "calculate_confidence"]
+RUNS = 3
+CONFIDENCE_LOOKUPS = 1_000
+TOLERANCE = 1.5      # 기준값 대비 허용 배수 (시간)
+SLACK_MS = 50.0      # 측정 잡음 흡수용 절대 여유
+MEMORY_TOLERANCE = 1.25
+SLACK_MB = 2.0
+YEAR = 2025
+
+# (계정코드, 계정명) - 비용은 카드 결제 대상
+EXPENSES = [("81100", "복리후생비(판)"), ("81200", "여비교통비(판)"), ("81300", "접대비(기업업무추진비)(판)"),
+            ("82200", "차량유지비(판)"), ("83000", "소모품비(판)"), ("82100", "보험료(판)"), ("83100", "지급수수료(판)")]
+VAT = ("13500", "부가세대급금")
+PAYABLE = ("25300", "미지급금")
+REVENUE = ("40100", "상품매출")
+RECEIVABLE = ("10800", "외상매출금")
+VAT_PAYABLE = ("25500", "부가세예수금")
+CLOSING = ("40000", "손익")
+BRANDS = ["아트박스", "다이소", "지에스25", "컴포즈커피", "파리바게트", "주유소", "약국", "마트", "식당", "카센터", "문구사", "철물점"]
+FORMS = ["{}", "(주){}", "（주）{}", "주식회사 {}", "{} ", "㈜{}"]
+
+
+def parse_size(text: str) -> int:
+    """'10k' / '1m' / '5000' → 행 수"""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def _merchants(count: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """거래처별 (기본 이름, 거래처코드 - 1/3은 없음, 사업자번호)"""
+    base = np.array([f"{BRANDS[i % len(BRANDS)]} {i // len(BRANDS) + 1}호점" for i in range(count)], dtype=object)
+    codes = np.array([f"{i + 1:06d}" if i % 3 else "" for i in range(count)], dtype=object)
+    prefix = rng.integers(10_000, 99_999, size=count)
+    biz = np.array([f"{p}{i:05d}" for i, p in enumerate(prefix)], dtype=object)
+    return base, codes, biz
+
+
+def _styled(base: np.ndarray, merchant: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """같은 거래처를 여러 표기로 (전각 괄호, 법인 형태, 공백) - (거래처, 표기) 고유 조합만 문자열로 만들고 펼침"""
+    key = merchant.astype("int64") * len(FORMS) + rng.integers(0, len(FORMS), size=len(merchant))
+    uniques, inverse = np.unique(key, return_inverse=True)
+    names = np.array([FORMS[k % len(FORMS)].format(base[k // len(FORMS)]) for k in uniques], dtype=object)
+    return names[inverse.ravel()]
+
+
+def synthetic_data(rows: int, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    분개장 rows행과 카드 내역(비용 전표의 약 60% + 미반영 카드 약 10%)을 만듭니다.
+    분개장은 load_json_columns 결과와 같은 원본 dtype(문자열 코드/일자, 정수 금액)입니다.
+
+    - 비용 전표: 차변 비용 (+ 차변 부가세대급금) / 대변 미지급금
+    - 매출 전표: 차변 외상매출금 / 대변 상품매출 + 부가세예수금
+    - 12/31 손익 대체 전표 소수 (preprocess_journal이 제외)
+
+    Args:
+        rows: 분개장 행 수
+        seed: 난수 시드
+
+    Returns:
+        (분개장 DataFrame, 카드 DataFrame)
+    """
+    rng = np.random.default_rng(seed)
+    n_vouchers = max(rows // 2, 1)
+    kind = rng.choice(3, size=n_vouchers, p=[0.55, 0.3, 0.15])  # 0 비용+부가세, 1 비용, 2 매출
+    lines = np.array([3, 2, 3])[kind]
+    ends = np.cumsum(lines)
+    n_vouchers = int(np.searchsorted(ends, rows, side="left")) + 1
+    kind, lines = kind[:n_vouchers], lines[:n_vouchers]
+    starts = np.cumsum(lines) - lines
+    voucher = np.repeat(np.arange(n_vouchers), lines)
+    pos = np.arange(len(voucher)) - starts[voucher]
+
+    day_of_year = np.sort(rng.integers(0, 365, size=n_vouchers))
+    dates = (pd.Timestamp(f"{YEAR}-01-01") + pd.to_timedelta(day_of_year, unit="D")).strftime("%Y%m%d").to_numpy()
+    no_acct = (np.arange(n_vouchers) - np.searchsorted(day_of_year, day_of_year, side="left") + 1)
+    n_merchants = max(50, rows // 40)
+    base, codes, biz = _merchants(n_merchants, rng)
+    merchant = rng.zipf(1.3, size=n_vouchers) % n_merchants
+    expense = rng.integers(0, len(EXPENSES), size=n_vouchers)
+    supply = rng.integers(10, 5_000, size=n_vouchers) * 100
+    vat = np.where(kind == 0, supply // 10, 0)
+    total = supply + vat
+
+    k, p = kind[voucher], pos
+    is_revenue = k == 2
+    exp_code = np.array([c for c, _ in EXPENSES], dtype=object)[expense[voucher]]
+    exp_name = np.array([n for _, n in EXPENSES], dtype=object)[expense[voucher]]
+    credit_line = np.where(is_revenue, p >= 1, p == lines[voucher] - 1)
+    conditions = [~is_revenue & (p == 0), (k == 0) & (p == 1), ~is_revenue & credit_line,
+                  is_revenue & (p == 0), is_revenue & (p == 1), is_revenue & (p == 2)]
+    cd_acctit = np.select(conditions, [exp_code, VAT[0], PAYABLE[0], RECEIVABLE[0], REVENUE[0], VAT_PAYABLE[0]], "")
+    nm_acctit = np.select(conditions, [exp_name, VAT[1], PAYABLE[1], RECEIVABLE[1], REVENUE[1], VAT_PAYABLE[1]], "")
+    v_supply, v_vat, v_total = supply[voucher], vat[voucher], total[voucher]
+    debit = np.select(conditions[:2] + [conditions[3]], [v_supply, v_vat, v_total], 0)
+    credit = np.select([conditions[2], conditions[4], conditions[5]], [v_total, v_supply, v_vat], 0)
+
+    journal = pd.DataFrame({
+        "da_date": dates[voucher],
+        "month": pd.Series(dates[voucher]).str.slice(4, 6).to_numpy(),
+        "no_acct": pd.Series(no_acct[voucher]).map("{:05d}".format).to_numpy(),
+        "cd_acctit": cd_acctit,
+        "nm_acctit": nm_acctit,
+        "nm_trade": _styled(base, merchant[voucher], rng),
+        "cd_trade": codes[merchant[voucher]],
+        "mn_bungae1": debit.astype("int64"),
+        "mn_bungae2": credit.astype("int64"),
+        "nm_remark": np.where(is_revenue, "상품 매출", "카드 결제"),
+        "nm_gubun_prn": "대체",
+    })
+    # 12/31 결산 손익 대체 (전체의 약 0.5%)
+    closing = journal.sample(frac=0.005, random_state=seed).assign(
+        da_date=f"{YEAR}1231", month="12", cd_acctit=CLOSING[0], nm_acctit=CLOSING[1], nm_remark="손익 대체",
+        nm_gubun_prn="결산")
+    journal = pd.concat([journal.iloc[:rows - len(closing)], closing], ignore_index=True)
+
+    # 카드: 비용 전표 중 약 60%, 일부는 입력 시차(±2일), 약 10%는 장부 미반영
+    expense_vouchers = np.flatnonzero(kind != 2)
+    paid = expense_vouchers[rng.random(len(expense_vouchers)) < 0.6]
+    shift = np.where(rng.random(len(paid)) < 0.2, rng.integers(-2, 3, size=len(paid)), 0)
+    card_days = np.concatenate([np.clip(day_of_year[paid] + shift, 0, 364),
+                                rng.integers(0, 365, size=len(paid) // 10)])
+    card_total = np.concatenate([total[paid], rng.integers(10, 5_000, size=len(paid) // 10) * 110])
+    card_merchant = np.concatenate([merchant[paid], rng.integers(0, n_merchants, size=len(paid) // 10)])
+    n_cards = len(card_days)
+    card_codes = np.array([c.zfill(10) if c else " " * 10 for c in codes], dtype=object)  # 카드 원본은 10자리
+    card = pd.DataFrame({
+        "da_sbook": (pd.Timestamp(f"{YEAR}-01-01") + pd.to_timedelta(card_days, unit="D")).strftime("%Y%m%d"),
+        "mn_total": card_total.astype("int64"),
+        "ty_jungstat": rng.choice([1, 2, 3], size=n_cards, p=[0.1, 0.8, 0.1]),
+        "nm_trade": _styled(base, card_merchant, rng),
+        "cd_trade": card_codes[card_merchant],
+        "bizcond": "소매",
+        "bizcate": "일반",
+        "nm_acctit_cha": np.array([n for _, n in EXPENSES], dtype=object)[rng.integers(0, len(EXPENSES), n_cards)],
+        "sq_sbook": np.arange(1, n_cards + 1),
+        "bisocial_no": biz[card_merchant],
+    }).sort_values("da_sbook", kind="stable", ignore_index=True)
+    return journal, card
+
+
+def _stages(raw: pd.DataFrame, card: pd.DataFrame) -> Dict[str, Tuple[Callable[[], object], int]]:
+    """단계별 (측정 함수, 처리 행 수) - 하위 단계는 앱과 같이 전처리·dtype 축소한 분개장을 사용"""
+    journal = optimize_journal_dtypes(utils.preprocess_journal(raw))
+    history = analysis.build_history_map(journal)
+    trades = pd.unique(journal["nm_trade"].dropna())
+    accounts = journal["nm_acctit"].to_numpy()
+    lookups = [(trades[i % len(trades)], accounts[i % len(accounts)]) for i in range(CONFIDENCE_LOOKUPS)]
+
+    def company_patterns():
+        ai_categorizer._trade_index_cache.clear()  # 인덱스 생성 비용까지 측정
+        return ai_categorizer.analyze_company_patterns(journal)
+
+    def confidence():
+        index = ai_categorizer.get_trade_index(journal)  # 인덱스는 미리 만들어 둔 상태의 조회 비용
+        return [ai_categorizer.calculate_confidence(journal, t, a, index=index) for t, a in lookups]
+
+    return {
+        "preprocess_journal": (lambda: utils.preprocess_journal(raw), len(raw)),
+        "calculate_financials": (lambda: analysis.calculate_financials(journal), len(journal)),
+        "build_history_map": (lambda: analysis.build_history_map(journal), len(journal)),
+        "analyze_card_gap": (lambda: analysis.analyze_card_gap(journal, card, history, date_window=2), len(card)),
+        "analyze_company_patterns": (company_patterns, len(journal)),
+        "calculate_confidence": (confidence, CONFIDENCE_LOOKUPS),
+    }
+
+
+def _peak_mb(fn: Callable[[], object]) -> float:
+    """한 번 실행하는 동안의 최대 추가 할당량 (MB)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1 << 20)
+
+
+def measure(sizes: List[int] = SIZES, runs: int = RUNS, seed: int = 0) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    크기별·단계별 최솟값 시간(ms), 처리량(행/초), 최대 메모리(MB)를 측정합니다.
+    시간은 tracemalloc 없이 runs번 중 최솟값, 메모리는 tracemalloc을 켠 별도 1회 실행으로 잽니다.
+
+    Returns:
+        {크기: {단계: {"ms", "rows", "rows_per_s", "peak_mb"}}}
+    """
+    results = {}
+    for size in sizes:
+        raw, card = synthetic_data(size, seed)
+        stages = _stages(raw, card)
+        by_stage = {}
+        for stage in STAGES:
+            fn, rows = stages[stage]
+            fn()  # 워밍업 (정규식 컴파일, 메모이즈 캐시 등)
+            best = float("inf")
+            for _ in range(runs):
+                started = time.perf_counter()
+                fn()
+                best = min(best, time.perf_counter() - started)
+            by_stage[stage] = {
+                "ms": round(best * 1000, 2),
+                "rows": rows,
+                "rows_per_s": round(rows / best) if best > 0 else 0,
+                "peak_mb": round(_peak_mb(fn), 2),
+            }
+        results[str(size)] = by_stage
+    return results
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Dict[str, Dict[str, float]]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def check_regression(result: Dict[str, Dict[str, Dict[str, float]]],
+                     baseline: Dict[str, Dict[str, Dict[str, float]]]) -> List[str]:
+    """기준값 대비 회귀 사유 목록 (기준값에 없는 크기·단계는 건너뜀, 없으면 빈 리스트)"""
+    problems = []
+    for size, stages in result.items():
+        for stage, current in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            if not base:
+                continue
+            limit_ms = base["ms"] * TOLERANCE + SLACK_MS
+            if current["ms"] > limit_ms:
+                problems.append(f"{size}행 {stage}: {current['ms']:.1f}ms > 허용 {limit_ms:.1f}ms (기준 {base['ms']:.1f}ms)")
+            limit_mb = base["peak_mb"] * MEMORY_TOLERANCE + SLACK_MB
+            if current["peak_mb"] > limit_mb:
+                problems.append(
+                    f"{size}행 {stage}: 메모리 {current['peak_mb']:.1f}MB > 허용 {limit_mb:.1f}MB (기준 {base['peak_mb']:.1f}MB)")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="분석 핫패스 벤치마크 (합성 분개장/카드)")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in SIZES), help="분개장 행 수 목록 (예: 10k,100k,1m)")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--update", action="store_true", help="측정값으로 기준값 파일 갱신 (측정한 크기만 교체)")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    result = measure(sizes, args.runs, args.seed)
+    for size, stages in result.items():
+        print(f"[{int(size):,}행]")
+        for stage, r in stages.items():
+            print(f"  {stage:<26} {r['ms']:10.1f} ms  {r['rows_per_s']:>12,} 행/초  {r['peak_mb']:8.1f} MB")
+
+    if args.update:
+        baseline = {**load_baseline(), **result}
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"✅ 기준값 갱신: {BASELINE_PATH}")
+        return 0
+
+    problems = check_regression(result, load_baseline())
+    for problem in problems:
+        print(f"❌ {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+앱 콜드 스타트 벤치마크 (python -X importtime 기반)
+app.py 최상단 import 들을 새 프로세스에서 실행해 누적 import 시간을 측정하고
+기준값(baselines/startup.json) 대비 회귀 여부를 판단합니다.
+무거운 선택 의존성(AI SDK)이 시작 시 로드되는 것도 회귀로 봅니다.
+
+사용 예:
+    python -m benchmarks.startup            # 측정 + 기준값 비교
+    python -m benchmarks.startup --update   # 기준값 갱신
+    RUN_BENCHMARKS=1 pytest test/test_startup.py   # 테스트로 실행 (기본 pytest 실행에서는 건너뜀)
+"""
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+APP_PATH = ROOT_DIR / "app.py"
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "startup.json"
+
+# 시작 시 로드되면 안 되는 무거운 선택 의존성 (AI 호출 시점에 로드)
+# plotly는 streamlit 자체가 plotly_chart 테마 설정 시 import 하므로 app.py 기준 검사에서 제외
+LAZY_MODULES = ["google.generativeai"]
+RUNS = 5
+TOLERANCE = 1.5      # 기준값 대비 허용 배수
+SLACK_MS = 100.0     # 측정 잡음 흡수용 절대 여유
+
+
+def app_imports(app_path: Path = APP_PATH) -> List[str]:
+    """app.py 최상단(모듈 레벨)의 import 대상 모듈 목록"""
+    tree = ast.parse(app_path.read_text(encoding="utf-8"))
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            if node.module == "src" or node.module.startswith("tabs"):
+                # from src import analysis / from tabs import tab1 형태는 하위 모듈까지 로드
+                modules.extend(f"{node.module}.{alias.name}" for alias in node.names)
+            else:
+                modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """-X importtime 출력을 {모듈: 누적 시간(ms)} 로 변환합니다. (최상위 import 기준)"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum_us, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        if not cum_us.isdigit():
+            continue  # 헤더 행
+        cumulative[name] = int(cum_us) / 1000
+    return cumulative
+
+
+def measure_once(modules: List[str]) -> Dict[str, object]:
+    """새 인터프리터에서 모듈들을 순서대로 import 하고 최상위 항목별 소요 시간과 로드된 모듈을 반환합니다."""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    times = parse_importtime(proc.stderr)
+    # 최상위(들여쓰기 없는) 항목만 합산해야 중복 집계가 없음
+    top_level = {
+        line.split("|")[-1].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line and not line.split("|")[-1].startswith("  ")
+    }
+    top = {name: ms for name, ms in times.items() if name in top_level}
+    return {"total_ms": round(sum(top.values()), 1), "top_level": top, "modules": times}
+
+
+def is_project_module(name: str) -> bool:
+    root = name.split(".")[0]
+    return (ROOT_DIR / f"{root}.py").exists() or (ROOT_DIR / root).is_dir()
+
+
+def median(values: List[float]) -> float:
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def measure(runs: int = RUNS) -> Dict[str, object]:
+    """
+    app.py의 import 들을 외부 프레임워크(streamlit/pandas 등) 먼저, 프로젝트 모듈 나중 순서로
+    한 프로세스에서 import 해 프로젝트 코드가 추가하는 시간을 최상위 항목 합으로 직접 잽니다.
+    (프레임워크만 import 한 별도 프로세스와의 차이로 구하면 프레임워크 시간의 흔들림이 그대로 섞임)
+    여러 번 측정해 중앙값을 채택합니다.
+    """
+    modules = app_imports()
+    framework = [m for m in modules if not is_project_module(m)]
+    ordered = framework + [m for m in modules if is_project_module(m)]
+    measure_once(ordered)  # 워밍업: __pycache__ 생성/디스크 캐시 영향 제거
+    samples = [measure_once(ordered) for _ in range(runs)]
+    overheads = [sum(ms for name, ms in s["top_level"].items() if is_project_module(name)) for s in samples]
+    totals = [s["total_ms"] for s in samples]
+    loaded = min(samples, key=lambda s: s["total_ms"])["modules"]
+    return {
+        "total_ms": round(median(totals), 1),
+        "framework_ms": round(median([t - o for t, o in zip(totals, overheads)]), 1),
+        "overhead_ms": round(median(overheads), 1),
+        "samples_ms": [s["total_ms"] for s in samples],
+        "eager_heavy": [m for m in LAZY_MODULES if any(name == m or name.startswith(m + ".") for name in loaded)],
+        "slowest": sorted(
+            ((name, ms) for name, ms in loaded.items() if "." not in name),
+            key=lambda item: -item[1]
+        )[:10],
+    }
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, float]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def check_regression(result: Dict[str, object], baseline: Dict[str, float]) -> List[str]:
+    """기준값 대비 회귀 사유 목록 (없으면 빈 리스트)"""
+    problems = []
+    if result["eager_heavy"]:
+        problems.append(f"시작 시 무거운 모듈 로드: {', '.join(result['eager_heavy'])}")
+    if baseline:
+        limit = baseline["overhead_ms"] * TOLERANCE + SLACK_MS
+        if result["overhead_ms"] > limit:
+            problems.append(
+                f"프로젝트 import 시간 {result['overhead_ms']:.0f}ms > 허용 {limit:.0f}ms "
+                f"(기준 {baseline['overhead_ms']:.0f}ms, 전체 {result['total_ms']:.0f}ms)")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="app.py 콜드 스타트 import 시간 벤치마크")
+    parser.add_argument("--update", action="store_true", help="측정값으로 기준값 파일 갱신")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args(argv)
+
+    result = measure(args.runs)
+    print(f"콜드 스타트 import (중앙값): {result['total_ms']:.1f} ms (측정값 {result['samples_ms']})")
+    print(f"  외부 프레임워크 {result['framework_ms']:.1f} ms + 프로젝트 코드 {result['overhead_ms']:.1f} ms")
+    for name, ms in result["slowest"]:
+        print(f"  {name:<30} {ms:8.1f} ms")
+
+    if args.update:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps({k: result[k] for k in ("total_ms", "framework_ms", "overhead_ms")}, indent=1) + "\n", encoding="utf-8")
+        print(f"✅ 기준값 갱신: {BASELINE_PATH}")
+        return 0
+
+    problems = check_regression(result, load_baseline())
+    for problem in problems:
+        print(f"❌ {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
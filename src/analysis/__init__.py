@@ -0,0 +1,109 @@
+"""
+가결산 계산 패키지
+계정 분류 색인·시산표, 손익 집계, 계정 × 월 큐브, 연간 추정(계절성·몬테카를로 포함), 세금 시나리오, 전년도 신고서 파싱, 다년도 거래처 이력, 카드 누락 분석(증분 재분석 포함)을 UI와 분리된 순수 함수로 제공합니다.
+Streamlit/Plotly 없이 import 되므로 배치 CLI와 테스트에서 그대로 사용할 수 있습니다.
+"""
+from .results import (
+    GapResult, ForecastResult, ScenarioResult, TaxResult, BracketDrop, TaxCurve, TaxSweep,
+    MonteCarloResult, IncrementalUpdate
+)
+from .accounts import (
+    KIND_UNKNOWN, KIND_ASSET, KIND_LIABILITY, KIND_EQUITY, KIND_REVENUE, KIND_EXPENSE, KIND_OTHER, KIND_NAMES,
+    AccountIndex, account_keys, account_kinds, account_kind_mask
+)
+from .trial_balance import TrialBalance, load_trial_balance
+from .income_statement import (
+    GR_REVENUE, GR_COST_OF_SALES, GR_GROSS_PROFIT, GR_SGA, GR_OPERATING_INCOME, GR_NON_OPERATING_INCOME,
+    GR_NON_OPERATING_EXPENSE, GR_PRETAX_INCOME, GR_INCOME_TAX, GR_NET_INCOME, IncomeStatement,
+    parse_income_statement_tree
+)
+from .financials import calculate_financials, parse_income_statement, prior_year_totals
+from .cube import MonthlyCube, build_monthly_cube, months_passed_from_dates
+from .forecast import forecast_landing, forecast_from_cube
+from .seasonal import MODES, SeasonalForecast, forecast_seasonal
+from .scenario import SCENARIOS, DEFAULT_SCENARIO, apply_scenario
+from .tax import (
+    TAX_BRACKETS, DEFAULT_DISALLOWED, income_tax, calculate_tax, bracket_drop_point, tax_curve, sweep_scenarios,
+    simulate_tax, simulate_all_scenarios
+)
+from .montecarlo import bootstrap_pool, simulate_landing
+from .tax_return import TaxReturnTable, parse_tax_return, business_income, tax_inputs_from_return
+from .history import DEFAULT_DECAY, MerchantHistory, build_history_map, build_merchant_history
+from .gap import STATUS_NAMES, get_status_name, analyze_card_gap
+from .incremental import IncrementalAnalysis, IncrementalSnapshot
+
+__all__ = [
+    'GapResult',
+    'ForecastResult',
+    'ScenarioResult',
+    'TaxResult',
+    'BracketDrop',
+    'TaxCurve',
+    'TaxSweep',
+    'MonteCarloResult',
+    'IncrementalUpdate',
+    'KIND_UNKNOWN',
+    'KIND_ASSET',
+    'KIND_LIABILITY',
+    'KIND_EQUITY',
+    'KIND_REVENUE',
+    'KIND_EXPENSE',
+    'KIND_OTHER',
+    'KIND_NAMES',
+    'AccountIndex',
+    'account_keys',
+    'account_kinds',
+    'account_kind_mask',
+    'TrialBalance',
+    'load_trial_balance',
+    'calculate_financials',
+    'parse_income_statement',
+    'prior_year_totals',
+    'GR_REVENUE',
+    'GR_COST_OF_SALES',
+    'GR_GROSS_PROFIT',
+    'GR_SGA',
+    'GR_OPERATING_INCOME',
+    'GR_NON_OPERATING_INCOME',
+    'GR_NON_OPERATING_EXPENSE',
+    'GR_PRETAX_INCOME',
+    'GR_INCOME_TAX',
+    'GR_NET_INCOME',
+    'IncomeStatement',
+    'parse_income_statement_tree',
+    'MonthlyCube',
+    'build_monthly_cube',
+    'months_passed_from_dates',
+    'forecast_landing',
+    'forecast_from_cube',
+    'MODES',
+    'SeasonalForecast',
+    'forecast_seasonal',
+    'SCENARIOS',
+    'DEFAULT_SCENARIO',
+    'apply_scenario',
+    'TAX_BRACKETS',
+    'DEFAULT_DISALLOWED',
+    'income_tax',
+    'calculate_tax',
+    'bracket_drop_point',
+    'tax_curve',
+    'sweep_scenarios',
+    'simulate_tax',
+    'simulate_all_scenarios',
+    'bootstrap_pool',
+    'simulate_landing',
+    'TaxReturnTable',
+    'parse_tax_return',
+    'business_income',
+    'tax_inputs_from_return',
+    'STATUS_NAMES',
+    'get_status_name',
+    'DEFAULT_DECAY',
+    'MerchantHistory',
+    'build_history_map',
+    'build_merchant_history',
+    'analyze_card_gap',
+    'IncrementalAnalysis',
+    'IncrementalSnapshot',
+]
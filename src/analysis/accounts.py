@@ -0,0 +1,174 @@
+"""
+계정과목 분류 색인 모듈
+계정코드를 5자리 정수 키로 바꾼 뒤, 정렬된 코드 범위표(np.searchsorted)와
+시산표에서 읽은 계정별 분류를 정수 조인해 자산/부채/자본/매출/비용을 판정합니다.
+(행마다 문자열 접두어를 검사하지 않고, 고유 계정코드에만 한 번 계산해 펼침)
+"""
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+KIND_UNKNOWN = 0
+KIND_ASSET = 1
+KIND_LIABILITY = 2
+KIND_EQUITY = 3
+KIND_REVENUE = 4     # 손익 집계상 매출 (대변 - 차변)
+KIND_EXPENSE = 5     # 손익 집계상 비용 (차변 - 대변)
+KIND_OTHER = 6       # 도급/분양원가 등 손익 집계 제외
+KIND_NAMES = {
+    KIND_UNKNOWN: "미분류", KIND_ASSET: "자산", KIND_LIABILITY: "부채", KIND_EQUITY: "자본",
+    KIND_REVENUE: "매출", KIND_EXPENSE: "비용", KIND_OTHER: "기타",
+}
+BALANCE_KINDS = (KIND_ASSET, KIND_LIABILITY, KIND_EQUITY)
+
+KEY_DIGITS = 5
+
+# 표준 계정코드 범위 (하한, 분류명, 종류) - 더존 계정체계(3자리 × 100) 기준
+# 매출원가(451~)와 영업외수익(901~)은 기존 집계 규칙(4 = 매출, 5/8/9 = 비용)과 같게 둡니다.
+ACCOUNT_RANGES = [
+    (0, "유동자산", KIND_ASSET),
+    (17600, "비유동자산", KIND_ASSET),
+    (25100, "유동부채", KIND_LIABILITY),
+    (29100, "비유동부채", KIND_LIABILITY),
+    (33100, "자본", KIND_EQUITY),
+    (40000, "매출", KIND_REVENUE),
+    (45100, "매출원가", KIND_REVENUE),
+    (50000, "제조원가", KIND_EXPENSE),
+    (60000, "도급원가", KIND_OTHER),
+    (70000, "분양원가", KIND_OTHER),
+    (80000, "판매관리비", KIND_EXPENSE),
+    (90100, "영업외수익", KIND_EXPENSE),
+    (95100, "영업외비용", KIND_EXPENSE),
+    (99800, "법인세등", KIND_EXPENSE),
+]
+
+
+def _string_keys(values: np.ndarray) -> np.ndarray:
+    """고유 계정코드 문자열 → 5자리 정수 키 ('401' → 40100, '4010001' → 40100, 숫자가 아니면 -1)"""
+    text = pd.Series(values, dtype=object).astype(str).str.strip().str.replace(r"\.0$", "", regex=True)
+    head = text.str.slice(0, KEY_DIGITS).str.ljust(KEY_DIGITS, "0")
+    digits = head.str.fullmatch(r"\d+") & text.ne("")
+    return np.where(digits, pd.to_numeric(head.where(digits, "-1")), -1).astype("int64")
+
+
+def account_keys(codes) -> np.ndarray:
+    """
+    계정코드 배열을 정수 키 배열로 바꿉니다.
+    고유값(category면 카테고리)에만 문자열 처리를 하고 정수 코드로 펼칩니다.
+
+    Args:
+        codes: 계정코드 (Series / 배열 / 리스트)
+
+    Returns:
+        int64 키 배열 (해석 불가 코드는 -1)
+    """
+    series = codes if isinstance(codes, pd.Series) else pd.Series(np.asarray(codes, dtype=object))
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        cat_codes = series.cat.codes.to_numpy()
+        uniques = np.asarray(series.cat.categories, dtype=object)
+    else:
+        cat_codes, uniques = pd.factorize(series)
+        uniques = np.asarray(uniques, dtype=object)
+    if len(uniques) == 0:
+        return np.full(len(series), -1, dtype="int64")
+    keys = _string_keys(uniques)
+    return np.where(cat_codes >= 0, keys[np.maximum(cat_codes, 0)], -1)
+
+
+@dataclass
+class AccountIndex:
+    """
+    계정 분류 색인 (정렬된 범위표 + 시산표 계정별 분류)
+
+    Attributes:
+        lower: 범위 하한 키 (오름차순)
+        range_groups: 범위별 분류명
+        range_kinds: 범위별 종류 (KIND_*)
+        keys: 시산표 계정 키 (오름차순, 없으면 빈 배열)
+        classes: 시산표 계정별 대분류명 (유동자산, 매출 ...)
+        groups: 시산표 계정별 중분류명 (당좌자산, 유형자산 ... 없으면 대분류명)
+    """
+    lower: np.ndarray
+    range_groups: np.ndarray
+    range_kinds: np.ndarray
+    keys: np.ndarray
+    classes: np.ndarray
+    groups: np.ndarray
+
+    @classmethod
+    def default(cls, accounts: Optional[pd.DataFrame] = None) -> "AccountIndex":
+        """
+        표준 범위표로 색인을 만듭니다.
+
+        Args:
+            accounts: 시산표 계정 표 (cd_acctit, 대분류, 중분류) - 있으면 계정별 분류명을 덮어씀
+        """
+        empty = np.array([], dtype=object)
+        keys, classes, groups = np.array([], dtype="int64"), empty, empty
+        if accounts is not None and not accounts.empty:
+            table = accounts.assign(key=account_keys(accounts["cd_acctit"]))
+            table = table[table["key"] >= 0].drop_duplicates("key").sort_values("key")
+            keys = table["key"].to_numpy(dtype="int64")
+            classes = table["대분류"].to_numpy(dtype=object)
+            groups = table["중분류"].to_numpy(dtype=object)
+        return cls(
+            lower=np.array([r[0] for r in ACCOUNT_RANGES], dtype="int64"),
+            range_groups=np.array([r[1] for r in ACCOUNT_RANGES], dtype=object),
+            range_kinds=np.array([r[2] for r in ACCOUNT_RANGES], dtype="int8"),
+            keys=keys,
+            classes=classes,
+            groups=groups,
+        )
+
+    def _range_pos(self, keys: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.lower, keys, side="right") - 1
+
+    def _exact_pos(self, keys: np.ndarray) -> np.ndarray:
+        """시산표 계정 위치 (없으면 -1)"""
+        if len(self.keys) == 0:
+            return np.full(len(keys), -1)
+        pos = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return np.where(self.keys[pos] == keys, pos, -1)
+
+    def kinds(self, codes) -> np.ndarray:
+        """계정코드별 종류 (KIND_*, 손익 구분은 코드 범위로 판정)"""
+        keys = account_keys(codes)
+        return np.where(keys >= 0, self.range_kinds[np.maximum(self._range_pos(keys), 0)], KIND_UNKNOWN).astype("int8")
+
+    def mask(self, codes, kinds: Iterable[int]) -> np.ndarray:
+        """계정코드가 주어진 종류에 속하는지 불리언 마스크"""
+        return np.isin(self.kinds(codes), list(kinds))
+
+    def classify(self, codes) -> pd.DataFrame:
+        """계정코드별 (키, 종류, 대분류, 중분류) - 시산표 분류 우선, 없으면 범위표 분류명"""
+        keys = account_keys(codes)
+        range_pos = np.maximum(self._range_pos(keys), 0)
+        klass = group = self.range_groups[range_pos]
+        if len(self.keys):
+            exact = self._exact_pos(keys)
+            found = exact >= 0
+            klass = np.where(found, self.classes[np.maximum(exact, 0)], klass)
+            group = np.where(found, self.groups[np.maximum(exact, 0)], group)
+        kinds = np.where(keys >= 0, self.range_kinds[range_pos], KIND_UNKNOWN)
+        invalid = keys < 0
+        return pd.DataFrame({
+            "key": keys,
+            "kind": kinds.astype("int8"),
+            "대분류": np.where(invalid, "", klass),
+            "중분류": np.where(invalid, "", group),
+        })
+
+
+DEFAULT_ACCOUNT_INDEX = AccountIndex.default()
+
+
+def account_kinds(codes, index: Optional[AccountIndex] = None) -> np.ndarray:
+    """계정코드별 종류 (KIND_*) - index 미지정 시 표준 범위표"""
+    return (index or DEFAULT_ACCOUNT_INDEX).kinds(codes)
+
+
+def account_kind_mask(codes, kinds: Sequence[int], index: Optional[AccountIndex] = None) -> np.ndarray:
+    """계정코드가 주어진 종류에 속하는 행의 불리언 마스크"""
+    return (index or DEFAULT_ACCOUNT_INDEX).mask(codes, kinds)
@@ -0,0 +1,159 @@
+"""
+계정 × 월 집계 큐브 모듈
+분개장을 한 번만 훑어 계정코드별·월별 차변/대변/건수를 2차원 배열로 만들어 두고,
+손익 집계·연간 추정·월별 추이 화면이 원본 분개장 대신 이 큐브를 읽도록 합니다.
+"""
+import calendar
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from .accounts import KIND_EXPENSE, KIND_REVENUE, account_kind_mask
+
+MONTHS = 12
+
+
+def _months_of(df: pd.DataFrame) -> np.ndarray:
+    """1~12 월 번호 배열 (month 컬럼 우선, 없거나 비정상이면 da_date에서 추출, 실패 시 0)"""
+    month = pd.Series(np.nan, index=df.index)
+    if 'month' in df.columns:
+        month = pd.to_numeric(df['month'].astype(object), errors='coerce')
+    if 'da_date' in df.columns:
+        from_date = pd.to_numeric(df['da_date'].astype(object), errors='coerce') // 100 % 100
+        month = month.where(month.between(1, MONTHS), from_date)
+    return month.where(month.between(1, MONTHS), 0).fillna(0).to_numpy(dtype='int64')
+
+
+def months_passed_from_dates(da_date: pd.Series) -> Tuple[int, int]:
+    """
+    마지막 전표 일자로 경과(마감) 개월 수를 구합니다.
+    마지막 달이 말일까지 입력되지 않았다면 진행 중인 달로 보고 제외합니다.
+
+    Returns:
+        (경과 개월 수(최소 1), 마지막 일자 yyyymmdd - 없으면 0)
+    """
+    dates = pd.to_numeric(da_date.astype(object), errors='coerce').dropna()
+    dates = dates[(dates // 100 % 100).between(1, MONTHS)]
+    if dates.empty:
+        return MONTHS, 0
+    last = int(dates.max())
+    year, month, day = last // 10000, last // 100 % 100, last % 100
+    closed = month if day >= calendar.monthrange(year, month)[1] else month - 1
+    return max(closed, 1), last
+
+
+@dataclass
+class MonthlyCube:
+    """
+    계정 × 월 집계 (행: 계정코드, 열: 1~12월)
+
+    Attributes:
+        accounts: 계정코드 (문자열, 오름차순)
+        names: 계정명 (계정코드별 첫 등장 이름)
+        debit: 차변 합계 (계정 수 × 12)
+        credit: 대변 합계 (계정 수 × 12)
+        count: 분개 라인 수 (계정 수 × 12)
+        months_passed: 데이터로 판단한 마감 개월 수
+        last_date: 마지막 전표 일자 (yyyymmdd)
+    """
+    accounts: np.ndarray
+    names: np.ndarray
+    debit: np.ndarray
+    credit: np.ndarray
+    count: np.ndarray
+    months_passed: int = MONTHS
+    last_date: int = 0
+
+    @property
+    def net(self) -> np.ndarray:
+        """차변 - 대변"""
+        return self.debit - self.credit
+
+    @property
+    def empty(self) -> bool:
+        return len(self.accounts) == 0
+
+    def kind_mask(self, *kinds: int) -> np.ndarray:
+        """계정 종류(KIND_*)에 속하는 계정 행 마스크"""
+        return account_kind_mask(self.accounts, kinds)
+
+    def revenue_by_month(self) -> np.ndarray:
+        """월별 매출 (4xxxx: 대변 - 차변)"""
+        return -self.net[self.kind_mask(KIND_REVENUE)].sum(axis=0)
+
+    def expense_by_month(self) -> np.ndarray:
+        """월별 비용 (5/8/9xxxx: 차변 - 대변)"""
+        return self.net[self.kind_mask(KIND_EXPENSE)].sum(axis=0)
+
+    def financials(self, closed_only: bool = True) -> Tuple[float, float]:
+        """
+        (매출, 비용) 합계
+
+        Args:
+            closed_only: True면 마감 월(1~months_passed)만 합산해 months_passed로 나누는 추정과 분자·분모를 맞춤,
+                False면 진행 중인 달까지 전체 합산 (calculate_financials와 같은 값)
+        """
+        if self.empty:
+            return 0, 0
+        months = self.months_passed if closed_only else MONTHS
+        return self.revenue_by_month()[:months].sum(), self.expense_by_month()[:months].sum()
+
+    def to_frame(self) -> pd.DataFrame:
+        """long 형식 DataFrame (계정코드, 계정명, 월, 차변, 대변, 순액, 건수) - 0건 셀 제외"""
+        acct_idx, month_idx = np.nonzero(self.count)
+        return pd.DataFrame({
+            'cd_acctit': self.accounts[acct_idx],
+            'nm_acctit': self.names[acct_idx],
+            'month': month_idx + 1,
+            'debit': self.debit[acct_idx, month_idx],
+            'credit': self.credit[acct_idx, month_idx],
+            'net': self.net[acct_idx, month_idx],
+            'count': self.count[acct_idx, month_idx],
+        })
+
+
+def build_monthly_cube(df: pd.DataFrame) -> MonthlyCube:
+    """
+    분개장으로 계정 × 월 큐브를 만듭니다. (factorize + bincount 한 번으로 전체 집계)
+
+    Args:
+        df: 전처리된 분개장 DataFrame (cd_acctit, month 또는 da_date, mn_bungae1/2)
+
+    Returns:
+        MonthlyCube
+    """
+    empty = np.zeros((0, MONTHS), dtype='int64')
+    if df.empty or 'cd_acctit' not in df.columns:
+        return MonthlyCube(np.array([], dtype=object), np.array([], dtype=object), empty, empty.copy(), empty.copy())
+
+    codes, accounts = pd.factorize(df['cd_acctit'].astype(object).astype(str).where(df['cd_acctit'].notna()), sort=True)
+    month = _months_of(df)
+    valid = (codes >= 0) & (month > 0)
+    cell = codes[valid] * MONTHS + (month[valid] - 1)
+    size = len(accounts) * MONTHS
+
+    def cell_sum(col):
+        if col not in df.columns:
+            return np.zeros((len(accounts), MONTHS), dtype='int64')
+        values = pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy()[valid]
+        total = np.bincount(cell, weights=values, minlength=size).reshape(-1, MONTHS)
+        # 정수 금액은 정수로 유지 (float64는 2^53 까지 정확)
+        return total.round().astype('int64') if np.all(values % 1 == 0) else total
+
+    names = np.array([''] * len(accounts), dtype=object)
+    if 'nm_acctit' in df.columns:
+        first = pd.Series(df['nm_acctit'].astype(object).to_numpy()[codes >= 0]).groupby(codes[codes >= 0]).first()
+        names[first.index.to_numpy()] = first.to_numpy()
+
+    months_passed, last_date = months_passed_from_dates(df['da_date']) if 'da_date' in df.columns else (MONTHS, 0)
+    return MonthlyCube(
+        accounts=np.asarray(accounts, dtype=object),
+        names=names,
+        debit=cell_sum('mn_bungae1'),
+        credit=cell_sum('mn_bungae2'),
+        count=np.bincount(cell, minlength=size).reshape(-1, MONTHS),
+        months_passed=months_passed,
+        last_date=last_date,
+    )
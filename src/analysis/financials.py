@@ -0,0 +1,61 @@
+"""
+손익 집계 모듈
+전처리된 분개장과 손익계산서 JSON에서 매출/비용 합계를 계산합니다.
+"""
+from typing import Tuple
+
+import pandas as pd
+
+from .accounts import KIND_EXPENSE, KIND_REVENUE, account_kinds
+from .income_statement import (
+    GR_NON_OPERATING_EXPENSE, GR_REVENUE, GR_SGA, PRIOR, IncomeStatement, parse_income_statement_tree
+)
+
+
+def calculate_financials(df: pd.DataFrame) -> Tuple[int, int]:
+    """
+    분개장의 매출(4xxxx: 대변-차변)과 비용(5/8/9xxxx: 차변-대변) 합계를 계산합니다.
+
+    Args:
+        df: 전처리된 분개장 DataFrame
+
+    Returns:
+        (매출, 비용)
+    """
+    if df.empty or 'cd_acctit' not in df.columns:
+        return 0, 0
+    kinds = account_kinds(df['cd_acctit'])
+    rev_df = df[kinds == KIND_REVENUE]
+    revenue = (rev_df['mn_bungae2'].astype('int64') - rev_df['mn_bungae1']).sum()
+    exp_df = df[kinds == KIND_EXPENSE]
+    expense = (exp_df['mn_bungae1'].astype('int64') - exp_df['mn_bungae2']).sum()
+    return revenue, expense
+
+
+def parse_income_statement(pl_data) -> Tuple[int, int]:
+    """
+    손익계산서 JSON에서 전년도 매출액과 비용(판관비 + 영업외비용)을 추출합니다.
+    계정명 대신 과목 그룹 코드(cd_gr)의 구간 합계로 찾습니다.
+
+    Args:
+        pl_data: 손익계산서 행 리스트
+
+    Returns:
+        (전년도 매출, 전년도 비용)
+    """
+    return prior_year_totals(parse_income_statement_tree(pl_data))
+
+
+def prior_year_totals(statement: IncomeStatement) -> Tuple[float, float]:
+    """
+    이미 읽은 손익계산서 색인 표에서 전년도 매출액과 비용(판관비 + 영업외비용)을 구합니다. (재파싱 없음)
+
+    Args:
+        statement: parse_income_statement_tree 결과
+
+    Returns:
+        (전년도 매출, 전년도 비용) - 빈 표면 (0, 0)
+    """
+    rev_24 = statement.subtotal(GR_REVENUE, PRIOR)
+    exp_24 = statement.subtotal(GR_SGA, PRIOR) + statement.subtotal(GR_NON_OPERATING_EXPENSE, PRIOR)
+    return rev_24, exp_24
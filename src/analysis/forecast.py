@@ -0,0 +1,75 @@
+"""
+연간 손익 추정 모듈 (Landing Forecast)
+"""
+from .cube import MonthlyCube
+from .results import ForecastResult
+
+
+def forecast_landing(
+    revenue_ytd: float,
+    expense_ytd: float,
+    rev_24_total: float,
+    card_gap_amt: float,
+    months_passed: int = 9
+) -> ForecastResult:
+    """
+    누적 실적으로 연간 매출/비용/이익을 추정합니다.
+
+    매출은 연환산(평균법)과 전년 대비 성장률(추세법) 중 큰 값을 채택하고,
+    비용은 기록분 + 카드 누락분 + 남은 기간 예상분으로 나누어 계산합니다.
+
+    Args:
+        revenue_ytd: 당해 누적 매출
+        expense_ytd: 당해 누적 비용
+        rev_24_total: 전년도 연매출 (없으면 0)
+        card_gap_amt: 카드 누락 금액
+        months_passed: 경과 개월 수
+
+    Returns:
+        ForecastResult
+    """
+    rev_proj_avg = revenue_ytd / months_passed * 12
+
+    if rev_24_total > 0:
+        rev_24_ytd_approx = rev_24_total / 12 * months_passed
+        growth_rate = revenue_ytd / rev_24_ytd_approx
+        rev_proj_trend = rev_24_total * growth_rate
+    else:
+        rev_proj_trend = rev_proj_avg
+
+    final_rev_baseline = max(rev_proj_avg, rev_proj_trend)
+    method_used = "평균법" if final_rev_baseline == rev_proj_avg else "추세법"
+
+    # 미래 비용 예측 (현재 월평균 + 누락분 반영된 월평균)
+    monthly_real_burn = (expense_ytd + card_gap_amt) / months_passed
+    exp_future = monthly_real_burn * (12 - months_passed)
+
+    final_exp_projected = expense_ytd + card_gap_amt + exp_future
+    return ForecastResult(
+        final_rev_baseline=final_rev_baseline,
+        method_used=method_used,
+        exp_booked=expense_ytd,
+        exp_missing=card_gap_amt,
+        exp_future=exp_future,
+        final_exp_projected=final_exp_projected,
+        final_profit=final_rev_baseline - final_exp_projected,
+        proj_expense_simple=expense_ytd / months_passed * 12,
+        months_passed=months_passed,
+    )
+
+
+def forecast_from_cube(cube: MonthlyCube, rev_24_total: float, card_gap_amt: float) -> ForecastResult:
+    """
+    계정 × 월 큐브의 마감 월 누적 실적과 데이터 기준 경과 개월 수로 연간 손익을 추정합니다.
+    진행 중인 달의 부분 실적은 제외하고 남은 기간 추정(exp_future)에 포함됩니다.
+
+    Args:
+        cube: 당해 분개장 집계 큐브
+        rev_24_total: 전년도 연매출 (없으면 0)
+        card_gap_amt: 카드 누락 금액
+
+    Returns:
+        ForecastResult
+    """
+    revenue_ytd, expense_ytd = cube.financials()
+    return forecast_landing(revenue_ytd, expense_ytd, rev_24_total, card_gap_amt, months_passed=cube.months_passed)
@@ -0,0 +1,218 @@
+"""
+카드 누락 분석 모듈
+신용카드 확정 내역 중 분개장에 반영되지 않은 건을 찾습니다.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.modules.card_matcher import match_card_to_journal
+from src.modules.merchant_ids import MerchantDictionary
+from .results import GapResult
+
+STATUS_NAMES = {1: "미추천", 2: "확정", 3: "확정가능", 5: "삭제전표", 6: "불공제"}
+# 카드별 매칭 근거 (match_card_to_journal 결과 중 화면에 보여 줄 컬럼)
+MATCH_DETAIL_COLUMNS = ['day_diff', 'amount_diff', 'split', 'confidence']
+
+
+def get_status_name(code) -> str:
+    return STATUS_NAMES.get(code, f"기타({code})")
+
+
+def _card_text(df_card: pd.DataFrame, col: str) -> pd.Series:
+    # 결측(None/NaN)은 빈 문자열로 취급
+    if col not in df_card.columns:
+        return pd.Series('', index=df_card.index)
+    return df_card[col].astype(object).fillna('').astype(str).str.strip()
+
+
+def _card_number(df_card: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df_card.columns:
+        return pd.Series(0, index=df_card.index)
+    return pd.to_numeric(df_card[col], errors='coerce').fillna(0)
+
+
+def card_frame(card_data) -> Optional[pd.DataFrame]:
+    """카드 내역을 DataFrame으로 (DataFrame / 리스트 / {'data': [...]}, 비어 있으면 None)"""
+    if card_data is None or len(card_data) == 0:
+        return None
+    if isinstance(card_data, pd.DataFrame):
+        return card_data
+    card_list = card_data if isinstance(card_data, list) else card_data.get('data', [])
+    return pd.DataFrame(card_list) if card_list else None
+
+
+def card_status(df_card: pd.DataFrame) -> np.ndarray:
+    """카드 전표 상태 코드 배열 (ty_jungstat, 결측은 0)"""
+    return _card_number(df_card, 'ty_jungstat').astype('int64').to_numpy()
+
+
+def history_hints(
+    df_card: pd.DataFrame,
+    history_map: Dict[str, str],
+    merchants: Optional[MerchantDictionary] = None
+) -> pd.Series:
+    """
+    카드 행별 이력 계정과목을 거래처 ID로 조인해 찾습니다.
+    ('（주）아트박스' 카드도 이력의 '(주)아트박스'와 같은 ID, 사전에 코드/사업자번호 연결이 있으면 이름이 달라도 같은 ID)
+
+    Args:
+        df_card: 카드 내역 DataFrame (nm_trade, 선택: cd_trade, bisocial_no)
+        history_map: 거래처별 계정과목
+        merchants: 분개장/카드로 미리 만든 거래처 ID 사전 (없으면 이름만으로 새로 만듦, 원본은 바꾸지 않음)
+
+    Returns:
+        Series (df_card 인덱스, 이력 없으면 빈 문자열)
+    """
+    if not history_map or df_card.empty:
+        return pd.Series('', index=df_card.index)
+    ids = merchants.copy() if merchants is not None else MerchantDictionary()
+    history_ids = ids.register(pd.DataFrame({'nm_trade': list(history_map)}))
+    # 같은 ID로 모이는 이력 이름이 여럿이면 정렬상 뒤쪽 이름의 계정 (history_from_tops와 같은 규칙)
+    table = pd.Series(list(history_map.values()), index=history_ids)
+    table = table.iloc[np.argsort(np.array(list(history_map), dtype=object), kind='stable')]
+    table = table[(table.index >= 0) & ~table.index.duplicated(keep='last')]
+    card_ids = ids.register(df_card)
+    return pd.Series(table.reindex(card_ids).fillna('').astype(str).to_numpy(), index=df_card.index)
+
+
+def match_details(matches: pd.DataFrame) -> pd.DataFrame:
+    """매칭 쌍에서 카드별 매칭 근거만 남깁니다. (index: card_index)"""
+    return matches.set_index('card_index')[MATCH_DETAIL_COLUMNS]
+
+
+def matched_frame(df_card: pd.DataFrame, details: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    매칭된 카드와 근거 표 (누락 0원도 어떤 전표와 짝지어졌는지 확인할 수 있도록)
+
+    Args:
+        df_card: 카드 내역 DataFrame
+        details: match_details 결과 (index: df_card 인덱스)
+
+    Returns:
+        DataFrame (일자, 거래처, 금액, 일자 차이, 금액 차이, 부가세 분할, 신뢰도)
+    """
+    if details is None or details.empty:
+        return pd.DataFrame()
+    rows = df_card.loc[details.index]
+    return pd.DataFrame({
+        "일자": _card_text(rows, 'da_sbook'),
+        "거래처": _card_text(rows, 'nm_trade'),
+        "금액": _card_number(rows, 'mn_total'),
+        "일자 차이": details['day_diff'].astype('int64'),
+        "금액 차이": details['amount_diff'],
+        "부가세 분할": details['split'].astype(bool),
+        "신뢰도": details['confidence'].astype('float64'),
+    }).reset_index(drop=True)
+
+
+def gap_from_matched(
+    df_card: pd.DataFrame,
+    matched: np.ndarray,
+    history_map: Dict[str, str],
+    merchants: Optional[MerchantDictionary] = None,
+    details: Optional[pd.DataFrame] = None
+) -> GapResult:
+    """
+    매칭 여부 배열로 누락 결과를 만듭니다. (확정 상태이면서 매칭되지 않은 카드 = 누락)
+
+    Args:
+        df_card: 카드 내역 DataFrame
+        matched: 카드 행별 매칭 여부
+        history_map: 거래처별 전년도 계정과목
+        merchants: 거래처 ID 사전 (history_hints 참고)
+        details: 매칭된 카드의 근거 (match_details, 없으면 matches는 빈 표)
+
+    Returns:
+        GapResult
+    """
+    matches = matched_frame(df_card, details)
+    missing = (card_status(df_card) == 2) & ~matched
+    df_miss = df_card[missing]
+    if df_miss.empty:
+        return GapResult(matches=matches)
+
+    card_date = _card_text(df_miss, 'da_sbook')
+    card_amt = _card_number(df_miss, 'mn_total')
+    merchant = _card_text(df_miss, 'nm_trade')
+
+    # 업종 정보
+    biz_cond = _card_text(df_miss, 'bizcond')
+    biz_cate = _card_text(df_miss, 'bizcate')
+    industry = (biz_cond + " / " + biz_cate).where((biz_cond != '') | (biz_cate != ''), '')
+
+    # 비고란 로직 (전년도 > 추천 > 미분류)
+    history_hint = history_hints(df_miss, history_map, merchants)
+    acct_hint = _card_text(df_miss, 'nm_acctit_cha')
+    remark_display = np.select(
+        [history_hint != '', acct_hint != ''],
+        ["💡전년도: " + history_hint, "추천: " + acct_hint],
+        default="미분류"
+    )
+
+    status_miss = _card_number(df_miss, 'ty_jungstat').astype('int64')
+    status_name = status_miss.map(STATUS_NAMES).fillna("기타(" + status_miss.astype(str) + ")")
+    amount = df_miss['mn_total'] if 'mn_total' in df_miss.columns else card_amt
+
+    missing_df = pd.DataFrame({
+        "일자": card_date,
+        "거래처": merchant,
+        "업종(업태/종목)": industry,
+        "금액": amount,
+        "전표상태": status_name,
+        "비고(AI힌트)": remark_display,
+        "전년도이력": history_hint
+    }).reset_index(drop=True)
+    return GapResult(total_gap=card_amt.sum(), missing=missing_df, matches=matches)
+
+
+def analyze_card_gap(
+    df_journal: pd.DataFrame,
+    card_data,
+    history_map: Dict[str, str],
+    date_window: Optional[int] = None,
+    amount_tol: float = 0,
+    merchants: Optional[MerchantDictionary] = None
+) -> GapResult:
+    """
+    확정(ty_jungstat=2) 카드 내역 중 분개장에 없는 건을 찾습니다.
+
+    Args:
+        df_journal: 전처리된 분개장 DataFrame
+        card_data: 카드 내역 (DataFrame / 리스트 / {'data': [...]})
+        history_map: 거래처별 전년도 계정과목
+        date_window: 허용 일수 (None이면 일자+금액 정확 일치)
+        amount_tol: 허용 금액 오차 (원)
+        merchants: 거래처 ID 사전 (이력 힌트 조인용, 없으면 이름 정규화만 사용)
+
+    Returns:
+        GapResult (누락 금액 합계, 누락 내역, 허용 범위 매칭 내역 DataFrame)
+    """
+    df_card = card_frame(card_data)
+    if df_journal.empty or df_card is None:
+        return GapResult()
+
+    details = None
+    if date_window is not None:
+        # 허용 범위 매칭 (입력 시차, 부가세 분할 전표, 거래처 코드/이름 반영)
+        confirmed = df_card[card_status(df_card) == 2]
+        matches = match_card_to_journal(df_journal, confirmed, date_window=date_window, amount_tol=amount_tol)
+        matched = df_card.index.isin(matches['card_index'])
+        details = match_details(matches)
+    # 일자+금액 anti-join (카드 da_sbook/mn_total vs 장부 da_date/mn_bungae1)
+    elif 'da_date' in df_journal.columns and 'mn_bungae1' in df_journal.columns:
+        journal_keys = pd.DataFrame({
+            'date': df_journal['da_date'].astype(str),
+            'amt': df_journal['mn_bungae1'].astype('int64'),
+        }).drop_duplicates()
+        journal_keys['hit'] = True
+        card_keys = pd.DataFrame({
+            'date': _card_text(df_card, 'da_sbook'),
+            'amt': _card_number(df_card, 'mn_total').astype('int64'),
+        })
+        matched = card_keys.merge(journal_keys, on=['date', 'amt'], how='left')['hit'].notna().to_numpy()
+    else:
+        matched = np.zeros(len(df_card), dtype=bool)
+
+    return gap_from_matched(df_card, matched, history_map, merchants, details)
@@ -0,0 +1,216 @@
+"""
+거래처 이력 모델
+여러 해 분개장의 (거래처, 계정과목) 건수를 정수 코드 조합 키로 한 번에 연도별 집계해 두고,
+최근 연도에 더 큰 가중치(연 decay배 감쇠)를 준 계정 분포로 카드 누락 건의 계정 힌트를 만듭니다.
+연도 단위로 추가/교체할 수 있고 Feather 파일로 저장해 다음 세션에서 바로 읽습니다.
+"""
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+import pandas as pd
+
+from src.modules.merchant_ids import normalize_merchants
+
+DEFAULT_DECAY = 0.5
+# 이력 키 규칙(거래처명 정규화 등)이 바뀌면 올려서 저장된 이력을 다시 집계
+HISTORY_FORMAT = 2
+HISTORY_COLUMNS = ['merchant', 'account', 'year', 'count', 'first']
+
+
+def _codes(values: pd.Series):
+    """정수 코드와 고유값 (category면 카테고리 코드를 그대로 사용, 결측은 -1)"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), np.asarray(values.cat.categories, dtype=object)
+    codes, uniques = pd.factorize(values)
+    return codes, np.asarray(uniques, dtype=object)
+
+
+def merchant_account_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    (원본 거래처명, 계정과목)별 건수와 첫 등장 행 위치를 집계합니다.
+    두 컬럼을 정수 코드로 바꿔 조합 키 하나로 np.unique 합니다. (행별 리스트/Counter 없음)
+
+    Args:
+        df: 분개장 DataFrame (nm_trade, nm_acctit)
+
+    Returns:
+        DataFrame (merchant, account, count, first) - 거래처/계정 결측 행 제외
+    """
+    if df.empty or 'nm_trade' not in df.columns or 'nm_acctit' not in df.columns:
+        return pd.DataFrame({'merchant': pd.Series(dtype=object), 'account': pd.Series(dtype=object),
+                             'count': pd.Series(dtype='int64'), 'first': pd.Series(dtype='int64')})
+    merchant_codes, merchants = _codes(df['nm_trade'])
+    account_codes, accounts = _codes(df['nm_acctit'])
+    valid = np.flatnonzero((merchant_codes >= 0) & (account_codes >= 0))
+    key = merchant_codes[valid].astype('int64') * max(len(accounts), 1) + account_codes[valid]
+    pairs, first, counts = np.unique(key, return_index=True, return_counts=True)
+    return pd.DataFrame({
+        'merchant': merchants[pairs // max(len(accounts), 1)],
+        'account': accounts[pairs % max(len(accounts), 1)],
+        'count': counts.astype('int64'),
+        'first': valid[first].astype('int64'),
+    })
+
+
+def merchant_top_accounts(df: pd.DataFrame) -> Dict[str, str]:
+    """
+    원본 거래처명(공백 정리 전)별 최빈 계정과목을 구합니다. (동률이면 먼저 나온 계정)
+
+    Args:
+        df: 분개장 DataFrame (nm_trade, nm_acctit)
+
+    Returns:
+        Dict[원본 거래처명, 계정과목] - 빈 거래처명 제외
+    """
+    counts = merchant_account_counts(df)
+    counts = counts[counts['merchant'].astype(str).str.strip() != '']
+    top = counts.sort_values(['merchant', 'count', 'first'], ascending=[True, False, True]).drop_duplicates('merchant')
+    return dict(zip(top['merchant'], top['account']))
+
+
+def history_from_tops(tops: Dict[str, str]) -> Dict[str, str]:
+    """원본 거래처명별 계정을 공백 정리한 거래처명 기준으로 합칩니다. (같은 이름이면 정렬상 뒤쪽 우선)"""
+    return {merchant.strip(): tops[merchant] for merchant in sorted(tops)}
+
+
+def build_history_map(df_2024: pd.DataFrame) -> Dict[str, str]:
+    """
+    전년도 분개장에서 거래처별 최빈 계정과목을 구합니다.
+
+    Args:
+        df_2024: 전년도 분개장 DataFrame
+
+    Returns:
+        Dict[거래처명, 계정과목]
+    """
+    return history_from_tops(merchant_top_accounts(df_2024))
+
+
+def _year_counts(df: pd.DataFrame, year: int) -> pd.DataFrame:
+    """한 해 분개장의 (정규화 거래처명, 계정과목) 건수 - '（주）A'와 '(주)A', 'A '는 한 거래처"""
+    counts = merchant_account_counts(df)
+    codes, keys = normalize_merchants(counts['merchant'])
+    counts = counts[codes >= 0].assign(merchant=keys[codes[codes >= 0]])
+    out = counts.groupby(['merchant', 'account'], sort=False).agg(count=('count', 'sum'), first=('first', 'min'))
+    out = out.reset_index()
+    out.insert(2, 'year', year)
+    return out.astype({'year': 'int16', 'count': 'int32', 'first': 'int64'})[HISTORY_COLUMNS]
+
+
+@dataclass
+class MerchantHistory:
+    """
+    연도별 (거래처, 계정과목) 건수 이력
+
+    Attributes:
+        counts: 연도별 건수 (HISTORY_COLUMNS, merchant = 정규화 거래처명, first = 그 해 첫 등장 행 위치)
+        decay: 한 해 지날 때마다 곱하는 가중치 (0.5면 2년 전 자료는 최근 연도의 1/4)
+        sources: 연도별 원본 지문 (증분 갱신 시 바뀐 연도만 다시 읽는 데 사용)
+    """
+    counts: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=HISTORY_COLUMNS))
+    decay: float = DEFAULT_DECAY
+    sources: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return self.counts.empty
+
+    @property
+    def years(self) -> list:
+        return sorted(self.counts['year'].unique().tolist())
+
+    def add_year(self, df: pd.DataFrame, year: int, source: str = "") -> "MerchantHistory":
+        """
+        한 해 분개장을 더한 새 이력을 반환합니다. (같은 연도가 있으면 교체, 다른 연도는 다시 집계하지 않음)
+
+        Args:
+            df: 해당 연도 분개장
+            year: 연도
+            source: 원본 지문 (없으면 빈 문자열)
+        """
+        kept = self.counts[self.counts['year'] != year]
+        counts = pd.concat([kept, _year_counts(df, year)], ignore_index=True) if not kept.empty else _year_counts(df, year)
+        sources = {**{y: s for y, s in self.sources.items() if y != year}, year: source}
+        return MerchantHistory(counts=counts, decay=self.decay, sources=sources)
+
+    def drop_years(self, years) -> "MerchantHistory":
+        """주어진 연도를 뺀 새 이력"""
+        years = set(years)
+        return MerchantHistory(
+            counts=self.counts[~self.counts['year'].isin(years)].reset_index(drop=True),
+            decay=self.decay,
+            sources={y: s for y, s in self.sources.items() if y not in years},
+        )
+
+    def distribution(self) -> pd.DataFrame:
+        """
+        거래처별 계정 분포 (가중 건수 = Σ 건수 × decay^(최근 연도 - 연도))
+
+        Returns:
+            DataFrame (merchant, account, score, share, last_year) - 거래처 안에서 점수 높은 순
+        """
+        if self.empty:
+            return pd.DataFrame(columns=['merchant', 'account', 'score', 'share', 'last_year'])
+        counts = self.counts
+        weight = self.decay ** (counts['year'].max() - counts['year'].astype('int64'))
+        scored = counts.assign(score=counts['count'] * weight)
+        # 동점이면 최근 연도에 나온 계정, 그 해 먼저 나온 계정 순
+        latest = scored.sort_values(['year', 'first'], ascending=[False, True]).drop_duplicates(['merchant', 'account'])
+        out = scored.groupby(['merchant', 'account'], sort=False)['score'].sum().reset_index()
+        out = out.merge(latest[['merchant', 'account', 'year', 'first']].rename(columns={'year': 'last_year'}),
+                        on=['merchant', 'account'])
+        out['share'] = out['score'] / out.groupby('merchant')['score'].transform('sum')
+        out = out.sort_values(['merchant', 'score', 'last_year', 'first'], ascending=[True, False, False, True])
+        return out[['merchant', 'account', 'score', 'share', 'last_year']].reset_index(drop=True)
+
+    def top_accounts(self) -> pd.DataFrame:
+        """거래처별 1순위 계정 (merchant, account, score, share, last_year)"""
+        return self.distribution().drop_duplicates('merchant').reset_index(drop=True)
+
+    def to_map(self) -> Dict[str, str]:
+        """analyze_card_gap에 넘기는 {정규화 거래처명: 계정과목}"""
+        top = self.top_accounts()
+        return dict(zip(top['merchant'], top['account']))
+
+    def to_feather(self, path: Union[str, Path]) -> None:
+        """건수 표를 Feather로 저장합니다. (decay·연도별 지문은 스키마 메타데이터)"""
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        table = pa.Table.from_pandas(self.counts.reset_index(drop=True), preserve_index=False)
+        meta = {b'format': str(HISTORY_FORMAT).encode(), b'decay': str(self.decay).encode(),
+                b'sources': json.dumps(self.sources).encode()}
+        feather.write_feather(table.replace_schema_metadata({**(table.schema.metadata or {}), **meta}),
+                              str(path), compression='uncompressed')
+
+    @classmethod
+    def from_feather(cls, path: Union[str, Path]) -> "MerchantHistory":
+        """to_feather로 저장한 이력을 읽습니다. (다른 형식 버전이면 ValueError)"""
+        import pyarrow.feather as feather
+
+        table = feather.read_table(str(path), memory_map=True)
+        meta = table.schema.metadata or {}
+        if meta.get(b'format') != str(HISTORY_FORMAT).encode():
+            raise ValueError(f"거래처 이력 형식이 다릅니다: {path}")
+        sources = {int(y): s for y, s in json.loads(meta.get(b'sources', b'{}')).items()}
+        return cls(counts=table.to_pandas(), decay=float(meta.get(b'decay', DEFAULT_DECAY)), sources=sources)
+
+
+def build_merchant_history(journals: Dict[int, pd.DataFrame], decay: float = DEFAULT_DECAY) -> MerchantHistory:
+    """
+    연도별 분개장으로 거래처 이력을 만듭니다.
+
+    Args:
+        journals: {연도: 분개장 DataFrame}
+        decay: 연간 감쇠 가중치
+
+    Returns:
+        MerchantHistory
+    """
+    history = MerchantHistory(decay=decay)
+    for year, df in sorted(journals.items()):
+        history = history.add_year(df, year)
+    return history
@@ -0,0 +1,123 @@
+"""
+손익계산서 파서
+손익계산서 JSON 행을 과목 그룹 코드(cd_gr)·순서(ord_lcate/ord_scate)·구간 번호(key_index)로 묶어
+당기/전기 금액을 가진 색인 표로 만듭니다. 계정명 문자열이나 들여쓰기에 의존하지 않습니다.
+
+- 구간 합계 행: cd_acctit == '0', 금액은 mn_total2(당기) / mn_btotal2(전기)
+- 계정 행: cd_acctit = 3자리 계정코드, 금액은 mn_total1(당기) / mn_btotal1(전기)
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .accounts import account_keys
+
+# 과목 그룹 코드 (cd_gr)
+GR_REVENUE = 61000            # Ⅰ. 매출액
+GR_COST_OF_SALES = 62000      # Ⅱ. 매출원가
+GR_GROSS_PROFIT = 62010       # Ⅲ. 매출총이익
+GR_SGA = 65000                # Ⅳ. 판매비와 관리비
+GR_OPERATING_INCOME = 65010   # Ⅴ. 영업이익
+GR_NON_OPERATING_INCOME = 66000   # Ⅵ. 영업외수익
+GR_NON_OPERATING_EXPENSE = 66500  # Ⅶ. 영업외비용
+GR_PRETAX_INCOME = 66530      # Ⅷ. 소득세 차감전 이익
+GR_INCOME_TAX = 69030         # Ⅸ. 소득세등
+GR_NET_INCOME = 69060         # Ⅹ. 당기순이익
+
+CURRENT = "당기"
+PRIOR = "전기"
+IS_COLUMNS = ["cd_gr", "key_index", "ord_lcate", "ord_scate", "cd_acctit", "account_key", "nm_acctit", "구간합계",
+              CURRENT, PRIOR]
+
+
+def _int(value, default: int = 0) -> int:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class IncomeStatement:
+    """
+    당기/전기 손익계산서 색인 표
+
+    Attributes:
+        frame: 행 (IS_COLUMNS) - key_index, ord_lcate, ord_scate 순
+    """
+    frame: pd.DataFrame
+    _subtotals: Dict[int, int] = field(default_factory=dict, repr=False)
+    _items: Dict[Tuple[int, int], int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        # (cd_gr) → 구간 합계 행, (cd_gr, 계정 키) → 계정 행 위치
+        for pos, (gr, key, subtotal) in enumerate(zip(
+                self.frame["cd_gr"].tolist(), self.frame["account_key"].tolist(), self.frame["구간합계"].tolist())):
+            if subtotal:
+                self._subtotals.setdefault(gr, pos)
+            else:
+                self._items.setdefault((gr, key), pos)
+        self._current = self.frame[CURRENT].to_numpy()
+        self._prior = self.frame[PRIOR].to_numpy()
+
+    @property
+    def empty(self) -> bool:
+        return self.frame.empty
+
+    def _amount(self, pos: Optional[int], year: str) -> float:
+        if pos is None:
+            return 0
+        return (self._current if year == CURRENT else self._prior)[pos].item()
+
+    def subtotal(self, cd_gr: int, year: str = CURRENT) -> float:
+        """구간 합계 (예: subtotal(GR_REVENUE, PRIOR) = 전기 매출액)"""
+        return self._amount(self._subtotals.get(cd_gr), year)
+
+    def item(self, cd_gr: int, account, year: str = CURRENT) -> float:
+        """구간 안의 계정 금액 (account: '401' / '40100' / 40100 모두 가능)"""
+        key = int(account_keys([account])[0])
+        return self._amount(self._items.get((cd_gr, key)), year)
+
+    def items(self, cd_gr: int) -> pd.DataFrame:
+        """구간 안의 계정 행"""
+        rows = self.frame[(self.frame["cd_gr"] == cd_gr) & ~self.frame["구간합계"]]
+        return rows[["cd_acctit", "nm_acctit", CURRENT, PRIOR]].reset_index(drop=True)
+
+    def compare(self) -> pd.DataFrame:
+        """전 행의 전기 대비 증감/증감률 (전기 0이면 증감률 NaN)"""
+        out = self.frame[["cd_gr", "cd_acctit", "nm_acctit", "구간합계", CURRENT, PRIOR]].copy()
+        out["증감"] = self._current - self._prior
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["증감률"] = np.where(self._prior != 0, out["증감"].to_numpy() / self._prior, np.nan)
+        return out
+
+
+def parse_income_statement_tree(pl_data) -> IncomeStatement:
+    """
+    손익계산서 JSON 행 리스트를 당기/전기 색인 표로 읽습니다.
+
+    Args:
+        pl_data: 손익계산서 행 리스트 (cd_gr, ord_lcate, ord_scate, key_index, cd_acctit, nm_acctit, mn_total*/mn_btotal*)
+
+    Returns:
+        IncomeStatement (데이터가 없으면 빈 표)
+    """
+    records = []
+    for row in pl_data or []:
+        code = str(row.get("cd_acctit") or "0").strip()
+        subtotal = _int(code) == 0
+        suffix = "2" if subtotal else "1"
+        records.append((
+            _int(row.get("cd_gr")), _int(row.get("key_index")), _int(row.get("ord_lcate")), _int(row.get("ord_scate")),
+            "" if subtotal else code, (row.get("nm_acctit") or "").strip(), subtotal,
+            row.get(f"mn_total{suffix}") or 0, row.get(f"mn_btotal{suffix}") or 0,
+        ))
+
+    frame = pd.DataFrame(records, columns=[c for c in IS_COLUMNS if c != "account_key"])
+    frame[[CURRENT, PRIOR]] = frame[[CURRENT, PRIOR]].apply(pd.to_numeric, errors="coerce").fillna(0)
+    frame.insert(5, "account_key", np.where(frame["구간합계"], -1, account_keys(frame["cd_acctit"])))
+    frame = frame.sort_values(["key_index", "ord_lcate", "구간합계", "ord_scate"], ascending=[True, True, False, True],
+                              kind="stable", ignore_index=True)
+    return IncomeStatement(frame)
@@ -0,0 +1,556 @@
+"""
+증분 재분석 모듈
+매월 한 달치 전표가 더해진 분개장/카드 내역을 다시 받을 때, 직전 상태(계정 × 월 큐브, 거래처별 계정 통계,
+카드 매칭 결과)를 보관해 두고 추가·변경·삭제된 전표만 반영합니다. 결과는 전체 재계산과 같습니다.
+(기존 구간의 제자리 수정은 아래 표본 검사에 걸리거나 rescan=True일 때 반영)
+
+- 변경 감지: 전표(da_date + no_acct) 단위로 라인 내용 해시를 비교, 카드는 행 내용 해시(sq_sbook 포함)로 비교
+  내보내기는 뒤에 행이 붙는(append) 형태이므로 직전 행 수를 기준점으로 삼아 새로 붙은 행만 해시하고,
+  기존 구간은 표본 행(HASH_PROBE_ROWS개)의 해시가 그대로일 때 이전 해시를 재사용 (표본이 어긋나면 전체 해시)
+  표본에 걸리지 않은 과거 행의 제자리 수정까지 잡으려면 update(..., rescan=True)
+- 큐브: 삭제분을 빼고 추가분을 더함 (계정명은 변경된 계정만 다시 찾음)
+- 거래처 통계: 변경된 거래처만 최빈 계정을 다시 계산
+- 카드 매칭: 변경 지점에서 (일자 ± 허용 일수, 금액 ± 허용 오차)로 닿는 카드·전표 묶음만 다시 매칭
+  (탐욕적 1:1 배정은 서로 닿지 않는 묶음끼리 독립이므로 나머지 카드의 매칭 결과는 그대로 유효)
+- 결과 읽기: update()가 잠금 안에서 만든 IncrementalSnapshot에서만 읽음 (다른 스레드의 다음 update와 섞이지 않음)
+"""
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.modules.card_matcher import AMOUNT_SPAN, _to_days, match_card_to_journal
+from src.modules.merchant_ids import MerchantDictionary
+from .cube import MONTHS, MonthlyCube, _months_of, build_monthly_cube, months_passed_from_dates
+from .gap import MATCH_DETAIL_COLUMNS, analyze_card_gap, card_frame, card_status, gap_from_matched, match_details
+from .history import history_from_tops, merchant_top_accounts
+from .results import GapResult, IncrementalUpdate
+
+VOUCHER_COLUMNS = ['da_date', 'no_acct']
+REQUIRED_COLUMNS = {'da_date', 'cd_acctit', 'mn_bungae1'}
+HASH_PROBE_ROWS = 64
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """행 내용 해시 (정수 컬럼은 int64로 맞춰 int32/int64 저장 차이에 영향받지 않음)"""
+    cols = {
+        col: df[col].astype('int64') if pd.api.types.is_integer_dtype(df[col].dtype) else df[col]
+        for col in df.columns
+    }
+    return pd.util.hash_pandas_object(pd.DataFrame(cols, index=df.index), index=False).to_numpy()
+
+
+def _appended_hashes(df: pd.DataFrame, previous: Optional[pd.DataFrame], old_hash: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    직전 행 해시를 재사용해 기준점(직전 행 수) 뒤에 붙은 행만 해시합니다.
+    행 수가 줄었거나 컬럼이 다르거나 기존 구간 표본 행의 해시가 달라지면 전체를 다시 해시합니다.
+
+    Args:
+        df: 새 전체 데이터
+        previous: 직전 데이터 (없으면 None)
+        old_hash: 직전 데이터의 행 해시
+
+    Returns:
+        (행 해시, 재사용한 앞부분 행 수 - 전체를 다시 해시했으면 0)
+    """
+    n_old = len(old_hash)
+    if previous is None or n_old == 0 or len(df) < n_old or list(df.columns) != list(previous.columns):
+        return _row_hashes(df), 0
+    probe = np.unique(np.linspace(0, n_old - 1, min(n_old, HASH_PROBE_ROWS)).astype('int64'))
+    if not np.array_equal(_row_hashes(df.iloc[probe]), old_hash[probe]):
+        return _row_hashes(df), 0
+    return np.concatenate([old_hash, _row_hashes(df.iloc[n_old:])]), n_old
+
+
+def _combine(*arrays: np.ndarray) -> np.ndarray:
+    """여러 uint64/정수 배열을 행 단위로 하나의 해시로 합칩니다."""
+    frame = pd.DataFrame({i: np.asarray(a) for i, a in enumerate(arrays)})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def _occurrence(values: np.ndarray) -> np.ndarray:
+    """같은 값이 앞에서 몇 번 나왔는지 (0부터)"""
+    return pd.Series(values).groupby(values, sort=False).cumcount().to_numpy()
+
+
+def _voucher_hashes(df: pd.DataFrame, line_hash: np.ndarray, old_voucher: Optional[np.ndarray] = None,
+                    reused: int = 0) -> np.ndarray:
+    """라인별 전표 키 해시 (no_acct가 없으면 라인 하나가 전표 하나, 앞 reused행은 old_voucher 재사용)"""
+    if 'no_acct' not in df.columns:
+        return _combine(line_hash, _occurrence(line_hash))
+    if reused and old_voucher is not None and len(old_voucher) == reused:
+        return np.concatenate([old_voucher, _row_hashes(df[VOUCHER_COLUMNS].iloc[reused:])])
+    return _row_hashes(df[VOUCHER_COLUMNS])
+
+
+def _voucher_signatures(voucher: np.ndarray, line_hash: np.ndarray) -> pd.Series:
+    """
+    전표별 서명 (전표 안 라인의 순서·내용·개수) - 라인이 하나라도 바뀌면 달라짐
+
+    Returns:
+        Series (index: 전표 키 해시, 값: 서명)
+    """
+    if len(voucher) == 0:
+        return pd.Series(np.array([], dtype='uint64'), index=np.array([], dtype='uint64'))
+    mixed = _combine(line_hash, _occurrence(voucher))
+    order = np.argsort(voucher, kind='stable')
+    sorted_voucher = voucher[order]
+    starts = np.flatnonzero(np.r_[True, sorted_voucher[1:] != sorted_voucher[:-1]])
+    signature = np.bitwise_xor.reduceat(mixed[order], starts)
+    ids = sorted_voucher[starts]
+    return pd.Series(_combine(ids, signature, np.diff(np.r_[starts, len(order)])), index=ids)
+
+
+def _code_strings(codes: pd.Series) -> np.ndarray:
+    """build_monthly_cube와 같은 계정코드 문자열 (결측은 None)"""
+    if isinstance(codes.dtype, pd.CategoricalDtype):
+        cats = np.asarray(codes.cat.categories.astype(object).astype(str), dtype=object)
+        cat_codes = codes.cat.codes.to_numpy()
+        return np.where(cat_codes >= 0, cats[np.maximum(cat_codes, 0)], None)
+    return codes.astype(object).astype(str).where(codes.notna()).to_numpy(dtype=object)
+
+
+def _code_mask(codes: pd.Series, wanted: np.ndarray) -> np.ndarray:
+    """계정코드 문자열이 wanted에 속하는 행 마스크 (category면 카테고리에만 비교)"""
+    if isinstance(codes.dtype, pd.CategoricalDtype):
+        cats = np.isin(codes.cat.categories.astype(object).astype(str).to_numpy(dtype=object), wanted)
+        cat_codes = codes.cat.codes.to_numpy()
+        return (cat_codes >= 0) & cats[np.maximum(cat_codes, 0)]
+    return np.isin(_code_strings(codes), wanted)
+
+
+def _fractional(df: pd.DataFrame, col: str) -> int:
+    """월이 유효한 행 중 소수 금액 건수 (build_monthly_cube의 정수 유지 판단과 같은 기준)"""
+    if col not in df.columns or pd.api.types.is_integer_dtype(df[col].dtype):
+        return 0
+    values = pd.to_numeric(df[col], errors='coerce').fillna(0).to_numpy()
+    valid = (_months_of(df) > 0) & df['cd_acctit'].notna().to_numpy()
+    return int(np.count_nonzero(values[valid] % 1 != 0))
+
+
+def _candidate_keys(df: pd.DataFrame, voucher: np.ndarray):
+    """
+    카드 매칭 후보의 (일자 키, 전표) 배열 - build_journal_candidates와 같은 후보 집합
+    (차변 라인 + 차변 라인이 2개 이상인 전표의 차변 합계)
+    """
+    if df.empty or 'mn_bungae1' not in df.columns:
+        return np.array([], dtype='int64'), np.array([], dtype='uint64')
+    amount = df['mn_bungae1'].astype('int64').to_numpy()
+    debit = amount != 0
+    day = _to_days(df['da_date'])[debit]
+    amount, debit_voucher = amount[debit], voucher[debit]
+    keys, vouchers = [day * AMOUNT_SPAN + amount], [debit_voucher]
+    if 'no_acct' in df.columns and len(debit_voucher):
+        ids, uniq = pd.factorize(debit_voucher)
+        lines = np.bincount(ids)
+        split = lines[ids] > 1
+        if split.any():
+            total = pd.Series(amount[split]).groupby(ids[split]).sum()
+            first_day = pd.Series(day[split]).groupby(ids[split]).first()
+            keys.append(first_day.to_numpy() * AMOUNT_SPAN + total.to_numpy())
+            vouchers.append(uniq[total.index.to_numpy()])
+    keys, vouchers = np.concatenate(keys), np.concatenate(vouchers)
+    valid = keys >= 0
+    return keys[valid], vouchers[valid]
+
+
+def _near(sorted_keys: np.ndarray, query: np.ndarray, date_window: int, amount_tol: int) -> np.ndarray:
+    """정렬된 키 배열에서 (일자 ± date_window, 금액 ± amount_tol) 안에 드는 위치"""
+    if len(sorted_keys) == 0 or len(query) == 0:
+        return np.array([], dtype='int64')
+    found = []
+    for offset in range(-date_window, date_window + 1):
+        shifted = query + offset * AMOUNT_SPAN
+        lo = np.searchsorted(sorted_keys, shifted - amount_tol, side='left')
+        hi = np.searchsorted(sorted_keys, shifted + amount_tol, side='right')
+        counts = hi - lo
+        if counts.sum():
+            found.append(np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+    return np.unique(np.concatenate(found)) if found else np.array([], dtype='int64')
+
+
+@dataclass(frozen=True)
+class IncrementalSnapshot:
+    """
+    update() 한 번이 끝난 시점의 결과 (이후 update가 바꾸지 않는 값)
+
+    Attributes:
+        journal: 이 시점의 분개장
+        card: 이 시점의 카드 내역 (없으면 None)
+        cube: 계정 × 월 큐브 (build_monthly_cube(journal)과 같음)
+        matched: 카드 행별 매칭 여부 (읽기 전용, incremental=False면 빈 배열)
+        details: 매칭된 카드의 근거 (index: 카드 위치, 컬럼: MATCH_DETAIL_COLUMNS)
+        stats: 이번 update의 변경 통계
+        history_map: 거래처별 최빈 계정과목 (track_history=True일 때)
+        date_window: 카드 매칭 허용 일수 (None이면 정확 일치)
+        amount_tol: 카드 매칭 허용 금액 오차
+        incremental: matched가 유효한지 여부
+    """
+    journal: pd.DataFrame
+    card: Optional[pd.DataFrame]
+    cube: MonthlyCube
+    matched: np.ndarray
+    stats: IncrementalUpdate
+    history_map: Dict[str, str] = field(default_factory=dict)
+    details: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=MATCH_DETAIL_COLUMNS))
+    date_window: Optional[int] = 2
+    amount_tol: float = 0
+    incremental: bool = False
+
+    def gap(self, history_map: Dict[str, str], merchants: Optional[MerchantDictionary] = None) -> GapResult:
+        """이 시점의 매칭 상태로 카드 누락 결과를 만듭니다. (analyze_card_gap과 같음)"""
+        if self.journal.empty or self.card is None:
+            return GapResult()
+        if not self.incremental or self.date_window is None:
+            return analyze_card_gap(self.journal, self.card, history_map, self.date_window, self.amount_tol, merchants)
+        details = self.details.set_axis(self.card.index[self.details.index.to_numpy(dtype='int64')])
+        return gap_from_matched(self.card, self.matched, history_map, merchants, details)
+
+
+class IncrementalAnalysis:
+    """
+    분개장(+카드 내역) 한 쌍의 증분 분석 상태입니다.
+    update()에 새 전체 데이터를 넘기면 직전 상태와 비교해 바뀐 전표만 반영하고,
+    잠금 안에서 만든 IncrementalSnapshot을 돌려줍니다. 결과는 상태 속성 대신 스냅샷에서 읽습니다.
+
+    Attributes:
+        cube: 계정 × 월 큐브 (build_monthly_cube와 같음)
+        history_map: 거래처별 최빈 계정과목 (track_history=True일 때, build_history_map과 같음)
+        last_update: 마지막 update의 변경 통계
+    """
+
+    def __init__(self, date_window: Optional[int] = 2, amount_tol: float = 0, track_history: bool = False):
+        self.date_window = date_window
+        self.amount_tol = amount_tol
+        self.track_history = track_history
+        self.journal = pd.DataFrame()
+        self.card: Optional[pd.DataFrame] = None
+        self.cube = build_monthly_cube(self.journal)
+        self.history_map: Dict[str, str] = {}
+        self.last_update: Optional[IncrementalUpdate] = None
+        self._snapshot: Optional[IncrementalSnapshot] = None
+        self._lock = threading.Lock()
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        self._incremental = False
+        self._voucher = np.array([], dtype='uint64')
+        self._line_hash = np.array([], dtype='uint64')
+        self._card_hash = np.array([], dtype='uint64')
+        self._signatures = _voucher_signatures(self._voucher, self._voucher)
+        self._line_count: Dict[str, int] = {}
+        self._dates: Counter = Counter()
+        self._fraction = {'mn_bungae1': 0, 'mn_bungae2': 0}
+        self._debit = self._credit = np.zeros((0, MONTHS))
+        self._tops: Dict[str, str] = {}
+        self._by_strip: Dict[str, Set[str]] = {}
+        self._cand_key = np.array([], dtype='int64')
+        self._cand_voucher = np.array([], dtype='uint64')
+        self._card_ids = pd.Index(np.array([], dtype='uint64'))
+        self._card_keys = np.array([], dtype='int64')
+        self._matched = np.array([], dtype=bool)
+        self._details = pd.DataFrame(columns=MATCH_DETAIL_COLUMNS)
+
+    # --- 공개 API ---
+
+    def update(self, df_journal: pd.DataFrame, card_data=None, rescan: bool = False) -> IncrementalSnapshot:
+        """
+        새 전체 분개장/카드 내역으로 상태를 갱신합니다.
+
+        Args:
+            df_journal: 전처리된 분개장 DataFrame (직전과 같은 원본의 새 버전)
+            card_data: 카드 내역 (DataFrame / 리스트 / {'data': [...]}, 없으면 None)
+            rescan: True면 기준점과 무관하게 모든 행을 다시 해시 (과거 행의 제자리 수정까지 감지)
+
+        Returns:
+            IncrementalSnapshot (큐브·매칭 결과와 변경 통계 stats - 추가·삭제 전표/카드 수, 다시 매칭한 카드 수,
+            전체 재계산 여부)
+        """
+        with self._lock:
+            df_card = card_frame(card_data)
+            if not rescan and df_journal is self.journal and df_card is self.card and self._snapshot is not None:
+                return self._snapshot
+            # 보관 중인 분개장 자체를 제자리 수정했다면 이전 값이 남아 있지 않으므로 전체 재계산
+            in_place = rescan and df_journal is self.journal
+            if in_place or not self._incremental or not REQUIRED_COLUMNS <= set(df_journal.columns):
+                self.last_update = self._rebuild(df_journal, df_card)
+            else:
+                self.last_update = self._apply(df_journal, df_card, rescan)
+            self.journal, self.card = df_journal, df_card
+            self._snapshot = self._take_snapshot()
+            return self._snapshot
+
+    def snapshot(self) -> Optional[IncrementalSnapshot]:
+        """마지막 update의 스냅샷 (아직 update 전이면 None)"""
+        with self._lock:
+            return self._snapshot
+
+    def gap(self, history_map: Dict[str, str], merchants: Optional[MerchantDictionary] = None) -> GapResult:
+        """마지막 update 시점의 카드 누락 결과 (analyze_card_gap과 같음, update 전이면 빈 결과)"""
+        snapshot = self.snapshot()
+        return GapResult() if snapshot is None else snapshot.gap(history_map, merchants)
+
+    def _take_snapshot(self) -> IncrementalSnapshot:
+        """잠금 안에서 호출 - 이후 update가 제자리에서 바꾸는 값(history_map)은 복사, 배열은 읽기 전용"""
+        matched = self._matched
+        matched.flags.writeable = False
+        return IncrementalSnapshot(
+            journal=self.journal, card=self.card, cube=self.cube, matched=matched, stats=self.last_update,
+            history_map=dict(self.history_map), details=self._details, date_window=self.date_window,
+            amount_tol=self.amount_tol,
+            incremental=self._incremental,
+        )
+
+    # --- 전체 재계산 ---
+
+    def _rebuild(self, df: pd.DataFrame, df_card: Optional[pd.DataFrame]) -> IncrementalUpdate:
+        self._reset_state()
+        self.cube = build_monthly_cube(df)
+        if self.track_history:
+            self._reset_tops(merchant_top_accounts(df))
+        if df.empty or not REQUIRED_COLUMNS <= set(df.columns):
+            return IncrementalUpdate(full=True)
+
+        line_hash = self._line_hash = _row_hashes(df)
+        self._voucher = _voucher_hashes(df, line_hash)
+        self._signatures = _voucher_signatures(self._voucher, line_hash)
+        hashed = len(df)
+        codes = _code_strings(df['cd_acctit'])
+        self._line_count = Counter(codes[codes != None].tolist())  # noqa: E711
+        self._dates = Counter(df['da_date'].tolist())
+        self._fraction = {col: _fractional(df, col) for col in self._fraction}
+        self._debit, self._credit = self.cube.debit.astype('float64'), self.cube.credit.astype('float64')
+        self._cand_key, self._cand_voucher = self._sorted_candidates(*_candidate_keys(df, self._voucher))
+        if df_card is not None and self.date_window is not None:
+            self._card_hash = _row_hashes(df_card)
+            self._card_ids, self._card_keys = self._card_identity(self._card_hash), self._card_key_array(df_card)
+            self._details = self._match(df, df_card, None)
+            self._matched = self._matched_mask(len(df_card), self._details)
+            hashed += len(df_card)
+        self._incremental = True
+        return IncrementalUpdate(added_vouchers=len(self._signatures), added_cards=len(self._card_ids), full=True,
+                                 hashed_rows=hashed)
+
+    # --- 증분 반영 ---
+
+    def _apply(self, df: pd.DataFrame, df_card: Optional[pd.DataFrame], rescan: bool = False) -> IncrementalUpdate:
+        old_voucher = self._voucher
+        line_hash, reused = _appended_hashes(df, None if rescan else self.journal, self._line_hash)
+        voucher = _voucher_hashes(df, line_hash, old_voucher, reused)
+        signatures = _voucher_signatures(voucher, line_hash)
+
+        # 서명이 달라진 전표: 새 버전은 추가, 이전 버전은 삭제 (변경 전표는 양쪽 모두)
+        added_ids = signatures.index[~signatures.isin(self._signatures.to_numpy())]
+        removed_ids = self._signatures.index[~self._signatures.isin(signatures.to_numpy())]
+        dirty_new = np.isin(voucher, added_ids)
+        dirty_old = np.isin(old_voucher, removed_ids)
+        added, removed = df[dirty_new], self.journal[dirty_old]
+
+        self._update_cube(df, added, removed)
+        if self.track_history:
+            self._update_history(df, added, removed)
+
+        # 카드 매칭 후보 갱신 (바뀐 전표의 후보를 빼고 새 버전 후보를 더함)
+        keep = ~np.isin(self._cand_voucher, np.union1d(added_ids, removed_ids))
+        add_key, add_voucher = _candidate_keys(added, voucher[dirty_new])
+        removed_key, _ = _candidate_keys(removed, old_voucher[dirty_old])
+        self._cand_key, self._cand_voucher = self._sorted_candidates(
+            np.concatenate([self._cand_key[keep], add_key]), np.concatenate([self._cand_voucher[keep], add_voucher]))
+
+        stats = IncrementalUpdate(added_vouchers=len(added_ids), removed_vouchers=len(removed_ids),
+                                  hashed_rows=len(df) - reused)
+        if df_card is not None and self.date_window is not None:
+            self._update_matches(df, voucher, df_card, added_ids, removed_key, stats, rescan)
+        else:
+            self._card_ids, self._card_keys = pd.Index(np.array([], dtype='uint64')), np.array([], dtype='int64')
+            self._card_hash = np.array([], dtype='uint64')
+            self._matched = np.array([], dtype=bool)
+            self._details = pd.DataFrame(columns=MATCH_DETAIL_COLUMNS)
+
+        self._voucher, self._signatures, self._line_hash = voucher, signatures, line_hash
+        return stats
+
+    def _update_cube(self, df: pd.DataFrame, added: pd.DataFrame, removed: pd.DataFrame) -> None:
+        plus, minus = build_monthly_cube(added), build_monthly_cube(removed)
+        base = self.cube
+        accounts = np.union1d(base.accounts, plus.accounts) if len(plus.accounts) else base.accounts
+        debit = np.zeros((len(accounts), MONTHS))
+        credit = np.zeros((len(accounts), MONTHS))
+        count = np.zeros((len(accounts), MONTHS), dtype='int64')
+        for cube, sign, d_base, c_base in ((base, 1, self._debit, self._credit), (plus, 1, None, None),
+                                           (minus, -1, None, None)):
+            if cube.empty:
+                continue
+            pos = np.searchsorted(accounts, cube.accounts)
+            debit[pos] += sign * (cube.debit if d_base is None else d_base)
+            credit[pos] += sign * (cube.credit if c_base is None else c_base)
+            count[pos] += sign * cube.count
+
+        for frame, sign in ((added, 1), (removed, -1)):
+            codes = _code_strings(frame['cd_acctit'])
+            for code, n in Counter(codes[codes != None].tolist()).items():  # noqa: E711
+                self._line_count[code] = self._line_count.get(code, 0) + sign * n
+            for date, n in Counter(frame['da_date'].tolist()).items():
+                self._dates[date] += sign * n
+            for col in self._fraction:
+                self._fraction[col] += sign * _fractional(frame, col)
+        self._line_count = {code: n for code, n in self._line_count.items() if n > 0}
+        self._dates = Counter({date: n for date, n in self._dates.items() if n > 0})
+
+        alive = np.array([self._line_count.get(code, 0) > 0 for code in accounts], dtype=bool)
+        accounts, debit, credit, count = accounts[alive], debit[alive], credit[alive], count[alive]
+        self._debit, self._credit = debit, credit
+
+        # 계정명(첫 등장 이름)은 라인이 바뀐 계정만 새 분개장에서 다시 찾음
+        names = pd.Series(base.names, index=base.accounts).reindex(accounts).fillna('').to_numpy(dtype=object)
+        changed = np.union1d(plus.accounts, minus.accounts)
+        names[np.isin(accounts, changed)] = ''
+        if len(changed) and 'nm_acctit' in df.columns:
+            rows = np.flatnonzero(_code_mask(df['cd_acctit'], changed))
+            codes = _code_strings(df['cd_acctit'].iloc[rows])
+            first = pd.Series(df['nm_acctit'].iloc[rows].astype(object).to_numpy()).groupby(codes).first()
+            pos = np.searchsorted(accounts, first.index.to_numpy(dtype=object))
+            inside = pos < len(accounts)
+            names[pos[inside]] = first.to_numpy()[inside]
+
+        months_passed, last_date = months_passed_from_dates(pd.Series(list(self._dates)))
+        self.cube = MonthlyCube(
+            accounts=accounts,
+            names=names,
+            debit=debit.round().astype('int64') if self._fraction['mn_bungae1'] == 0 else debit,
+            credit=credit.round().astype('int64') if self._fraction['mn_bungae2'] == 0 else credit,
+            count=count,
+            months_passed=months_passed,
+            last_date=last_date,
+        )
+
+    def _reset_tops(self, tops: Dict[str, str]) -> None:
+        self._tops = dict(tops)
+        self._by_strip = {}
+        for merchant in tops:
+            self._by_strip.setdefault(merchant.strip(), set()).add(merchant)
+        self.history_map = history_from_tops(tops)
+
+    def _set_tops(self, tops: Dict[str, str], merchants: Set[str]) -> None:
+        """바뀐 거래처의 최빈 계정을 반영하고, 공백 정리 이름이 같은 거래처 묶음만 history_map에 다시 씀"""
+        for merchant in merchants:
+            key = merchant.strip()
+            group = self._by_strip.setdefault(key, set())
+            if merchant in tops:
+                self._tops[merchant] = tops[merchant]
+                group.add(merchant)
+            else:
+                self._tops.pop(merchant, None)
+                group.discard(merchant)
+            if group:
+                self.history_map[key] = self._tops[max(group)]
+            else:
+                self._by_strip.pop(key, None)
+                self.history_map.pop(key, None)
+
+    def _update_history(self, df: pd.DataFrame, added: pd.DataFrame, removed: pd.DataFrame) -> None:
+        if 'nm_trade' not in df.columns:
+            return
+        merchants = set(pd.concat([added['nm_trade'].astype(object), removed['nm_trade'].astype(object)]).dropna())
+        merchants = {m for m in merchants if isinstance(m, str) and m.strip() != ""}
+        if merchants:
+            self._set_tops(merchant_top_accounts(df[df['nm_trade'].isin(list(merchants))]), merchants)
+
+    # --- 카드 매칭 ---
+
+    @staticmethod
+    def _sorted_candidates(keys: np.ndarray, vouchers: np.ndarray):
+        order = np.argsort(keys, kind='stable')
+        return keys[order], vouchers[order]
+
+    @staticmethod
+    def _card_identity(row_hash: np.ndarray) -> pd.Index:
+        """카드 행 식별 해시 (행 내용 해시 + 같은 내용 중 순번, sq_sbook이 있으면 행마다 고유)"""
+        return pd.Index(_combine(row_hash, _occurrence(row_hash)))
+
+    @staticmethod
+    def _card_key_array(df_card: pd.DataFrame) -> np.ndarray:
+        """카드별 (일자, 금액) 키 (확정 상태가 아니거나 일자가 없으면 -1)"""
+        day = _to_days(df_card['da_sbook']) if 'da_sbook' in df_card.columns else np.full(len(df_card), -1)
+        amount = pd.to_numeric(df_card['mn_total'], errors='coerce').fillna(0).to_numpy(dtype='int64') \
+            if 'mn_total' in df_card.columns else np.zeros(len(df_card), dtype='int64')
+        return np.where((day >= 0) & (card_status(df_card) == 2), day * AMOUNT_SPAN + amount, -1)
+
+    def _match(self, df: pd.DataFrame, df_card: pd.DataFrame, cards: Optional[np.ndarray]) -> pd.DataFrame:
+        """카드 위치(cards, None이면 전체)를 분개장과 매칭한 근거 (index: 매칭된 카드의 위치)"""
+        positions = np.arange(len(df_card)) if cards is None else cards
+        subset = df_card.iloc[positions].set_axis(positions)
+        confirmed = subset[card_status(subset) == 2]
+        matches = match_card_to_journal(df, confirmed, date_window=self.date_window, amount_tol=self.amount_tol)
+        return match_details(matches)
+
+    @staticmethod
+    def _matched_mask(n_cards: int, details: pd.DataFrame) -> np.ndarray:
+        matched = np.zeros(n_cards, dtype=bool)
+        matched[details.index.to_numpy(dtype='int64')] = True
+        return matched
+
+    def _update_matches(self, df, voucher, df_card, added_ids, removed_key, stats: IncrementalUpdate,
+                        rescan: bool = False) -> None:
+        card_hash, reused = _appended_hashes(df_card, None if rescan else self.card, self._card_hash)
+        stats.hashed_rows += len(df_card) - reused
+        card_ids = self._card_identity(card_hash)
+        new_card = ~card_ids.isin(self._card_ids)
+        gone = ~self._card_ids.isin(card_ids)
+        carried = np.flatnonzero(~new_card)
+        old_pos = self._card_ids.get_indexer(card_ids[carried])
+
+        # 그대로인 카드는 이전 키를 재사용하고 새/변경 카드만 일자를 변환
+        card_keys = np.full(len(df_card), -1, dtype='int64')
+        card_keys[carried] = self._card_keys[old_pos]
+        fresh = np.flatnonzero(new_card)
+        if len(fresh):
+            card_keys[fresh] = self._card_key_array(df_card.iloc[fresh])
+        valid_cards = np.flatnonzero(card_keys >= 0)
+        card_order = valid_cards[np.argsort(card_keys[valid_cards], kind='stable')]
+        sorted_card_keys = card_keys[card_order]
+        window, tol = self.date_window, int(self.amount_tol)
+
+        # 시작점: 새/변경 카드와 추가 전표, 삭제된 카드에 닿던 전표, 삭제된 전표에 닿던 카드
+        region_cards = set(np.flatnonzero(new_card & (card_keys >= 0)).tolist())
+        region_vouchers = set(added_ids.tolist())
+        gone_keys = self._card_keys[gone]
+        region_vouchers.update(self._cand_voucher[_near(self._cand_key, gone_keys[gone_keys >= 0], window, tol)].tolist())
+        region_cards.update(card_order[_near(sorted_card_keys, removed_key, window, tol)].tolist())
+
+        # 닿는 카드·전표를 끝까지 확장 (서로 닿지 않는 묶음은 독립적으로 매칭됨)
+        frontier_cards, frontier_vouchers = set(region_cards), set(region_vouchers)
+        reached = set()  # 카드에 닿는 전표 (닿지 않는 전표는 매칭 결과에 영향 없음)
+        while frontier_cards or frontier_vouchers:
+            next_cards, next_vouchers = set(), set()
+            if frontier_vouchers:
+                keys = self._cand_key[np.isin(self._cand_voucher, list(frontier_vouchers))]
+                next_cards = set(card_order[_near(sorted_card_keys, keys, window, tol)].tolist()) - region_cards
+            if frontier_cards:
+                keys = card_keys[list(frontier_cards)]
+                next_vouchers = set(self._cand_voucher[_near(self._cand_key, keys, window, tol)].tolist())
+                reached |= next_vouchers
+                next_vouchers -= region_vouchers
+            region_cards |= next_cards
+            region_vouchers |= next_vouchers
+            frontier_cards, frontier_vouchers = next_cards, next_vouchers
+
+        # 묶음 밖 카드는 이전 매칭 결과 유지 (이전 위치 → 새 위치), 묶음 안은 다시 매칭
+        cards = np.array(sorted(region_cards), dtype='int64')
+        new_pos = pd.Series(carried, index=old_pos)
+        kept = self._details[self._details.index.isin(old_pos)]
+        kept = kept.set_axis(new_pos.reindex(kept.index).to_numpy())
+        parts = [kept[~kept.index.isin(cards)]]
+        if len(cards):
+            rows = df[np.isin(voucher, np.fromiter(reached, dtype='uint64', count=len(reached)))]
+            parts.append(self._match(rows, df_card, cards))
+        details = pd.concat(parts).sort_index() if len(parts) > 1 else parts[0]
+
+        self._card_ids, self._card_keys, self._card_hash = card_ids, card_keys, card_hash
+        self._details, self._matched = details, self._matched_mask(len(df_card), details)
+        stats.added_cards = int(new_card.sum())
+        stats.removed_cards = int(gone.sum())
+        stats.rematched_cards = len(region_cards)
@@ -0,0 +1,167 @@
+"""
+분석 결과 데이터 클래스
+UI(Streamlit)나 배치 CLI가 그대로 표시/직렬화할 수 있는 순수 값 객체입니다.
+"""
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class GapResult:
+    """카드 누락 분석 결과 (matches: 허용 범위 매칭으로 짝지은 카드와 근거 - 정확 일치 모드면 빈 표)"""
+    total_gap: float = 0
+    missing: pd.DataFrame = field(default_factory=pd.DataFrame)
+    matches: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def count(self) -> int:
+        return len(self.missing)
+
+    @property
+    def split_count(self) -> int:
+        """부가세 분할 전표(차변 합계)와 매칭된 카드 수"""
+        return int(self.matches['부가세 분할'].sum()) if not self.matches.empty else 0
+
+
+@dataclass
+class IncrementalUpdate:
+    """증분 재분석 1회의 변경 통계"""
+    added_vouchers: int = 0     # 새로 생기거나 바뀐 전표 (새 버전)
+    removed_vouchers: int = 0   # 삭제되거나 바뀐 전표 (이전 버전)
+    added_cards: int = 0
+    removed_cards: int = 0
+    rematched_cards: int = 0    # 다시 매칭한 카드 (변경 지점에 닿는 묶음)
+    full: bool = False          # 전체 재계산 여부
+    hashed_rows: int = 0        # 내용 해시를 새로 계산한 분개장·카드 행 (기준점 뒤에 붙은 행)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class ForecastResult:
+    """연간 손익 추정 (Landing Forecast) 결과"""
+    final_rev_baseline: float
+    method_used: str
+    exp_booked: float
+    exp_missing: float
+    exp_future: float
+    final_exp_projected: float
+    final_profit: float
+    proj_expense_simple: float  # 단순 연환산 (누락 미반영)
+    months_passed: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class ScenarioResult:
+    """세금 시나리오별 매출/비용 가정"""
+    scenario: str
+    desc: str
+    final_rev: float
+    final_exp: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class TaxResult:
+    """종합소득세 시뮬레이션 결과"""
+    scenario: ScenarioResult
+    other_income: float
+    deduction: float
+    disallowed: float
+    tax_base: float
+    income_tax: float
+    total_tax: float  # 지방세 포함
+    bracket_drop: Optional["BracketDrop"] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class BracketDrop:
+    """'X원 더 지출하면 한 구간 아래 세율' 지점"""
+    tax_base: float
+    current_rate: float
+    lower_rate: float        # 구간 하락 후 한계세율 (최저 구간이면 current_rate와 같음)
+    spend_needed: float      # 구간 하한까지 줄여야 할 과세표준 (추가 경비)
+    tax_saved: float         # 그만큼 지출했을 때 줄어드는 세액 (지방세 포함)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class TaxCurve:
+    """연말 추가 지출액별 예상 세액 곡선"""
+    extra_spend: np.ndarray
+    tax_base: np.ndarray
+    total_tax: np.ndarray
+    marginal_rate: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            '추가 지출': self.extra_spend,
+            '과세표준': self.tax_base,
+            '예상 세액': self.total_tax,
+            '한계세율': self.marginal_rate,
+        })
+
+
+@dataclass
+class TaxSweep:
+    """시나리오 조합별 세금 (모든 배열은 조합 수 길이)"""
+    revenue_haircut: np.ndarray
+    gap_ratio: np.ndarray
+    extra_spend: np.ndarray
+    extra_deduction: np.ndarray
+    tax_base: np.ndarray
+    total_tax: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.tax_base)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            '매출 감소율': self.revenue_haircut,
+            '누락 반영률': self.gap_ratio,
+            '추가 지출': self.extra_spend,
+            '추가 공제': self.extra_deduction,
+            '과세표준': self.tax_base,
+            '예상 세액': self.total_tax,
+        })
+
+
+@dataclass
+class MonteCarloResult:
+    """부트스트랩 연간 추정 분포 (모든 배열은 경로 수 길이)"""
+    revenue: np.ndarray
+    expense: np.ndarray
+    tax_base: np.ndarray
+    income_tax: np.ndarray
+    total_tax: np.ndarray  # 지방세 포함
+    months_passed: int
+    pool_months: int       # 리샘플링에 쓴 실적 월 수 (전년 + 당해)
+
+    def __len__(self) -> int:
+        return len(self.revenue)
+
+    def percentiles(self, q=(10, 50, 90)) -> pd.DataFrame:
+        """지표별 백분위 표 (행: 매출/비용/과세표준/소득세/예상 세액, 열: P10/P50/P90)"""
+        metrics = {
+            '매출': self.revenue,
+            '비용': self.expense,
+            '과세표준': self.tax_base,
+            '소득세': self.income_tax,
+            '예상 세액': self.total_tax,
+        }
+        values = np.percentile(np.vstack(list(metrics.values())), q, axis=1).T
+        return pd.DataFrame(values, index=list(metrics), columns=[f"P{p}" for p in q])
@@ -0,0 +1,45 @@
+"""
+세금 시나리오 모듈
+연간 추정치에 카드 누락분/전략 지출 가정을 적용한 매출·비용을 만듭니다.
+"""
+from .results import ForecastResult, ScenarioResult
+
+SCENARIOS = ["S1(극단적 보수)", "S2(보수적)", "S3(합리적 보수)", "S4(전략적)"]
+DEFAULT_SCENARIO = "S3(합리적 보수)"
+STRATEGIC_SPEND = 4000000  # S4 연말 전략적 지출
+
+
+def apply_scenario(forecast: ForecastResult, card_gap_amt: float, scenario: str = DEFAULT_SCENARIO) -> ScenarioResult:
+    """
+    시나리오 가정을 적용합니다.
+
+    Args:
+        forecast: 연간 손익 추정 결과
+        card_gap_amt: 카드 누락 금액 (누적)
+        scenario: SCENARIOS 중 하나 (그 외 값은 S4로 처리)
+
+    Returns:
+        ScenarioResult
+    """
+    final_rev_baseline = forecast.final_rev_baseline
+    proj_expense_simple = forecast.proj_expense_simple
+    annual_card_gap = card_gap_amt / forecast.months_passed * 12
+
+    if scenario == "S1(극단적 보수)":
+        final_rev = final_rev_baseline
+        final_exp = proj_expense_simple
+        desc = "현재 장부상 비용만 인정 (누락분 0원)"
+    elif scenario == "S2(보수적)":
+        final_rev = final_rev_baseline
+        final_exp = proj_expense_simple + (card_gap_amt * 0.5)
+        desc = "카드 누락분의 50%만 반영"
+    elif scenario == "S3(합리적 보수)":
+        final_rev = final_rev_baseline
+        final_exp = proj_expense_simple + annual_card_gap
+        desc = "카드 누락분과 미래 비용을 모두 반영한 현실적 수치 ⭐"
+    else:  # S4
+        final_rev = final_rev_baseline * 0.95
+        final_exp = proj_expense_simple + annual_card_gap + STRATEGIC_SPEND
+        desc = "매출 감소 + 연말 전략적 지출(+400만)"
+
+    return ScenarioResult(scenario=scenario, desc=desc, final_rev=final_rev, final_exp=final_exp)
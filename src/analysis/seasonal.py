@@ -0,0 +1,198 @@
+"""
+계절성 반영 손익 추정 모듈
+전년도 분개장의 계정별 월 프로파일로 당해 남은 달을 계정 단위로 예측합니다.
+
+- 매출(4xxxx): 전년 월별 모양 × (당해 마감월 누적 / 전년 동기 누적)  → 계절성
+- 고정비: 전년 12개월 중 대부분 발생하고 변동이 작은 비용 → 마지막 마감월 금액 복사
+- 변동비: 전년 매출 대비 비율 × 예측 매출                      → 비율법
+- 전년 이력이 없는 계정/달: 당해 월평균(run-rate)
+
+모든 계정을 (계정 수 × 12) 배열로 한 번에 계산합니다.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .cube import MONTHS, MonthlyCube
+from .accounts import KIND_EXPENSE, KIND_REVENUE, account_kinds
+
+MODE_SEASONAL = "계절성"
+MODE_FIXED = "고정비"
+MODE_RATIO = "변동비(매출비율)"
+MODE_RUNRATE = "월평균"
+MODES = [MODE_SEASONAL, MODE_FIXED, MODE_RATIO, MODE_RUNRATE]
+
+FIXED_MIN_MONTHS = 10   # 고정비 판정: 전년 발생 개월 수 하한
+FIXED_MAX_CV = 0.2      # 고정비 판정: 전년 월별 변동계수 상한
+
+
+def _aligned(cube: MonthlyCube, accounts: np.ndarray) -> np.ndarray:
+    """큐브의 순액(차변-대변)을 주어진 계정 순서로 재배열합니다. (없는 계정은 0)"""
+    out = np.zeros((len(accounts), MONTHS), dtype='float64')
+    if cube.empty:
+        return out
+    pos = pd.Index(cube.accounts).get_indexer(accounts)
+    found = pos >= 0
+    out[found] = cube.net[pos[found]]
+    return out
+
+
+@dataclass
+class SeasonalForecast:
+    """
+    계정별 월 예측 결과 (행: 계정, 열: 1~12월, 금액은 매출=대변-차변 / 비용=차변-대변 방향)
+
+    Attributes:
+        accounts: 계정코드
+        names: 계정명
+        modes: 계정별 예측 방식 (MODES)
+        actual: 당해 실적 (마감월만, 이후 0)
+        projected: 남은 달 예측 (마감월은 0)
+        months_passed: 마감 개월 수
+    """
+    accounts: np.ndarray
+    names: np.ndarray
+    modes: np.ndarray
+    actual: np.ndarray
+    projected: np.ndarray
+    months_passed: int
+
+    @property
+    def annual(self) -> np.ndarray:
+        """계정별 연간 추정 (실적 + 예측)"""
+        return (self.actual + self.projected).sum(axis=1)
+
+    def revenue_by_month(self) -> np.ndarray:
+        mask = account_kinds(self.accounts) == KIND_REVENUE
+        return (self.actual[mask] + self.projected[mask]).sum(axis=0)
+
+    def expense_by_month(self) -> np.ndarray:
+        mask = account_kinds(self.accounts) == KIND_EXPENSE
+        return (self.actual[mask] + self.projected[mask]).sum(axis=0)
+
+    def totals(self):
+        """(연간 매출, 연간 비용, 영업이익) 추정"""
+        revenue = self.revenue_by_month().sum()
+        expense = self.expense_by_month().sum()
+        return revenue, expense, revenue - expense
+
+    def to_frame(self) -> pd.DataFrame:
+        """계정별 요약 (계정코드, 계정명, 방식, 마감 실적, 남은 기간 예측, 연간 추정)"""
+        return pd.DataFrame({
+            '계정코드': self.accounts,
+            '계정명': self.names,
+            '방식': self.modes,
+            '실적': self.actual.sum(axis=1),
+            '예측': self.projected.sum(axis=1),
+            '연간 추정': self.annual,
+        })
+
+
+def classify_modes(prior: np.ndarray, is_revenue: np.ndarray, has_prior_revenue: bool) -> np.ndarray:
+    """
+    전년 월별 금액으로 계정별 예측 방식을 정합니다.
+
+    Args:
+        prior: 전년 계정 × 월 금액
+        is_revenue: 매출 계정 여부
+        has_prior_revenue: 전년 매출 합계가 양수인지 (비율법 가능 여부)
+
+    Returns:
+        계정별 방식 문자열 배열
+    """
+    active = (prior != 0).sum(axis=1)
+    mean = np.abs(prior).mean(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cv = np.where(mean > 0, prior.std(axis=1) / mean, np.inf)
+    fixed = (active >= FIXED_MIN_MONTHS) & (cv <= FIXED_MAX_CV)
+    no_prior = active == 0
+    return np.select(
+        [is_revenue & ~no_prior, is_revenue, no_prior, fixed, np.full(len(prior), has_prior_revenue)],
+        [MODE_SEASONAL, MODE_RUNRATE, MODE_RUNRATE, MODE_FIXED, MODE_RATIO],
+        default=MODE_SEASONAL
+    )
+
+
+def forecast_seasonal(
+    cube_current: MonthlyCube,
+    cube_prior: MonthlyCube,
+    months_passed: Optional[int] = None,
+    mode_overrides: Optional[Dict[str, str]] = None
+) -> SeasonalForecast:
+    """
+    전년도 계정별 월 프로파일로 당해 남은 달을 예측합니다.
+
+    Args:
+        cube_current: 당해 분개장 큐브
+        cube_prior: 전년도 분개장 큐브 (비어 있으면 모든 계정이 월평균 방식)
+        months_passed: 마감 개월 수 (기본: cube_current.months_passed)
+        mode_overrides: 계정코드별 예측 방식 지정 {계정코드: MODES 중 하나}
+
+    Returns:
+        SeasonalForecast
+    """
+    months_passed = cube_current.months_passed if months_passed is None else months_passed
+    accounts = np.union1d(cube_current.accounts.astype(str), cube_prior.accounts.astype(str))
+    kinds = account_kinds(accounts)
+    accounts = accounts[np.isin(kinds, (KIND_REVENUE, KIND_EXPENSE))]
+
+    is_revenue = kinds[np.isin(kinds, (KIND_REVENUE, KIND_EXPENSE))] == KIND_REVENUE
+    sign = np.where(is_revenue, -1.0, 1.0)[:, None]  # 매출은 대변-차변
+    actual_all = _aligned(cube_current, accounts) * sign
+    prior = _aligned(cube_prior, accounts) * sign
+
+    closed = np.arange(MONTHS) < months_passed
+    actual = np.where(closed, actual_all, 0.0)
+    ytd_actual = actual.sum(axis=1)
+    ytd_prior = np.where(closed, prior, 0.0).sum(axis=1)
+    run_rate = ytd_actual / max(months_passed, 1)
+
+    # 계절성: 전년 월 모양을 당해/전년 동기 누적 비율로 스케일
+    # (전년 분개장에 전표가 전혀 없는 달은 프로파일이 없으므로 월평균 사용)
+    prior_covered = cube_prior.count.sum(axis=0) > 0 if not cube_prior.empty else np.zeros(MONTHS, dtype=bool)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        growth = np.where(ytd_prior != 0, ytd_actual / ytd_prior, np.nan)
+    seasonal = np.where(
+        np.isnan(growth)[:, None] | ~prior_covered[None, :],
+        run_rate[:, None],
+        prior * np.nan_to_num(growth)[:, None]
+    )
+
+    # 고정비: 마지막 마감월 금액 복사
+    last_closed = actual_all[:, months_passed - 1] if months_passed > 0 else np.zeros(len(accounts))
+    fixed = np.broadcast_to(last_closed[:, None], prior.shape)
+
+    # 변동비: 전년 매출 대비 비율 × 예측 매출 (매출은 계절성 방식으로 먼저 계산)
+    prior_revenue = prior[is_revenue].sum()
+    revenue_path = seasonal[is_revenue].sum(axis=0)
+    share = prior.sum(axis=1) / prior_revenue if prior_revenue > 0 else np.zeros(len(accounts))
+    ratio = share[:, None] * revenue_path[None, :]
+
+    names = np.array([''] * len(accounts), dtype=object)
+    for cube in (cube_prior, cube_current):  # 당해 계정명 우선
+        if not cube.empty:
+            pos = pd.Index(cube.accounts).get_indexer(accounts)
+            names[pos >= 0] = cube.names[pos[pos >= 0]]
+
+    modes = classify_modes(prior, is_revenue, prior_revenue > 0)
+    if mode_overrides:
+        override = pd.Series(accounts).map(mode_overrides)
+        modes = np.where(override.notna(), override.to_numpy(dtype=object), modes)
+
+    projection = np.select(
+        [(modes == MODE_SEASONAL)[:, None], (modes == MODE_FIXED)[:, None], (modes == MODE_RATIO)[:, None]],
+        [seasonal, fixed, ratio],
+        default=np.broadcast_to(run_rate[:, None], prior.shape)
+    )
+    projected = np.where(closed, 0.0, projection)
+
+    return SeasonalForecast(
+        accounts=accounts.astype(object),
+        names=names,
+        modes=np.asarray(modes, dtype=object),
+        actual=actual,
+        projected=projected,
+        months_passed=months_passed,
+    )
@@ -0,0 +1,213 @@
+"""
+종합소득세 계산 모듈
+과세표준 구간표를 np.searchsorted로 적용해 스칼라/배열을 같은 코드로 계산하고,
+시나리오 조합 스윕·세액 곡선·구간 하락 지점을 제공합니다.
+"""
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from .results import BracketDrop, ForecastResult, TaxCurve, TaxResult, TaxSweep
+from .scenario import DEFAULT_SCENARIO, SCENARIOS, apply_scenario
+
+LOCAL_TAX_RATE = 0.1  # 지방소득세 (소득세의 10%)
+# 필요경비 부인액 기본값 (전년도 세무조정 기준 - 신고서 rec_prd에는 없는 수기 조정 항목)
+DEFAULT_DISALLOWED = 2535610
+
+# 종합소득세 과세표준 구간 (상한, 세율, 누진공제)
+TAX_BRACKETS = [
+    (14000000, 0.06, 0),
+    (50000000, 0.15, 1260000),
+    (88000000, 0.24, 5760000),
+    (150000000, 0.35, 15440000),
+    (300000000, 0.38, 19940000),
+    (500000000, 0.40, 25940000),
+    (1000000000, 0.42, 35940000),
+    (np.inf, 0.45, 65940000),
+]
+BRACKET_UPPER = np.array([b[0] for b in TAX_BRACKETS], dtype='float64')
+BRACKET_LOWER = np.concatenate([[0.0], BRACKET_UPPER[:-1]])
+BRACKET_RATE = np.array([b[1] for b in TAX_BRACKETS])
+BRACKET_DEDUCTION = np.array([b[2] for b in TAX_BRACKETS], dtype='float64')
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def bracket_index(base: ArrayLike) -> np.ndarray:
+    """과세표준이 속한 구간 번호 (상한 포함, 0 이하는 0번 구간)"""
+    return np.searchsorted(BRACKET_UPPER, np.asarray(base, dtype='float64'), side='left')
+
+
+def income_tax(base: ArrayLike) -> np.ndarray:
+    """
+    과세표준 배열에 누진세율(누진공제 방식)을 적용한 소득세 배열을 반환합니다.
+
+    Args:
+        base: 과세표준 (스칼라 또는 배열)
+
+    Returns:
+        소득세 배열 (지방세 제외, 0 이하 과세표준은 0)
+    """
+    base = np.asarray(base, dtype='float64')
+    idx = bracket_index(base)
+    return np.where(base > 0, base * BRACKET_RATE[idx] - BRACKET_DEDUCTION[idx], 0.0)
+
+
+def calculate_tax(base: float) -> float:
+    """과세표준에 누진세율(누진공제 방식)을 적용한 소득세를 반환합니다."""
+    return float(income_tax(base))
+
+
+def bracket_drop_point(tax_base: ArrayLike) -> Union[BracketDrop, list]:
+    """
+    한 구간 아래 세율로 내려가기 위해 더 필요한 경비(지출)와 절감 세액을 구합니다.
+
+    Args:
+        tax_base: 현재 과세표준 (스칼라면 BracketDrop, 배열이면 BracketDrop 리스트)
+
+    Returns:
+        BracketDrop (최저 구간이면 spend_needed=0)
+    """
+    base = np.maximum(np.atleast_1d(np.asarray(tax_base, dtype='float64')), 0.0)
+    idx = bracket_index(base)
+    lower_idx = np.maximum(idx - 1, 0)
+    spend = np.where(idx > 0, base - BRACKET_LOWER[idx], 0.0)
+    saved = (income_tax(base) - income_tax(base - spend)) * (1 + LOCAL_TAX_RATE)
+    drops = [
+        BracketDrop(tax_base=b, current_rate=BRACKET_RATE[i], lower_rate=BRACKET_RATE[j], spend_needed=s, tax_saved=t)
+        for b, i, j, s, t in zip(base.tolist(), idx.tolist(), lower_idx.tolist(), spend.tolist(), saved.tolist())
+    ]
+    return drops[0] if np.ndim(tax_base) == 0 else drops
+
+
+def tax_curve(tax_base: float, max_spend: Optional[float] = None, points: int = 201) -> TaxCurve:
+    """
+    연말 추가 지출액(0 ~ max_spend)에 따른 예상 세액 곡선을 만듭니다.
+
+    Args:
+        tax_base: 추가 지출 전 과세표준
+        max_spend: 곡선 최대 지출액 (기본: 현재 구간 하한까지 거리의 2배, 최소 1천만 원)
+        points: 곡선 점 개수
+
+    Returns:
+        TaxCurve
+    """
+    if max_spend is None:
+        drop = bracket_drop_point(tax_base)
+        max_spend = max(drop.spend_needed * 2, 10000000)
+    spend = np.linspace(0, max_spend, points)
+    base = np.maximum(tax_base - spend, 0.0)
+    return TaxCurve(
+        extra_spend=spend,
+        tax_base=base,
+        total_tax=income_tax(base) * (1 + LOCAL_TAX_RATE),
+        marginal_rate=np.where(base > 0, BRACKET_RATE[bracket_index(base)], 0.0),
+    )
+
+
+def sweep_scenarios(
+    forecast: ForecastResult,
+    card_gap_amt: float,
+    other_income: float,
+    deduction: float,
+    disallowed: float,
+    revenue_haircut: ArrayLike = (0.0,),
+    gap_ratio: ArrayLike = (1.0,),
+    extra_spend: ArrayLike = (0.0,),
+    extra_deduction: ArrayLike = (0.0,)
+) -> TaxSweep:
+    """
+    시나리오 변수 조합(격자) 전체의 세액을 한 번에 계산합니다.
+
+    매출 = 추정 매출 × (1 - 매출 감소율)
+    비용 = 단순 연환산 비용 + 연환산 카드 누락분 × 누락 반영률 + 추가 지출
+    (S3 = 감소율 0 / 반영률 1 / 지출 0, S4 = 감소율 0.05 / 반영률 1 / 지출 400만)
+
+    Args:
+        forecast: 연간 손익 추정 결과
+        card_gap_amt: 카드 누락 금액 (누적)
+        other_income: 타소득
+        deduction: 소득공제
+        disallowed: 필요경비 부인액
+        revenue_haircut: 매출 감소율 후보 배열
+        gap_ratio: 카드 누락분 반영률 후보 배열
+        extra_spend: 연말 추가 지출 후보 배열
+        extra_deduction: 추가 소득공제 후보 배열
+
+    Returns:
+        TaxSweep (조합 수 = 각 후보 배열 길이의 곱)
+    """
+    grids = np.meshgrid(
+        np.asarray(revenue_haircut, dtype='float64'),
+        np.asarray(gap_ratio, dtype='float64'),
+        np.asarray(extra_spend, dtype='float64'),
+        np.asarray(extra_deduction, dtype='float64'),
+        indexing='ij'
+    )
+    haircut, ratio, spend, extra_ded = (g.ravel() for g in grids)
+    annual_card_gap = card_gap_amt / forecast.months_passed * 12
+
+    final_rev = forecast.final_rev_baseline * (1 - haircut)
+    final_exp = forecast.proj_expense_simple + annual_card_gap * ratio + spend
+    tax_base = np.maximum(final_rev + other_income - final_exp - (deduction + extra_ded) + disallowed, 0.0)
+    return TaxSweep(
+        revenue_haircut=haircut,
+        gap_ratio=ratio,
+        extra_spend=spend,
+        extra_deduction=extra_ded,
+        tax_base=tax_base,
+        total_tax=income_tax(tax_base) * (1 + LOCAL_TAX_RATE),
+    )
+
+
+def simulate_tax(
+    forecast: ForecastResult,
+    card_gap_amt: float,
+    other_income: float,
+    deduction: float,
+    disallowed: float,
+    scenario: str = DEFAULT_SCENARIO
+) -> TaxResult:
+    """
+    시나리오를 적용해 예상 납부 세액(지방세 포함)을 계산합니다.
+
+    Args:
+        forecast: 연간 손익 추정 결과
+        card_gap_amt: 카드 누락 금액
+        other_income: 타소득
+        deduction: 소득공제
+        disallowed: 필요경비 부인액
+        scenario: 시나리오 이름
+
+    Returns:
+        TaxResult
+    """
+    assumed = apply_scenario(forecast, card_gap_amt, scenario)
+    tax_base = assumed.final_rev + other_income - assumed.final_exp - deduction + disallowed
+    if tax_base < 0:
+        tax_base = 0
+    tax = calculate_tax(tax_base)
+    return TaxResult(
+        scenario=assumed,
+        other_income=other_income,
+        deduction=deduction,
+        disallowed=disallowed,
+        tax_base=tax_base,
+        income_tax=tax,
+        total_tax=tax * (1 + LOCAL_TAX_RATE),
+        bracket_drop=bracket_drop_point(tax_base),
+    )
+
+
+def simulate_all_scenarios(
+    forecast: ForecastResult,
+    card_gap_amt: float,
+    other_income: float,
+    deduction: float,
+    disallowed: float
+) -> Dict[str, TaxResult]:
+    """모든 시나리오의 세금 시뮬레이션 결과를 {시나리오: TaxResult}로 반환합니다."""
+    return {
+        scenario: simulate_tax(forecast, card_gap_amt, other_income, deduction, disallowed, scenario)
+        for scenario in SCENARIOS
+    }
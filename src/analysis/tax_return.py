@@ -0,0 +1,151 @@
+"""
+전년도 종합소득세 신고서(rec_prd.json) 파서
+PAGE_n → GRP_n → 행(mn_1..mn_20 / str_1..str_15) 중첩 구조를 한 번만 펼쳐
+(페이지, 그룹, 코드, 필드) 색인 테이블로 만들고, 세금 시뮬레이터 입력값(타소득·소득공제)을 조회합니다.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+AMOUNT_FIELDS = [f"mn_{i}" for i in range(1, 21)]
+TEXT_FIELDS = [f"str_{i}" for i in range(1, 16)]
+
+# 신고서 항목 위치 (페이지, 그룹, 코드, 필드)
+TOTAL_INCOME = (9, 1, 1, "mn_1")       # 종합소득금액
+INCOME_DEDUCTION = (9, 1, 2, "mn_1")   # 소득공제 합계
+TAX_BASE = (9, 1, 3, "mn_1")           # 과세표준
+CALCULATED_TAX = (9, 1, 5, "mn_1")     # 산출세액
+BUSINESS_GROUP = (1, 4)                # 사업장별 명세 (mn_1 총수입금액, mn_2 필요경비, mn_3 소득금액, str_5 사업자번호)
+
+Key = Tuple[int, int, int, str]
+
+
+def _page_number(key: str) -> int:
+    """'PAGE_12' / 'GRP_3' → 12 / 3"""
+    return int(str(key).rsplit("_", 1)[-1])
+
+
+def _to_amount(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass
+class TaxReturnTable:
+    """
+    신고서 색인 테이블 (값이 있는 셀만 보관)
+
+    Attributes:
+        frame: long 형식 DataFrame (page, grp, code, field, value, text)
+    """
+    frame: pd.DataFrame
+    _lookup: Dict[Key, object] = field(default_factory=dict, repr=False)
+    _codes: Dict[Tuple[int, int], List[int]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        # 조회용 dict는 생성 시 한 번만 만듦 (이후 get은 DataFrame을 거치지 않음)
+        values = self.frame["value"].where(self.frame["field"].str.startswith("mn_"), self.frame["text"])
+        keys = list(zip(self.frame["page"].tolist(), self.frame["grp"].tolist(), self.frame["code"].tolist(),
+                        self.frame["field"].tolist()))
+        self._lookup = dict(zip(keys, values.tolist()))
+        for page, grp, code, _ in keys:
+            codes = self._codes.setdefault((page, grp), [])
+            if not codes or codes[-1] != code:
+                codes.append(code)
+
+    @property
+    def empty(self) -> bool:
+        return self.frame.empty
+
+    def get(self, page: int, grp: int, code: int, name: str, default=0):
+        """셀 하나를 조회합니다. (dict 조회라 마이크로초 단위)"""
+        return self._lookup.get((page, grp, code, name), default)
+
+    def amount(self, key: Key) -> float:
+        """금액 셀 조회 (없으면 0)"""
+        return float(self.get(*key, default=0))
+
+    def codes(self, page: int, grp: int) -> List[int]:
+        """그룹 안에서 값이 있는 행 코드 (오름차순)"""
+        return self._codes.get((page, grp), [])
+
+    def group(self, page: int, grp: int) -> pd.DataFrame:
+        """그룹 하나를 (코드 × 필드) wide 표로 반환합니다."""
+        sub = self.frame[(self.frame["page"] == page) & (self.frame["grp"] == grp)]
+        wide = sub.assign(cell=sub["value"].astype(object).where(sub["field"].str.startswith("mn_"), sub["text"]))
+        return wide.pivot(index="code", columns="field", values="cell")
+
+
+def parse_tax_return(rec_data) -> TaxReturnTable:
+    """
+    신고서 JSON을 (페이지, 그룹, 코드, 필드) long 테이블로 펼칩니다.
+    0 금액과 빈 문자열은 저장하지 않습니다. (조회 시 기본값 반환)
+
+    Args:
+        rec_data: rec_prd.json 내용 {PAGE_n: {GRP_n: [행, ...]}}
+
+    Returns:
+        TaxReturnTable
+    """
+    records = []
+    for page_key, groups in (rec_data or {}).items():
+        if not isinstance(groups, dict):
+            continue
+        for grp_key, rows in groups.items():
+            for row in rows or []:
+                page = int(row.get("page") or _page_number(page_key))
+                grp = int(row.get("grp") or _page_number(grp_key))
+                code = int(row.get("code") or 0)
+                for name in AMOUNT_FIELDS:
+                    value = _to_amount(row.get(name))
+                    if value == value and value != 0:  # NaN 제외
+                        records.append((page, grp, code, name, value, ""))
+                for name in TEXT_FIELDS:
+                    text = row.get(name)
+                    if text not in (None, ""):
+                        records.append((page, grp, code, name, 0.0, str(text)))
+
+    frame = pd.DataFrame(records, columns=["page", "grp", "code", "field", "value", "text"])
+    frame = frame.astype({"page": "int16", "grp": "int16", "code": "int32"})
+    return TaxReturnTable(frame.sort_values(["page", "grp", "code", "field"], ignore_index=True))
+
+
+def business_income(table: TaxReturnTable) -> pd.DataFrame:
+    """사업장별 총수입금액/필요경비/소득금액 (코드 오름차순, 코드 1이 주사업장)"""
+    page, grp = BUSINESS_GROUP
+    codes = table.codes(page, grp)
+    out = pd.DataFrame({
+        "사업자번호": [table.get(page, grp, c, "str_5", "") for c in codes],
+        "상호": [table.get(page, grp, c, "str_4", "") for c in codes],
+        "총수입금액": [table.get(page, grp, c, "mn_1") for c in codes],
+        "필요경비": [table.get(page, grp, c, "mn_2") for c in codes],
+        "소득금액": [table.get(page, grp, c, "mn_3") for c in codes],
+    }, index=pd.Index(codes, name="code", dtype="int64"))
+    return out[(out[["총수입금액", "필요경비", "소득금액"]] != 0).any(axis=1)]
+
+
+def tax_inputs_from_return(table: TaxReturnTable, main_business: Optional[str] = None) -> Tuple[float, float]:
+    """
+    신고서에서 세금 시뮬레이터 입력값을 구합니다.
+
+    타소득 = 종합소득금액 - 주사업장 소득금액 (분개장에 없는 다른 사업장·기타 소득)
+    소득공제 = 신고서 소득공제 합계
+
+    Args:
+        table: 신고서 색인 테이블
+        main_business: 주사업장 사업자번호 (기본: 사업장 명세의 첫 행)
+
+    Returns:
+        (타소득, 소득공제)
+    """
+    if table.empty:
+        return 0, 0
+    page, grp = BUSINESS_GROUP
+    incomes = [(table.get(page, grp, c, "str_5", ""), table.amount((page, grp, c, "mn_3"))) for c in table.codes(page, grp)]
+    matched = [income for biz_no, income in incomes if main_business and biz_no == main_business]
+    main_income = (matched or [income for _, income in incomes[:1]] or [0.0])[0]
+    total_income = table.amount(TOTAL_INCOME) or sum(income for _, income in incomes)
+    return total_income - main_income, table.amount(INCOME_DEDUCTION)
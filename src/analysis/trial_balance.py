@@ -0,0 +1,126 @@
+"""
+합계잔액시산표 로더
+시산표 JSON(bigclass_rows / main_rows)을 계정별 표로 읽어
+계정 분류 색인(AccountIndex)과 기초 잔액(전년 말 잔액)을 제공합니다.
+
+main_rows 행 구분(gubun): 1 = 대분류(재무상태), 0 = 대분류(손익), 2 = 중분류, 3 = 계정
+금액: l_prc 차변 합계, llp 차변 잔액, r_prc 대변 합계, rrp 대변 잔액
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .accounts import BALANCE_KINDS, KIND_NAMES, AccountIndex, account_keys
+from .cube import MonthlyCube
+
+GUBUN_CLASS = (0, 1)
+GUBUN_GROUP = 2
+GUBUN_ACCOUNT = 3
+
+TB_COLUMNS = ["cd_acctit", "nm_acctit", "대분류", "중분류", "순서", "차변합계", "대변합계", "차변잔액", "대변잔액"]
+
+
+@dataclass
+class TrialBalance:
+    """
+    시산표 계정별 표
+
+    Attributes:
+        accounts: 계정 행 (TB_COLUMNS) - 시산표 순서
+        classes: 분류 순서 (bigclass_rows의 nm_group)
+        index: 시산표 분류를 반영한 계정 분류 색인
+    """
+    accounts: pd.DataFrame
+    classes: List[str] = field(default_factory=list)
+    index: Optional[AccountIndex] = None
+
+    def __post_init__(self):
+        if self.index is None:
+            self.index = AccountIndex.default(self.accounts)
+
+    @property
+    def empty(self) -> bool:
+        return self.accounts.empty
+
+    def opening_balances(self) -> pd.Series:
+        """
+        재무상태 계정의 기초 잔액 (= 시산표 기말 잔액, 차변 잔액 - 대변 잔액)
+
+        Returns:
+            Series (index: 계정코드)
+        """
+        kinds = self.index.kinds(self.accounts["cd_acctit"])
+        rows = self.accounts[np.isin(kinds, BALANCE_KINDS)]
+        return pd.Series(
+            (rows["차변잔액"] - rows["대변잔액"]).to_numpy(), index=rows["cd_acctit"].to_numpy(), name="기초잔액"
+        )
+
+    def roll_forward(self, cube: MonthlyCube) -> pd.DataFrame:
+        """
+        기초 잔액에 당해 분개장 증감(차변 - 대변)을 더해 현재 잔액을 구합니다.
+        시산표에 없던 재무상태 계정도 분개장에 있으면 기초 0으로 포함합니다.
+
+        Args:
+            cube: 당해 분개장 큐브
+
+        Returns:
+            DataFrame (계정코드, 계정명, 구분, 분류, 기초잔액, 당해증감, 현재잔액) - 계정코드 순
+        """
+        opening = self.opening_balances()
+        movement = pd.Series(cube.net.sum(axis=1), index=cube.accounts.astype(str)) if not cube.empty else pd.Series(dtype="int64")
+        movement = movement[np.isin(self.index.kinds(movement.index), BALANCE_KINDS)]
+
+        codes = opening.index.union(movement.index)
+        names = pd.Series(self.accounts["nm_acctit"].to_numpy(), index=self.accounts["cd_acctit"].to_numpy())
+        if not cube.empty:
+            names = names.combine_first(pd.Series(cube.names, index=cube.accounts.astype(str)))
+        info = self.index.classify(codes)
+        out = pd.DataFrame({
+            "계정코드": codes,
+            "계정명": names.reindex(codes).fillna("").to_numpy(),
+            "구분": [KIND_NAMES[k] for k in info["kind"]],
+            "분류": info["중분류"].to_numpy(),
+            "기초잔액": opening.reindex(codes, fill_value=0).to_numpy(),
+            "당해증감": movement.reindex(codes, fill_value=0).to_numpy(),
+        })
+        out["현재잔액"] = out["기초잔액"] + out["당해증감"]
+        return out
+
+
+def load_trial_balance(tb_data) -> TrialBalance:
+    """
+    시산표 JSON을 계정별 표로 읽습니다. 계정 행은 직전 대분류/중분류 행 아래로 묶습니다.
+
+    Args:
+        tb_data: 합계잔액시산표 JSON {bigclass_rows, main_rows, main_sum}
+
+    Returns:
+        TrialBalance (데이터가 없으면 빈 표)
+    """
+    rows = (tb_data or {}).get("main_rows") or []
+    classes = [r.get("nm_group", "") for r in (tb_data or {}).get("bigclass_rows") or []]
+
+    records = []
+    klass = group = ""
+    order = 0
+    for row in rows:
+        gubun = row.get("gubun")
+        name = (row.get("nm_acctitpr") or "").strip()
+        if gubun in GUBUN_CLASS:
+            klass = group = name
+            order = row.get("index1") or 0
+        elif gubun == GUBUN_GROUP:
+            group = name
+        elif gubun == GUBUN_ACCOUNT and row.get("cd_acctit"):
+            records.append((
+                str(row["cd_acctit"]).strip(), name, klass, group, order,
+                row.get("l_prc") or 0, row.get("r_prc") or 0, row.get("llp") or 0, row.get("rrp") or 0,
+            ))
+
+    accounts = pd.DataFrame(records, columns=TB_COLUMNS)
+    amount_cols = ["차변합계", "대변합계", "차변잔액", "대변잔액"]
+    accounts[amount_cols] = accounts[amount_cols].apply(pd.to_numeric, errors="coerce").fillna(0).astype("int64")
+    accounts = accounts[account_keys(accounts["cd_acctit"]) >= 0].reset_index(drop=True)
+    return TrialBalance(accounts=accounts, classes=classes)
@@ -1,31 +1,62 @@
 """
 모듈 패키지 초기화
 """
-from .config import get_api_key, get_default_data_files
+from .config import get_api_key, get_default_data_files, get_ai_cache_path
 from .data_loader import (
     load_json_file,
     load_multiple_json_files,
     load_uploaded_file,
-    get_data_info
+    get_data_info,
+    iter_json_array,
+    load_json_columns,
+    optimize_journal_dtypes,
+    compare_memory
 )
+from .columnar_cache import load_or_build
 from .ai_categorizer import (
+    TradeAccountIndex,
+    get_trade_index,
     categorize_with_company_context,
     analyze_company_patterns,
     find_similar_trade_patterns,
     get_category_examples,
-    calculate_confidence
+    calculate_confidence,
+    resolve_from_history
+)
+from .ai_batch import categorize_in_batches
+from .merchant_search import MerchantNgramIndex
+from .merchant_ids import MerchantDictionary, build_merchant_dictionary, normalize_merchant
+from .card_matcher import (
+    build_journal_candidates,
+    match_card_to_journal
 )
 
 __all__ = [
     'get_api_key',
     'get_default_data_files',
+    'get_ai_cache_path',
     'load_json_file',
     'load_multiple_json_files',
     'load_uploaded_file',
     'get_data_info',
+    'iter_json_array',
+    'load_json_columns',
+    'optimize_journal_dtypes',
+    'compare_memory',
+    'load_or_build',
+    'TradeAccountIndex',
+    'get_trade_index',
     'categorize_with_company_context',
     'analyze_company_patterns',
     'find_similar_trade_patterns',
     'get_category_examples',
     'calculate_confidence',
+    'resolve_from_history',
+    'categorize_in_batches',
+    'MerchantNgramIndex',
+    'MerchantDictionary',
+    'build_merchant_dictionary',
+    'normalize_merchant',
+    'build_journal_candidates',
+    'match_card_to_journal',
 ]
@@ -0,0 +1,228 @@
+"""
+AI 일괄 분류 모듈
+미분류 카드 내역 전체를 거래처 단위로 중복 제거한 뒤 프롬프트 크기 배치로 나누어
+동시에(스레드 풀) Gemini에 요청하고, 결과를 거래처+업종 키로 디스크에 캐시합니다.
+"""
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .ai_categorizer import resolve_from_history
+
+MODEL_CANDIDATES = ['gemini-2.0-flash', 'gemini-pro']
+RESULT_COLUMNS = ['거래처', '업종(업태/종목)', '추천계정', '이유', '출처']
+
+_cache_lock = threading.Lock()
+
+
+def cache_key(merchant: str, industry: str) -> str:
+    """캐시 키 (거래처 + 업종)"""
+    return f"{merchant}|{industry}"
+
+
+def load_category_cache(cache_path: Union[str, Path]) -> Dict[str, Dict[str, str]]:
+    """
+    디스크 캐시를 로드합니다.
+
+    Args:
+        cache_path: 캐시 JSON 파일 경로
+
+    Returns:
+        Dict[캐시 키, {"추천계정": ..., "이유": ...}]
+    """
+    path = Path(cache_path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_category_cache(cache_path: Union[str, Path], cache: Dict[str, Dict[str, str]]) -> None:
+    """디스크 캐시를 저장합니다. (임시 파일에 쓴 뒤 교체)"""
+    path = Path(cache_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with _cache_lock:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=1)
+        tmp_path.replace(path)
+
+
+def build_batch_prompt(items: List[Dict]) -> str:
+    """배치 하나에 대한 분류 프롬프트를 만듭니다."""
+    return f"""
+    당신은 전문 회계사입니다. 아래 신용카드 사용 내역의 거래처별로 적절한 '계정과목'을 추천해주세요.
+
+    [분석 지침]
+    1. '전년도이력'이 있다면 그 계정과목을 최우선으로 추천하세요.
+    2. 없다면 '업종'과 '거래처'를 보고 판단하세요. (예: 통신업 -> 통신비, 식당 -> 복리후생비/접대비)
+
+    [입력 데이터]
+    {json.dumps(items, ensure_ascii=False)}
+
+    [출력 형식]
+    입력의 모든 거래처에 대해 JSON 포맷으로만 답해주세요. 예: {{"거래처명": {{"추천계정": "계정과목", "이유": "간략설명"}}}}
+    """
+
+
+def parse_ai_response(text: str) -> Dict[str, Dict[str, str]]:
+    """
+    모델 응답에서 JSON 객체를 추출합니다. (```json 코드블록 허용)
+
+    Args:
+        text: 모델 응답 텍스트
+
+    Returns:
+        Dict[거래처명, {"추천계정": ..., "이유": ...}]
+    """
+    match = re.search(r'\{.*\}', text or '', re.DOTALL)
+    if not match:
+        raise ValueError("응답에서 JSON을 찾을 수 없습니다.")
+    parsed = json.loads(match.group(0))
+    result = {}
+    for merchant, value in parsed.items():
+        if isinstance(value, dict):
+            result[merchant] = {"추천계정": str(value.get("추천계정", "")), "이유": str(value.get("이유", ""))}
+        else:
+            result[merchant] = {"추천계정": str(value), "이유": ""}
+    return result
+
+
+def _generate(prompt: str, model_factory: Callable, attempts: int, backoff: float) -> str:
+    """모델 후보를 순서대로 시도하고, 전체 실패 시 지수 백오프로 재시도합니다."""
+    last_error = None
+    for attempt in range(attempts):
+        for model_name in MODEL_CANDIDATES:
+            try:
+                return model_factory(model_name).generate_content(prompt).text
+            except Exception as e:
+                last_error = e
+        if attempt < attempts - 1:
+            time.sleep(backoff * (2 ** attempt))
+    raise last_error
+
+
+def categorize_in_batches(
+    api_key: str,
+    items: pd.DataFrame,
+    cache_path: Optional[Union[str, Path]] = None,
+    batch_size: int = 30,
+    max_workers: int = 4,
+    attempts: int = 3,
+    backoff: float = 1.0,
+    model_factory: Optional[Callable] = None,
+    df_journal: Optional[pd.DataFrame] = None,
+    confidence_threshold: float = 70.0
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    미분류 내역 전체를 배치 단위로 동시에 AI 분류합니다.
+
+    Args:
+        api_key: Gemini API Key
+        items: 미분류 내역 DataFrame (거래처, 업종(업태/종목), 전년도이력)
+        cache_path: 디스크 캐시 경로 (None이면 캐시 미사용)
+        batch_size: 프롬프트 하나에 넣을 거래처 수
+        max_workers: 동시 요청 수 상한
+        attempts: 배치별 최대 시도 횟수
+        backoff: 재시도 대기 기본 시간(초), 시도마다 2배
+        model_factory: 모델 생성 함수 (테스트용 스텁 주입, 기본은 genai.GenerativeModel)
+        df_journal: 과거 분개장 (전달 시 과거 패턴으로 확정 가능한 거래처는 AI 호출 생략)
+        confidence_threshold: 과거 패턴 로컬 확정 최소 신뢰도 (%)
+
+    Returns:
+        (거래처별 분류 결과 DataFrame, 통계 dict)
+    """
+    stats = {"거래처 수": 0, "이력 확정": 0, "캐시 적중": 0, "AI 배치 수": 0, "실패 거래처": 0}
+    if items.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS), stats
+
+    if model_factory is None:
+        import google.generativeai as genai  # 무거운 SDK는 AI 호출 시점에만 로드
+        genai.configure(api_key=api_key)
+        model_factory = genai.GenerativeModel
+
+    # 거래처+업종 단위 중복 제거
+    unique = items.drop_duplicates(['거래처', '업종(업태/종목)'])
+    stats["거래처 수"] = len(unique)
+
+    cache = load_category_cache(cache_path) if cache_path else {}
+    results: Dict[str, Dict[str, str]] = {}
+    rows = unique.to_dict(orient='records')
+
+    # 과거 패턴으로 확정 가능한 거래처는 로컬에서 처리
+    if df_journal is not None and not df_journal.empty:
+        resolved, rows, tier_stats = resolve_from_history(df_journal, rows, confidence_threshold)
+        for tier, tier_stat in tier_stats.items():
+            stats[f"{tier} 건수"] = tier_stat["건수"]
+            stats[f"{tier} ms"] = round(tier_stat["소요(ms)"], 1)
+        for row in unique.to_dict(orient='records'):
+            if row['거래처'] in resolved:
+                answer = resolved[row['거래처']]
+                results[cache_key(row['거래처'], row['업종(업태/종목)'])] = {
+                    "추천계정": answer["계정과목"], "이유": answer["근거"], "출처": "이력"
+                }
+        stats["이력 확정"] = len(results)
+
+    pending = []
+    for row in rows:
+        key = cache_key(row['거래처'], row['업종(업태/종목)'])
+        if key in cache:
+            results[key] = dict(cache[key], 출처="캐시")
+            stats["캐시 적중"] += 1
+        else:
+            pending.append(row)
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    stats["AI 배치 수"] = len(batches)
+
+    def run_batch(batch: List[Dict]) -> Dict[str, Dict[str, str]]:
+        payload = [
+            {"거래처": r['거래처'], "업종": r['업종(업태/종목)'], "전년도이력": r.get('전년도이력', '')}
+            for r in batch
+        ]
+        return parse_ai_response(_generate(build_batch_prompt(payload), model_factory, attempts, backoff))
+
+    if batches:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [(batch, pool.submit(run_batch, batch)) for batch in batches]
+            for batch, future in futures:
+                try:
+                    answer = future.result()
+                except Exception as e:
+                    answer, error = {}, f"⚠️ AI 호출 실패: {e}"
+                else:
+                    error = "응답에 누락됨"
+                for row in batch:
+                    key = cache_key(row['거래처'], row['업종(업태/종목)'])
+                    if row['거래처'] in answer:
+                        cache[key] = answer[row['거래처']]
+                        results[key] = dict(answer[row['거래처']], 출처="AI")
+                    else:
+                        results[key] = {"추천계정": "", "이유": error, "출처": "실패"}
+                        stats["실패 거래처"] += 1
+
+        stats["AI ms"] = round((time.perf_counter() - started) * 1000, 1)
+        if cache_path:
+            save_category_cache(cache_path, cache)
+
+    rows = []
+    for row in unique.to_dict(orient='records'):
+        result = results[cache_key(row['거래처'], row['업종(업태/종목)'])]
+        rows.append({
+            '거래처': row['거래처'],
+            '업종(업태/종목)': row['업종(업태/종목)'],
+            '추천계정': result['추천계정'],
+            '이유': result['이유'],
+            '출처': result['출처'],
+        })
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS), stats
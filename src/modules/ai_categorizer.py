@@ -1,10 +1,145 @@
 """
 AI 계정 분류 모듈 (회사 패턴 학습 기반)
 """
+import numpy as np
 import pandas as pd
+import hashlib
+import json
 import re
-from typing import Dict, List, Tuple
-import google.generativeai as genai
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from .merchant_ids import MerchantDictionary
+from .merchant_search import MerchantNgramIndex
+
+
+class TradeAccountIndex:
+    """
+    분개장 1회 groupby로 만든 '거래처 → 계정과목 빈도' 인덱스입니다.
+    패턴 분석/신뢰도 계산 함수들이 분개장 전체를 다시 스캔하지 않고 이 인덱스로 응답합니다.
+    """
+
+    def __init__(self, df_journal: pd.DataFrame):
+        self.n_rows = len(df_journal)
+        has_cols = 'nm_trade' in df_journal.columns and 'nm_acctit' in df_journal.columns
+
+        if df_journal.empty or not has_cols:
+            self.pairs = pd.DataFrame(columns=['nm_trade', 'nm_acctit', 'count'])
+            self.trade_totals: Dict[str, int] = {}
+            self.account_totals = pd.Series(dtype='int64')
+            self.trades = pd.Series([], dtype=object)
+        else:
+            # (거래처, 계정) 쌍을 분개장 첫 등장 순서대로 집계
+            self.pairs = (
+                df_journal.groupby(['nm_trade', 'nm_acctit'], sort=False, observed=True)
+                .size()
+                .rename('count')
+                .reset_index()
+            )
+            # category dtype의 미사용 범주(0건)는 제외
+            trade_totals = df_journal['nm_trade'].value_counts()
+            self.trade_totals = trade_totals[trade_totals > 0].to_dict()
+            account_totals = df_journal['nm_acctit'].value_counts()
+            self.account_totals = account_totals[account_totals > 0]
+            self.trades = pd.Series(np.asarray(pd.unique(df_journal['nm_trade'].dropna()), dtype=object))
+
+        self.pair_counts: Dict[Tuple[str, str], int] = {}
+        self.trade_accounts: Dict[str, Dict[str, int]] = {}
+        for t, a, c in zip(self.pairs['nm_trade'], self.pairs['nm_acctit'], self.pairs['count']):
+            self.pair_counts[(t, a)] = c
+            self.trade_accounts.setdefault(t, {})[a] = c
+
+        # 거래처별 최빈 계정 (동률이면 Series.mode와 같이 정렬상 앞선 계정)
+        ranked = self.pairs.sort_values(['count', 'nm_acctit'], ascending=[False, True], kind='stable')
+        top = ranked.drop_duplicates('nm_trade').set_index('nm_trade')['nm_acctit'].to_dict()
+        self.top_account: Dict[str, str] = {t: top[t] for t in self.trades if t in top}
+
+        # 거래처명 bigram 역색인 (키워드 검색 시 후보 거래처만 검사)
+        self.search_index = MerchantNgramIndex(self.trades)
+
+        # 정수 거래처 ID별 집계 ('（주）A'/'(주)A'/'A ' 및 같은 거래처코드는 한 거래처로 조회)
+        self.merchants = MerchantDictionary()
+        self.id_totals: Dict[int, int] = {}
+        self.id_accounts: Dict[int, Dict[str, int]] = {}
+        self.id_top_account: Dict[int, str] = {}
+        if not df_journal.empty and has_cols:
+            ids = self.merchants.register(df_journal)
+            accounts = df_journal['nm_acctit'].astype(object).to_numpy()
+            # 건수는 계정명이 비어 있는 행까지 포함 (기존 len(동일 거래처 행)과 같은 분모)
+            known = ids[ids >= 0]
+            totals = np.bincount(known)
+            self.id_totals = {int(i): int(totals[i]) for i in np.flatnonzero(totals)}
+            keep = (ids >= 0) & pd.notna(accounts)
+            id_pairs = (
+                pd.DataFrame({'id': ids[keep], 'nm_acctit': accounts[keep]})
+                .groupby(['id', 'nm_acctit'], sort=False).size().rename('count').reset_index()
+            )
+            for i, a, c in zip(id_pairs['id'].tolist(), id_pairs['nm_acctit'], id_pairs['count'].tolist()):
+                self.id_accounts.setdefault(i, {})[a] = c
+            ranked = id_pairs.sort_values(['count', 'nm_acctit'], ascending=[False, True], kind='stable')
+            self.id_top_account = ranked.drop_duplicates('id').set_index('id')['nm_acctit'].to_dict()
+
+    def matching_trades(self, pattern) -> pd.Series:
+        """정규식 패턴(문자열 또는 컴파일된 패턴)을 포함하는 거래처명을 반환합니다."""
+        return self.trades.iloc[self.search_index.search(pattern)]
+
+    def trades_containing(self, term: str) -> pd.Series:
+        """검색어를 그대로(정규식 아님) 포함하는 거래처명을 반환합니다."""
+        return self.trades.iloc[self.search_index.search_literal(term, case_sensitive=True)]
+
+    def count(self, trade_name: str, account: str) -> int:
+        return self.pair_counts.get((trade_name, account), 0)
+
+    def merchant_id(self, trade_name: str) -> int:
+        """거래처명의 정수 ID (분개장에 없는 거래처면 -1)"""
+        return self.merchants.id_of(trade_name)
+
+
+# 인덱스가 읽는 컬럼 (거래처 ID 부여에 쓰는 거래처코드·사업자번호 포함)
+INDEX_COLUMNS = ('nm_trade', 'nm_acctit', 'cd_trade', 'bisocial_no')
+TRADE_INDEX_CACHE_SIZE = 4
+
+_trade_index_cache: "OrderedDict[str, TradeAccountIndex]" = OrderedDict()
+
+
+def journal_fingerprint(df_journal: pd.DataFrame) -> str:
+    """
+    인덱스가 읽는 컬럼 내용의 해시 (같은 객체를 제자리 수정해도 값이 바뀌면 다른 키)
+
+    Args:
+        df_journal: 분개장 DataFrame
+
+    Returns:
+        SHA-1 16진 문자열
+    """
+    cols = [c for c in INDEX_COLUMNS if c in df_journal.columns]
+    digest = hashlib.sha1(f"{len(df_journal)}|{','.join(cols)}".encode('utf-8'))
+    if cols and len(df_journal):
+        digest.update(pd.util.hash_pandas_object(df_journal[cols], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def get_trade_index(df_journal: pd.DataFrame) -> TradeAccountIndex:
+    """
+    분개장별 TradeAccountIndex를 반환합니다. (내용이 같으면 재사용, 최근 TRADE_INDEX_CACHE_SIZE개 보관)
+
+    Args:
+        df_journal: 분개장 DataFrame
+
+    Returns:
+        TradeAccountIndex
+    """
+    key = journal_fingerprint(df_journal)
+    index = _trade_index_cache.get(key)
+    if index is not None:
+        _trade_index_cache.move_to_end(key)
+        return index
+
+    index = TradeAccountIndex(df_journal)
+    _trade_index_cache[key] = index
+    while len(_trade_index_cache) > TRADE_INDEX_CACHE_SIZE:
+        _trade_index_cache.popitem(last=False)
+    return index
 
 
 def analyze_company_patterns(df_journal: pd.DataFrame) -> Dict[str, str]:
@@ -20,23 +155,13 @@ def analyze_company_patterns(df_journal: pd.DataFrame) -> Dict[str, str]:
     if df_journal.empty or 'nm_trade' not in df_journal.columns or 'nm_acctit' not in df_journal.columns:
         return {}
 
-    # 거래처별 가장 많이 사용한 계정과목 추출
-    patterns = {}
-
-    for trade_name in df_journal['nm_trade'].dropna().unique():
-        if not trade_name or trade_name.strip() == "":
-            continue
-
-        # 해당 거래처의 모든 거래 필터링
-        trade_rows = df_journal[df_journal['nm_trade'] == trade_name]
-
-        # 가장 많이 사용한 계정과목
-        if not trade_rows.empty and 'nm_acctit' in trade_rows.columns:
-            most_common = trade_rows['nm_acctit'].mode()
-            if len(most_common) > 0:
-                patterns[trade_name] = most_common[0]
-
-    return patterns
+    # 거래처별 가장 많이 사용한 계정과목 (인덱스에서 조회)
+    index = get_trade_index(df_journal)
+    return {
+        trade_name: account
+        for trade_name, account in index.top_account.items()
+        if trade_name and trade_name.strip() != ""
+    }
 
 
 def find_similar_trade_patterns(df_journal: pd.DataFrame, keyword: str) -> Dict[str, List[str]]:
@@ -53,22 +178,21 @@ def find_similar_trade_patterns(df_journal: pd.DataFrame, keyword: str) -> Dict[
     if df_journal.empty or 'nm_trade' not in df_journal.columns or 'nm_acctit' not in df_journal.columns:
         return {}
 
-    # 키워드를 포함하는 거래처 필터링
+    # 키워드를 포함하는 거래처 필터링 (행 전체가 아닌 고유 거래처명만 검사)
+    index = get_trade_index(df_journal)
     pattern = re.compile(keyword, re.IGNORECASE)
-    matching_rows = df_journal[df_journal['nm_trade'].str.contains(pattern, na=False)]
+    matching = index.pairs[index.pairs['nm_trade'].isin(index.matching_trades(pattern))]
 
-    if matching_rows.empty:
+    if matching.empty:
         return {}
 
     # 계정과목별로 거래처 그룹화
     result = {}
-    for acctit in matching_rows['nm_acctit'].dropna().unique():
-        trades = matching_rows[matching_rows['nm_acctit'] == acctit]['nm_trade'].unique().tolist()
-        result[acctit] = trades
+    for trade_name, acctit in zip(matching['nm_trade'], matching['nm_acctit']):
+        result.setdefault(acctit, []).append(trade_name)
 
     return result
 
-
 def get_category_examples(df_journal: pd.DataFrame, keyword_pattern: str, top_n: int = 3) -> str:
     """
     키워드 패턴에 맞는 거래처들의 계정 분류 예시를 반환합니다.
@@ -110,18 +234,31 @@ def get_top_accounts(df_journal: pd.DataFrame, top_n: int = 10) -> List[str]:
     if df_journal.empty or 'nm_acctit' not in df_journal.columns:
         return []
 
-    top_accounts = df_journal['nm_acctit'].value_counts().head(top_n).index.tolist()
+    if 'nm_trade' not in df_journal.columns:
+        return df_journal['nm_acctit'].value_counts().head(top_n).index.tolist()
+
+    top_accounts = get_trade_index(df_journal).account_totals.head(top_n).index.tolist()
     return top_accounts
 
 
-def calculate_confidence(df_journal: pd.DataFrame, trade_name: str, suggested_account: str) -> Tuple[float, str]:
+def calculate_confidence(
+    df_journal: pd.DataFrame,
+    trade_name: str,
+    suggested_account: str,
+    index: Optional[TradeAccountIndex] = None
+) -> Tuple[float, str]:
     """
     제안된 계정과목의 신뢰도를 계산합니다.
 
+    동일 거래처는 이름 문자열이 아니라 정규화된 거래처 ID로 판단합니다. ('(주)A'/'㈜A'/'A ' 및 같은 거래처코드는 한 거래처)
+    유사 거래처의 첫 단어는 정규식이 아닌 리터럴로 포함 여부를 봅니다. ('(주)아트박스'의 괄호가 정규식 그룹으로 해석되지 않도록)
+    건수는 계정명이 비어 있는 행까지 포함합니다.
+
     Args:
         df_journal: 분개장 DataFrame
         trade_name: 거래처명
         suggested_account: 제안된 계정과목
+        index: 미리 만든 TradeAccountIndex (여러 건 조회 시 내용 해시 계산을 건너뜀, 없으면 get_trade_index)
 
     Returns:
         (신뢰도 %, 근거 설명)
@@ -129,11 +266,13 @@ def calculate_confidence(df_journal: pd.DataFrame, trade_name: str, suggested_ac
     if df_journal.empty:
         return 0.0, "데이터 없음"
 
-    # 1. 정확히 같은 거래처가 있는 경우
-    exact_matches = df_journal[df_journal['nm_trade'] == trade_name]
-    if not exact_matches.empty:
-        total = len(exact_matches)
-        matching = len(exact_matches[exact_matches['nm_acctit'] == suggested_account])
+    index = index if index is not None else get_trade_index(df_journal)
+
+    # 1. 같은 거래처(정규화 이름/거래처 ID 기준)가 있는 경우
+    merchant = index.merchant_id(trade_name)
+    total = index.id_totals.get(merchant, 0)
+    if total:
+        matching = index.id_accounts[merchant].get(suggested_account, 0)
         confidence = (matching / total) * 100
         return confidence, f"동일 거래처 {total}건 중 {matching}건이 해당 계정 사용"
 
@@ -142,29 +281,127 @@ def calculate_confidence(df_journal: pd.DataFrame, trade_name: str, suggested_ac
     keywords = trade_name.split()
     if keywords:
         keyword = keywords[0]
-        similar_trades = df_journal[df_journal['nm_trade'].str.contains(keyword, na=False)]
+        similar_trades = index.trades_containing(keyword)
 
         if not similar_trades.empty:
-            total = len(similar_trades)
-            matching = len(similar_trades[similar_trades['nm_acctit'] == suggested_account])
+            total = sum(index.trade_totals[t] for t in similar_trades)
+            matching = sum(index.count(t, suggested_account) for t in similar_trades)
             confidence = (matching / total) * 100
             return confidence, f"유사 거래처('{keyword}' 포함) {total}건 중 {matching}건이 해당 계정 사용"
 
     return 50.0, "과거 패턴 없음 (AI 일반 지식 기반)"
 
 
+TIER_EXACT = "1단계(동일 거래처)"
+TIER_SIMILAR = "2단계(유사 거래처)"
+TIER_AI = "3단계(AI)"
+
+
+def _confidence_label(confidence: float) -> str:
+    return "높음" if confidence >= 90 else "중간"
+
+
+def resolve_from_history(
+    df_journal: pd.DataFrame,
+    unknown_items: List[Dict],
+    threshold: float = 70.0,
+    min_similar_support: int = 3
+) -> Tuple[Dict[str, Dict[str, str]], List[Dict], Dict[str, Dict[str, float]]]:
+    """
+    과거 분개 패턴만으로 분류 가능한 항목을 AI 호출 전에 해결합니다.
+
+    1단계: 동일 거래처의 최빈 계정 비중이 threshold(%) 이상이면 확정
+    2단계: 동일 거래처가 없을 때, 첫 단어를 포함하는 유사 거래처들의 최빈 계정 비중으로 판단
+    나머지(애매한 항목)만 AI 대상으로 남깁니다.
+
+    Args:
+        df_journal: 분개장 DataFrame (과거 패턴 학습용)
+        unknown_items: 미분류 항목 리스트 [{"거래처": "...", ...}, ...]
+        threshold: 로컬 확정 최소 신뢰도 (%)
+        min_similar_support: 2단계 판단에 필요한 최소 유사 거래 건수
+
+    Returns:
+        (Dict[거래처명, {"계정과목", "신뢰도", "근거"}], AI로 보낼 항목 리스트, 단계별 통계)
+    """
+    index = get_trade_index(df_journal)
+    resolved: Dict[str, Dict[str, str]] = {}
+    ambiguous: List[Dict] = []
+    stats = {tier: {"건수": 0, "소요(ms)": 0.0} for tier in (TIER_EXACT, TIER_SIMILAR)}
+
+    # 1단계: 동일 거래처 조회 (정수 거래처 ID, O(1))
+    started = time.perf_counter()
+    for item in unknown_items:
+        trade_name = str(item.get("거래처", "")).strip()
+        if trade_name in resolved:
+            continue
+        merchant = index.merchant_id(trade_name)
+        total = index.id_totals.get(merchant, 0)
+        account = index.id_top_account.get(merchant)
+        if total and account is not None:
+            confidence = index.id_accounts[merchant][account] / total * 100
+            if confidence >= threshold:
+                resolved[trade_name] = {
+                    "계정과목": account,
+                    "신뢰도": _confidence_label(confidence),
+                    "근거": f"동일 거래처 {total}건 중 {confidence:.0f}%가 해당 계정 사용"
+                }
+                stats[TIER_EXACT]["건수"] += 1
+                continue
+        ambiguous.append(item)
+    stats[TIER_EXACT]["소요(ms)"] = (time.perf_counter() - started) * 1000
+
+    # 2단계: 유사 거래처 통계 (동일 거래처 이력이 없는 항목만)
+    started = time.perf_counter()
+    remaining: List[Dict] = []
+    for item in ambiguous:
+        trade_name = str(item.get("거래처", "")).strip()
+        if trade_name in resolved:
+            continue
+        keywords = trade_name.split()
+        if index.merchant_id(trade_name) in index.id_totals or not keywords or len(keywords[0]) < 2:
+            remaining.append(item)
+            continue
+
+        keyword = keywords[0]
+        counts: Dict[str, int] = {}
+        for similar in index.trades_containing(keyword):
+            for account, count in index.trade_accounts.get(similar, {}).items():
+                counts[account] = counts.get(account, 0) + count
+        total = sum(counts.values())
+        if total >= min_similar_support:
+            account = max(counts, key=counts.get)
+            confidence = counts[account] / total * 100
+            if confidence >= threshold:
+                resolved[trade_name] = {
+                    "계정과목": account,
+                    "신뢰도": _confidence_label(confidence),
+                    "근거": f"유사 거래처('{keyword}' 포함) {total}건 중 {confidence:.0f}%가 해당 계정 사용"
+                }
+                stats[TIER_SIMILAR]["건수"] += 1
+                continue
+        remaining.append(item)
+    stats[TIER_SIMILAR]["소요(ms)"] = (time.perf_counter() - started) * 1000
+
+    return resolved, remaining, stats
+
+
 def categorize_with_company_context(
     api_key: str,
     unknown_items: List[Dict],
-    df_journal: pd.DataFrame
+    df_journal: pd.DataFrame,
+    confidence_threshold: float = 70.0,
+    tier_stats: Optional[Dict[str, Dict[str, float]]] = None
 ) -> str:
     """
     회사의 과거 패턴을 학습하여 AI로 계정과목을 분류합니다.
+    과거 패턴으로 확정 가능한 항목(resolve_from_history)은 AI를 호출하지 않습니다.
 
     Args:
         api_key: Gemini API Key
         unknown_items: 미분류 항목 리스트 [{"거래처": "...", "금액": ...}, ...]
         df_journal: 분개장 DataFrame (과거 패턴 학습용)
+        confidence_threshold: 로컬 확정 최소 신뢰도 (%)
+        tier_stats: 전달 시 단계별 처리 건수/소요시간을 기록
 
     Returns:
         AI의 분류 결과 (JSON 형식 문자열)
@@ -175,6 +412,15 @@ def categorize_with_company_context(
     if not unknown_items:
         return "분류할 항목이 없습니다."
 
+    # 0. 과거 패턴으로 해결 가능한 항목은 로컬에서 처리
+    resolved, unknown_items, stats = resolve_from_history(df_journal, unknown_items, confidence_threshold)
+    stats[TIER_AI] = {"건수": len(unknown_items), "소요(ms)": 0.0}
+    if tier_stats is not None:
+        tier_stats.update(stats)
+
+    if not unknown_items:
+        return json.dumps(resolved, ensure_ascii=False, indent=2)
+
     try:
         # 1. 회사 내부 패턴 분석
         company_patterns = analyze_company_patterns(df_journal)
@@ -191,6 +437,7 @@ def categorize_with_company_context(
         top_accounts = get_top_accounts(df_journal, top_n=10)
 
         # 4. AI 프롬프트 구성
+        import google.generativeai as genai  # 무거운 SDK는 AI 호출 시점에만 로드
         genai.configure(api_key=api_key)
 
         prompt = f"""
@@ -232,6 +479,7 @@ def categorize_with_company_context(
 """
 
         # 5. AI 모델 호출
+        started = time.perf_counter()
         try:
             model = genai.GenerativeModel('gemini-2.0-flash-exp')
             response = model.generate_content(prompt)
@@ -243,7 +491,19 @@ def categorize_with_company_context(
                 model = genai.GenerativeModel('gemini-pro')
                 response = model.generate_content(prompt)
 
-        return response.text
+        if tier_stats is not None:
+            tier_stats[TIER_AI]["소요(ms)"] = (time.perf_counter() - started) * 1000
+
+        if not resolved:
+            return response.text
+
+        # 로컬 확정 결과와 AI 결과 병합
+        match = re.search(r'\{.*\}', response.text, re.DOTALL)
+        try:
+            merged = dict(resolved, **json.loads(match.group(0)))
+        except (AttributeError, ValueError):
+            return json.dumps(resolved, ensure_ascii=False, indent=2) + "\n" + response.text
+        return json.dumps(merged, ensure_ascii=False, indent=2)
 
     except Exception as e:
         return f"⚠️ AI 호출 실패: {str(e)}"
@@ -0,0 +1,160 @@
+"""
+분석 캐시 모듈
+파일 내용 해시(업로드 바이트 또는 경로+수정시각)를 키로
+파싱된 DataFrame과 파생 결과(전년도 이력, 카드 누락 분석 등)를 재사용합니다.
+캐시 크기는 항목 수가 아니라 추정 메모리(바이트)로 제한합니다.
+"""
+import dataclasses
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+UPLOAD_FINGERPRINT_SLOTS = 64
+
+# 업로드 file_id → 내용 해시 (재실행마다 같은 업로드 바이트를 다시 해시하지 않도록)
+_upload_fingerprints: "OrderedDict[str, str]" = OrderedDict()
+_upload_lock = threading.Lock()
+
+
+def file_fingerprint(uploaded_file, default_path: str) -> Optional[str]:
+    """
+    업로드 파일 또는 로컬 파일의 캐시 키를 생성합니다.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile 객체 (없으면 None)
+        default_path: 업로드가 없을 때 사용할 로컬 파일 경로
+
+    Returns:
+        캐시 키 문자열 (파일이 없으면 None)
+    """
+    if uploaded_file is not None:
+        file_id = getattr(uploaded_file, 'file_id', None)
+        with _upload_lock:
+            if file_id is not None and file_id in _upload_fingerprints:
+                _upload_fingerprints.move_to_end(file_id)
+                return _upload_fingerprints[file_id]
+        fingerprint = "upload:" + hashlib.sha1(uploaded_file.getvalue()).hexdigest()
+        if file_id is not None:
+            with _upload_lock:
+                _upload_fingerprints[file_id] = fingerprint
+                while len(_upload_fingerprints) > UPLOAD_FINGERPRINT_SLOTS:
+                    _upload_fingerprints.popitem(last=False)
+        return fingerprint
+    if os.path.exists(default_path):
+        stat = os.stat(default_path)
+        return f"path:{os.path.abspath(default_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    return None
+
+
+def source_key(uploaded_file, default_path: str) -> str:
+    """
+    내용과 무관한 원본 식별 키 (업로드 파일명 또는 로컬 경로)
+    같은 원본의 새 버전끼리 증분 재분석 상태를 이어 쓰는 데 사용합니다.
+    """
+    if uploaded_file is not None:
+        return "upload:" + uploaded_file.name
+    return "path:" + os.path.abspath(default_path)
+
+
+def estimate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """
+    캐시 값의 대략적인 메모리 크기 (바이트)
+
+    DataFrame/Series는 memory_usage(deep=True), 배열은 nbytes,
+    튜플·리스트·딕셔너리·데이터클래스·일반 객체는 구성 요소를 합산합니다. (같은 객체는 한 번만)
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v, seen) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in value.items())
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sys.getsizeof(value) + sum(estimate_size(getattr(value, f.name), seen) for f in dataclasses.fields(value))
+    if hasattr(value, '__dict__') and not isinstance(value, type):
+        return sys.getsizeof(value) + estimate_size(vars(value), seen)
+    return sys.getsizeof(value)
+
+
+class AnalysisCache:
+    """
+    메모리(추정 바이트)와 항목 수로 제한된 LRU 캐시입니다.
+    Streamlit 재실행(rerun) 간에도 프로세스 단위로 유지됩니다.
+    위젯 값이 키에 들어가는 작은 결과가 쌓여도 큰 DataFrame이 항목 수 때문에 밀려나지 않도록
+    크기 합계가 max_bytes를 넘을 때 가장 오래 안 쓴 항목부터 뺍니다. (방금 넣은 항목은 유지)
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._store: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        키에 해당하는 값을 반환하고, 없으면 계산 후 저장합니다.
+
+        Args:
+            key: 캐시 키 (파일 지문을 포함한 튜플)
+            compute: 캐시 미스 시 호출할 함수
+
+        Returns:
+            캐시된 값 또는 새로 계산된 값
+        """
+        with self._lock:
+            if key in self._store:
+                self._store.move_to_end(key)
+                self.hits += 1
+                return self._store[key]
+
+        value = compute()
+        size = estimate_size(value)
+
+        with self._lock:
+            self.misses += 1
+            self.bytes += size - self._sizes.get(key, 0)
+            self._store[key] = value
+            self._sizes[key] = size
+            self._store.move_to_end(key)
+            while len(self._store) > 1 and (len(self._store) > self.max_entries or self.bytes > self.max_bytes):
+                old_key, _ = self._store.popitem(last=False)
+                self.bytes -= self._sizes.pop(old_key)
+        return value
+
+    def clear(self) -> None:
+        """캐시를 비웁니다."""
+        with self._lock:
+            self._store.clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+_default_cache = AnalysisCache()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """프로세스 공용 분석 캐시를 반환합니다."""
+    return _default_cache
@@ -0,0 +1,201 @@
+"""
+카드-장부 매칭 모듈
+카드 승인 내역과 분개장 라인을 날짜 허용 범위·금액 허용 오차 내에서 짝지어
+입력 시차나 부가세 분할 입력으로 생기는 '가짜 누락'을 줄입니다.
+"""
+import numpy as np
+import pandas as pd
+
+from .merchant_ids import normalize_merchants
+
+# 복합 정렬 키 (일자 * AMOUNT_SPAN + 금액) 에서 금액이 차지하는 범위
+AMOUNT_SPAN = 1 << 40
+
+MATCH_COLUMNS = ['card_index', 'journal_index', 'day_diff', 'amount_diff', 'trade_match', 'split', 'confidence']
+
+
+def _to_days(values: pd.Series) -> np.ndarray:
+    """yyyymmdd 문자열을 일 단위 정수로 변환합니다. (변환 불가 시 -1)"""
+    dates = pd.to_datetime(values.astype(str), format='%Y%m%d', errors='coerce')
+    days = (dates - pd.Timestamp('1970-01-01')).dt.days
+    return days.fillna(-1).to_numpy(dtype='int64')
+
+
+def _text(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[col].astype(object).fillna('').astype(str).str.strip()
+
+
+def _trade_code(df: pd.DataFrame) -> pd.Series:
+    """거래처 코드 정규화 (장부 '000159' == 카드 '0000000159')"""
+    return _text(df, 'cd_trade').str.lstrip('0')
+
+
+def _trade_name(df: pd.DataFrame) -> np.ndarray:
+    """거래처명 정규화 키 (전각 괄호·법인 형태·카드 끝자리 차이 무시, 없으면 빈 문자열)"""
+    if 'nm_trade' not in df.columns:
+        return np.full(len(df), '', dtype=object)
+    codes, keys = normalize_merchants(df['nm_trade'])
+    return np.append(keys, '').astype(object)[np.where(codes >= 0, codes, len(keys))]
+
+
+def _joint_ids(left: np.ndarray, right: np.ndarray):
+    """두 문자열 배열을 같은 정수 ID 공간으로 (빈 문자열은 -1)"""
+    ids, uniques = pd.factorize(np.concatenate([left, right]))
+    blank = np.flatnonzero(np.asarray(uniques, dtype=object) == '')
+    if len(blank):
+        ids = np.where(ids == blank[0], -1, ids)
+    return ids[:len(left)], ids[len(left):]
+
+
+def build_journal_candidates(df_journal: pd.DataFrame) -> pd.DataFrame:
+    """
+    분개장에서 카드 매칭 후보를 만듭니다.
+
+    차변 라인 각각이 후보가 되며, 전표(da_date+no_acct)에 차변 라인이 여러 개인 경우
+    (예: 소모품비 + 부가세대급금) 전표 차변 합계도 '분할' 후보로 추가합니다.
+
+    Args:
+        df_journal: 전처리된 분개장 DataFrame
+
+    Returns:
+        후보 DataFrame (day, amount, code, name, lines, split)
+    """
+    if df_journal.empty or 'da_date' not in df_journal.columns or 'mn_bungae1' not in df_journal.columns:
+        return pd.DataFrame(columns=['day', 'amount', 'code', 'name', 'lines', 'split'])
+
+    debit = df_journal[df_journal['mn_bungae1'] != 0]
+    lines = pd.DataFrame({
+        'day': _to_days(debit['da_date']),
+        'amount': debit['mn_bungae1'].astype('int64').to_numpy(),
+        'code': _trade_code(debit).to_numpy(),
+        'name': _trade_name(debit),
+        'lines': [(i,) for i in debit.index],
+        'split': False,
+    })
+
+    if 'no_acct' not in debit.columns:
+        return lines
+
+    voucher_key = debit['da_date'].astype(str) + '_' + debit['no_acct'].astype(str)
+    multi = voucher_key.duplicated(keep=False).to_numpy()
+    if not multi.any():
+        return lines
+
+    multi_rows = debit[multi]
+    voucher_id = pd.factorize(voucher_key[multi])[0]
+    heads = multi_rows[~pd.Series(voucher_id).duplicated().to_numpy()]
+    vouchers = pd.DataFrame({
+        'day': _to_days(heads['da_date']),
+        'amount': np.bincount(voucher_id, weights=multi_rows['mn_bungae1'].to_numpy()).astype('int64'),
+        'code': _trade_code(heads).to_numpy(),
+        'name': _trade_name(heads),
+        'lines': pd.Series(multi_rows.index).groupby(voucher_id).agg(tuple).to_numpy(),
+        'split': True,
+    })
+    return pd.concat([lines, vouchers], ignore_index=True)
+
+
+def match_card_to_journal(
+    df_journal: pd.DataFrame,
+    df_card: pd.DataFrame,
+    date_window: int = 3,
+    amount_tol: float = 0,
+    amount_tol_ratio: float = 0.0,
+    min_confidence: float = 0.5
+) -> pd.DataFrame:
+    """
+    카드 내역과 분개장 라인을 허용 범위 내에서 1:1로 매칭합니다.
+
+    (일자, 금액) 복합 키로 정렬한 후보 배열에 대해 날짜 오프셋별 searchsorted로
+    구간 조회를 하므로 O((n + m) log m · 날짜범위) 에 동작합니다.
+    이후 신뢰도 높은 쌍부터 탐욕적으로 배정하며, 이미 사용된 장부 라인은 재사용하지 않습니다.
+
+    Args:
+        df_journal: 전처리된 분개장 DataFrame
+        df_card: 카드 내역 DataFrame (da_sbook, mn_total, nm_trade, cd_trade)
+        date_window: 허용 일수 (앞뒤로)
+        amount_tol: 허용 금액 오차 (원)
+        amount_tol_ratio: 허용 금액 오차 비율 (예: 0.01 = 1%)
+        min_confidence: 매칭으로 인정할 최소 신뢰도 (0~1)
+
+    Returns:
+        매칭 쌍 DataFrame (card_index, journal_index, day_diff, amount_diff, trade_match, split, confidence)
+    """
+    cand = build_journal_candidates(df_journal)
+    if cand.empty or df_card.empty or 'da_sbook' not in df_card.columns or 'mn_total' not in df_card.columns:
+        return pd.DataFrame(columns=MATCH_COLUMNS)
+
+    cand = cand[cand['day'] >= 0]
+    card_day = _to_days(df_card['da_sbook'])
+    card_amt = pd.to_numeric(df_card['mn_total'], errors='coerce').fillna(0).to_numpy(dtype='int64')
+    tol = np.maximum(amount_tol, np.abs(card_amt) * amount_tol_ratio).astype('int64')
+    valid = card_day >= 0
+
+    # 복합 키: (일자 - 기준일) * AMOUNT_SPAN + (금액 - 기준금액)
+    base_day = min(cand['day'].min(), card_day[valid].min(initial=cand['day'].min())) - date_window
+    base_amt = min(cand['amount'].min(), (card_amt - tol).min()) if len(card_amt) else cand['amount'].min()
+    cand_key = (cand['day'].to_numpy() - base_day) * AMOUNT_SPAN + (cand['amount'].to_numpy() - base_amt)
+    order = np.argsort(cand_key, kind='stable')
+    sorted_key = cand_key[order]
+
+    card_pos = np.flatnonzero(valid)
+    pair_card, pair_cand = [], []
+    for offset in range(-date_window, date_window + 1):
+        day_part = (card_day[card_pos] + offset - base_day) * AMOUNT_SPAN
+        lo = np.searchsorted(sorted_key, day_part + (card_amt[card_pos] - tol[card_pos] - base_amt), side='left')
+        hi = np.searchsorted(sorted_key, day_part + (card_amt[card_pos] + tol[card_pos] - base_amt), side='right')
+        counts = hi - lo
+        if counts.sum() == 0:
+            continue
+        rep = np.repeat(np.arange(len(card_pos)), counts)
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_card.append(card_pos[rep])
+        pair_cand.append(order[lo[rep] + within])
+
+    if not pair_card:
+        return pd.DataFrame(columns=MATCH_COLUMNS)
+
+    pc = np.concatenate(pair_card)
+    pj = np.concatenate(pair_cand)
+
+    day_diff = cand['day'].to_numpy()[pj] - card_day[pc]
+    amount_diff = cand['amount'].to_numpy()[pj] - card_amt[pc]
+
+    # 거래처 일치도: 코드 또는 정규화 이름 일치 1.0, 정보 없음 0.5, 불일치 0.0 (정수 ID 비교)
+    j_code, card_code = _joint_ids(cand['code'].to_numpy(dtype=object), _trade_code(df_card).to_numpy(dtype=object))
+    j_name, card_name = _joint_ids(cand['name'].to_numpy(dtype=object), _trade_name(df_card))
+    card_code, card_name, j_code, j_name = card_code[pc], card_name[pc], j_code[pj], j_name[pj]
+    same = ((card_code >= 0) & (card_code == j_code)) | ((card_name >= 0) & (card_name == j_name))
+    known = ((card_code >= 0) & (j_code >= 0)) | ((card_name >= 0) & (j_name >= 0))
+    trade_score = np.where(same, 1.0, np.where(known, 0.0, 0.5))
+
+    amount_score = 1.0 - np.abs(amount_diff) / (tol[pc] + 1)
+    date_score = 1.0 - np.abs(day_diff) / (date_window + 1)
+    confidence = 0.4 * amount_score + 0.3 * date_score + 0.3 * trade_score
+
+    pairs = pd.DataFrame({
+        'card_index': df_card.index.to_numpy()[pc],
+        'journal_index': cand['lines'].to_numpy()[pj],
+        'day_diff': day_diff,
+        'amount_diff': amount_diff,
+        'trade_match': same,
+        'split': cand['split'].to_numpy()[pj],
+        'confidence': confidence.round(3),
+    })
+    pairs = pairs[pairs['confidence'] >= min_confidence]
+    # 신뢰도 높은 순, 동점이면 단일 라인 우선
+    pairs = pairs.sort_values(['confidence', 'split'], ascending=[False, True], kind='stable')
+
+    # 탐욕적 1:1 배정
+    used_cards, used_lines, keep = set(), set(), []
+    for pos, (card_idx, lines) in enumerate(zip(pairs['card_index'], pairs['journal_index'])):
+        if card_idx in used_cards or used_lines.intersection(lines):
+            continue
+        used_cards.add(card_idx)
+        used_lines.update(lines)
+        keep.append(pos)
+
+    return pairs.iloc[keep].sort_values('card_index').reset_index(drop=True)
+
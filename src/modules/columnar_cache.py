@@ -0,0 +1,115 @@
+"""
+컬럼 기반 디스크 캐시 모듈
+전처리된 분개장/카드 테이블을 Arrow(Feather, 비압축) 파일로 저장해 두고
+다음 세션에서는 JSON 파싱·전처리 없이 컬럼 단위로 바로 읽습니다.
+(pandas 변환 시 한 번 복사되므로 메모리 절감이 아니라 로드 시간 단축이 목적)
+원본 파일 내용 해시가 바뀌면 캐시는 자동으로 무효화됩니다.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import pandas as pd
+
+from .config import COLUMNAR_CACHE_DIR
+
+# 저장 형식이나 전처리 로직이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 4
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def source_hash(uploaded_file, default_path: Union[str, Path]) -> Optional[str]:
+    """
+    원본 파일 내용의 SHA-1 해시를 반환합니다.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile 객체 (없으면 None)
+        default_path: 업로드가 없을 때 사용할 로컬 파일 경로
+
+    Returns:
+        해시 문자열 (파일이 없으면 None)
+    """
+    digest = hashlib.sha1()
+    if uploaded_file is not None:
+        digest.update(uploaded_file.getvalue())
+        return digest.hexdigest()
+    if not os.path.exists(default_path):
+        return None
+    with open(default_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_id(uploaded_file, default_path: Union[str, Path]) -> str:
+    """
+    원본 위치를 구분하는 짧은 해시 (파일명이 같은 다른 원본의 캐시가 서로 지우지 않도록)
+
+    Args:
+        uploaded_file: Streamlit UploadedFile 객체 (없으면 None)
+        default_path: 업로드가 없을 때 사용할 로컬 파일 경로
+
+    Returns:
+        업로드는 "upload:파일명", 로컬 파일은 절대 경로 기준 SHA-1 앞 8자리
+    """
+    origin = f"upload:{uploaded_file.name}" if uploaded_file is not None else f"path:{Path(default_path).resolve()}"
+    return hashlib.sha1(origin.encode('utf-8')).hexdigest()[:8]
+
+
+def load_or_build(
+    kind: str,
+    uploaded_file,
+    default_path: Union[str, Path],
+    build: Callable[[], pd.DataFrame],
+    cache_dir: Optional[Union[str, Path]] = None
+) -> pd.DataFrame:
+    """
+    캐시 파일이 있으면 읽고, 없거나 손상됐으면 build()로 만든 뒤 저장합니다.
+
+    Args:
+        kind: 테이블 종류 (예: "journal", "card") - 파일명과 무효화 단위
+        uploaded_file: Streamlit UploadedFile 객체 (없으면 None)
+        default_path: 로컬 원본 파일 경로
+        build: 캐시 미스 시 DataFrame을 만드는 함수 (JSON 로드 + 전처리)
+        cache_dir: 캐시 디렉토리 (기본: config.COLUMNAR_CACHE_DIR)
+
+    Returns:
+        pd.DataFrame: 전처리된 테이블
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.feather as feather
+    except ImportError:
+        return build()
+
+    digest = source_hash(uploaded_file, default_path)
+    if digest is None:
+        return build()
+
+    cache_dir = Path(cache_dir) if cache_dir else COLUMNAR_CACHE_DIR
+    stem = Path(uploaded_file.name if uploaded_file is not None else default_path).stem
+    origin = f"{stem}.{kind}.{source_id(uploaded_file, default_path)}"
+    path = cache_dir / f"{origin}.v{CACHE_VERSION}.{digest[:16]}.feather"
+
+    if path.exists():
+        try:
+            return feather.read_table(path).to_pandas()
+        except (OSError, pa.ArrowException):
+            path.unlink(missing_ok=True)
+
+    df = build()
+    if df.empty:
+        return df
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # 같은 원본(경로)의 이전 버전 캐시만 정리
+        for stale in cache_dir.glob(f"{origin}.*.feather"):
+            stale.unlink(missing_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        tmp_path.replace(path)
+    except (OSError, pa.ArrowException):
+        pass
+    return df
@@ -23,6 +23,19 @@ DEFAULT_DATA_FILES = [
     JSONS_DIR / "2025.json"
 ]
 
+# AI 분류 결과 캐시 (거래처+업종 키)
+AI_CACHE_PATH = ROOT_DIR / ".cache" / "ai_categories.json"
+
+# 전처리된 분개장/카드 테이블 캐시 (Arrow/Feather)
+COLUMNAR_CACHE_DIR = ROOT_DIR / ".cache" / "columnar"
+
+# 다년도 거래처 이력 (연도별 건수, Feather)
+HISTORY_CACHE_PATH = ROOT_DIR / ".cache" / "merchant_history.feather"
+
+# 단계별 성능 계측: APP_PROFILE=1 이면 사이드바 '성능' 패널, APP_PROFILE_JSON=<경로> 면 실행마다 JSON 저장 (설정 시 계측도 켜짐)
+PROFILE_JSON_PATH = os.getenv("APP_PROFILE_JSON", "").strip()
+PROFILE_ENABLED = os.getenv("APP_PROFILE", "").strip().lower() in ("1", "true", "yes", "on") or bool(PROFILE_JSON_PATH)
+
 def get_api_key() -> str:
     """Gemini API Key를 반환합니다."""
     return GEMINI_API_KEY
@@ -30,3 +43,16 @@ def get_api_key() -> str:
 def get_default_data_files() -> list:
     """디폴트 데이터 파일 경로 목록을 반환합니다."""
     return DEFAULT_DATA_FILES
+
+def get_ai_cache_path() -> Path:
+    """AI 분류 결과 캐시 파일 경로를 반환합니다."""
+    return AI_CACHE_PATH
+
+def get_history_journal_files(before_year: int) -> dict:
+    """jsons/ 아래 연도 이름 분개장(예: 2023.json) 중 before_year 이전 연도를 {연도: 경로}로 반환합니다."""
+    files = {}
+    for path in JSONS_DIR.glob("[0-9][0-9][0-9][0-9].json"):
+        year = int(path.stem)
+        if year < before_year:
+            files[year] = path
+    return dict(sorted(files.items()))
@@ -2,16 +2,182 @@
 데이터 로더 모듈
 JSON 파일을 로드하고 DataFrame으로 변환합니다.
 """
+import codecs
+import contextlib
 import json
+import logging
 import pandas as pd
 from pathlib import Path
-from typing import List, Union
-import streamlit as st
+from typing import Dict, Iterator, List, Optional, Union
+
+STREAM_CHUNK_SIZE = 1 << 20
+FLUSH_ROWS = 50000
+
+# UI 의존성 없이 오류를 보고 (Streamlit 앱은 빈 DataFrame으로 로드 실패를 판단)
+logger = logging.getLogger(__name__)
+
+# 분개장 컬럼 스키마 (메모리 절감용 dtype 정규화)
+JOURNAL_CATEGORY_COLUMNS = ['cd_acctit', 'nm_acctit', 'nm_trade', 'cd_trade', 'no_acct', 'cd_remark',
+                            'nm_gubun_prn', 'nm_gubun_bungae', 'nm_yuh', 'year']
+JOURNAL_AMOUNT_COLUMNS = ['mn_bungae1', 'mn_bungae2']
+JOURNAL_DROP_COLUMNS = ['dt_insert', 'key_acctit']
+INT32_LIMIT = 2 ** 30  # 차변-대변 차이 계산 시 overflow 여유를 둔 int32 상한
+
+
+class _JsonStream:
+    """파일을 청크 단위로 읽으며 JSON 값을 하나씩 디코딩하는 최소 파서"""
+
+    def __init__(self, fp, chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.utf8 = codecs.getincrementaldecoder('utf-8-sig')()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> None:
+        raw = self.fp.read(self.chunk_size)
+        text = self.utf8.decode(raw, final=not raw) if isinstance(raw, bytes) else raw
+        if not raw:
+            self.eof = True
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+
+    def peek(self) -> str:
+        """공백을 건너뛰고 다음 문자를 반환합니다. (끝이면 '')"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ''
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"JSON 형식 오류: '{char}' 필요 (위치 {self.pos})")
+        self.pos += 1
+
+    def value(self):
+        """다음 JSON 값 하나를 디코딩합니다. (청크 경계에 걸치면 더 읽고 재시도)"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                # 숫자처럼 버퍼 끝에서 잘렸을 수 있는 값은 뒤따르는 문자를 확인한 뒤 확정
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def _open_source(source):
+    if isinstance(source, (str, Path)):
+        return open(source, 'rb')
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return contextlib.nullcontext(source)
+
+
+def iter_json_array(source, array_key: str = 'data', chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    ERP JSON 배열을 원소 단위로 스트리밍합니다.
+    최상위가 배열이거나, 최상위 객체의 array_key 값이 배열인 형식(예: 카드 {"data": [...]})을 지원합니다.
+
+    Args:
+        source: 파일 경로 또는 파일 객체 (업로드 파일 포함)
+        array_key: 최상위가 객체일 때 배열이 들어있는 키
+        chunk_size: 한 번에 읽을 바이트 수
+
+    Returns:
+        Iterator[dict]: 배열 원소
+    """
+    with _open_source(source) as fp:
+        stream = _JsonStream(fp, chunk_size)
+        if stream.peek() == '{':
+            stream.pos += 1
+            while True:
+                if stream.peek() == '}':
+                    raise ValueError(f"배열 데이터('{array_key}')를 찾을 수 없습니다.")
+                key = stream.value()
+                stream.expect(':')
+                if key == array_key and stream.peek() == '[':
+                    break
+                stream.value()
+                if stream.peek() == ',':
+                    stream.pos += 1
+
+        stream.expect('[')
+        if stream.peek() == ']':
+            return
+        while True:
+            yield stream.value()
+            char = stream.peek()
+            if char == ',':
+                stream.pos += 1
+            elif char == ']':
+                return
+            else:
+                raise ValueError(f"JSON 형식 오류: ',' 또는 ']' 필요 (위치 {stream.pos})")
+
+
+def load_json_columns(
+    source,
+    columns: Optional[List[str]] = None,
+    array_key: str = 'data',
+    flush_rows: int = FLUSH_ROWS
+) -> pd.DataFrame:
+    """
+    JSON 배열을 스트리밍하여 필요한 컬럼만 컬럼 버퍼에 담아 DataFrame으로 만듭니다.
+    전체 객체 트리를 메모리에 올리지 않으므로 최대 메모리가 최종 DataFrame 크기에 비례합니다.
+
+    Args:
+        source: 파일 경로 또는 파일 객체
+        columns: 읽을 컬럼 목록 (None이면 전체)
+        array_key: 최상위가 객체일 때 배열이 들어있는 키
+        flush_rows: 컬럼 버퍼를 DataFrame 청크로 변환하는 행 수
+
+    Returns:
+        pd.DataFrame: 로드된 데이터 (어떤 레코드에도 없던 컬럼은 제외)
+    """
+    buffers: Dict[str, list] = {c: [] for c in columns} if columns else {}
+    seen = set()
+    chunks = []
+    rows = 0
+
+    for record in iter_json_array(source, array_key):
+        if columns is None:
+            for key in record:
+                if key not in buffers:
+                    buffers[key] = [None] * rows
+        seen.update(record.keys() & buffers.keys())
+        for key, buffer in buffers.items():
+            buffer.append(record.get(key))
+        rows += 1
+        if rows >= flush_rows:
+            chunks.append(pd.DataFrame(buffers))
+            buffers = {key: [] for key in buffers}
+            rows = 0
+
+    if rows or not chunks:
+        chunks.append(pd.DataFrame(buffers))
+    if len(chunks) > 1:
+        # 청크별로 추론된 dtype이 다를 수 있으므로(전부 None인 청크 등) 병합 후 다시 추론
+        df = pd.concat(chunks, ignore_index=True).infer_objects()
+    else:
+        df = chunks[0]
+    return df[[c for c in df.columns if c in seen]]
 
 
 def load_json_file(file_path: Union[str, Path]) -> pd.DataFrame:
     """
     JSON 파일을 로드하여 DataFrame으로 반환합니다.
+    배열 형식은 스트리밍으로 읽고, 단일 객체는 한 행의 DataFrame으로 반환합니다.
 
     Args:
         file_path: JSON 파일 경로
@@ -20,6 +186,11 @@ def load_json_file(file_path: Union[str, Path]) -> pd.DataFrame:
         pd.DataFrame: 로드된 데이터
     """
     try:
+        try:
+            return load_json_columns(file_path)
+        except ValueError:
+            pass
+
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
@@ -32,7 +203,7 @@ def load_json_file(file_path: Union[str, Path]) -> pd.DataFrame:
 
         return df
     except Exception as e:
-        st.error(f"파일 로드 실패: {file_path} - {e}")
+        logger.error("파일 로드 실패: %s - %s", file_path, e)
         return pd.DataFrame()
 
 
@@ -54,7 +225,7 @@ def load_multiple_json_files(file_paths: List[Union[str, Path]]) -> pd.DataFrame
             if not df.empty:
                 dataframes.append(df)
         else:
-            st.warning(f"파일을 찾을 수 없습니다: {file_path}")
+            logger.warning("파일을 찾을 수 없습니다: %s", file_path)
 
     if dataframes:
         merged_df = pd.concat(dataframes, ignore_index=True)
@@ -74,6 +245,11 @@ def load_uploaded_file(uploaded_file) -> pd.DataFrame:
         pd.DataFrame: 로드된 데이터
     """
     try:
+        try:
+            return load_json_columns(uploaded_file)
+        except ValueError:
+            uploaded_file.seek(0)
+
         data = json.load(uploaded_file)
 
         if isinstance(data, list):
@@ -85,10 +261,80 @@ def load_uploaded_file(uploaded_file) -> pd.DataFrame:
 
         return df
     except Exception as e:
-        st.error(f"업로드 파일 로드 실패: {e}")
+        logger.error("업로드 파일 로드 실패: %s", e)
         return pd.DataFrame()
 
 
+def optimize_journal_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    전처리된 분개장의 dtype을 스키마에 맞게 압축합니다.
+
+    - 계정/거래처/전표 구분 등 반복되는 문자열 → category
+    - 금액(mn_bungae1/2) → int32 (범위를 넘거나 소수가 있으면 int64/float64 유지)
+    - da_date → int32 (yyyymmdd), month → int8
+    - 사용하지 않는 컬럼(dt_insert, key_acctit)과 전부 빈 nm_* 컬럼 제거
+
+    Args:
+        df: 전처리된 분개장 DataFrame
+
+    Returns:
+        pd.DataFrame: dtype이 정규화된 새 DataFrame (입력은 변경하지 않음)
+    """
+    if df.empty:
+        return df
+
+    drop = [c for c in JOURNAL_DROP_COLUMNS if c in df.columns]
+    for col in df.columns:
+        if col.startswith('nm_') and col not in JOURNAL_CATEGORY_COLUMNS and col != 'nm_remark':
+            values = df[col]
+            if values.isna().all() or (values.astype(str).str.strip() == '').all():
+                drop.append(col)
+    out = df.drop(columns=drop)
+
+    for col in JOURNAL_CATEGORY_COLUMNS:
+        if col in out.columns and not isinstance(out[col].dtype, pd.CategoricalDtype):
+            out[col] = out[col].astype('category')
+
+    for col in JOURNAL_AMOUNT_COLUMNS:
+        if col in out.columns:
+            values = pd.to_numeric(out[col], errors='coerce').fillna(0)
+            if (values % 1 == 0).all():
+                fits = values.abs().max() < INT32_LIMIT if len(values) else True
+                out[col] = values.astype('int32' if fits else 'int64')
+
+    if 'da_date' in out.columns:
+        dates = pd.to_numeric(out['da_date'], errors='coerce')
+        if dates.notna().all():
+            out['da_date'] = dates.astype('int32')
+    if 'month' in out.columns:
+        months = pd.to_numeric(out['month'], errors='coerce')
+        if months.notna().all():
+            out['month'] = months.astype('int8')
+
+    return out
+
+
+def compare_memory(before: pd.DataFrame, after: pd.DataFrame) -> dict:
+    """
+    dtype 정규화 전후의 메모리 사용량을 비교합니다.
+
+    Args:
+        before: 정규화 전 DataFrame
+        after: 정규화 후 DataFrame
+
+    Returns:
+        dict: 전/후 get_data_info의 메모리 사용량과 절감률
+    """
+    before_bytes = before.memory_usage(deep=True).sum()
+    after_bytes = after.memory_usage(deep=True).sum()
+    saved = (1 - after_bytes / before_bytes) * 100 if before_bytes else 0.0
+    return {
+        "변환 전": get_data_info(before)["메모리 사용량"],
+        "변환 후": get_data_info(after)["메모리 사용량"],
+        "절감률": f"{saved:.1f}%"
+    }
+
+
 def get_data_info(df: pd.DataFrame) -> dict:
     """
     DataFrame의 기본 정보를 반환합니다.
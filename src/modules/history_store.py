@@ -0,0 +1,60 @@
+"""
+거래처 이력 저장소 모듈
+연도별 분개장에서 집계한 거래처 이력(MerchantHistory)을 Feather 파일 하나로 보관하고,
+원본 파일 해시가 바뀌었거나 새로 생긴 연도만 다시 읽어 병합합니다.
+(5년치 이력도 분개장 재파싱 없이 파일 하나를 메모리 맵으로 읽음)
+"""
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import pandas as pd
+
+from src.analysis.history import DEFAULT_DECAY, MerchantHistory
+from .columnar_cache import source_hash
+from .config import HISTORY_CACHE_PATH
+
+
+def load_merchant_history(
+    year_files: Dict[int, Union[str, Path]],
+    load_journal: Callable[[Union[str, Path]], pd.DataFrame],
+    path: Optional[Union[str, Path]] = None,
+    decay: float = DEFAULT_DECAY
+) -> MerchantHistory:
+    """
+    저장된 이력을 읽고 연도 파일과 맞춰 갱신합니다.
+
+    Args:
+        year_files: {연도: 분개장 파일 경로}
+        load_journal: 파일 경로 → 전처리된 분개장 DataFrame (바뀐 연도만 호출)
+        path: 이력 파일 경로 (기본: config.HISTORY_CACHE_PATH)
+        decay: 연간 감쇠 가중치
+
+    Returns:
+        MerchantHistory: year_files의 연도만 담은 이력
+    """
+    path = Path(path) if path else HISTORY_CACHE_PATH
+    history = MerchantHistory(decay=decay)
+    if path.exists():
+        try:
+            stored = MerchantHistory.from_feather(path)
+            history = MerchantHistory(counts=stored.counts, decay=decay, sources=stored.sources)
+        except Exception:
+            pass  # 손상된 이력은 다시 집계
+
+    changed = False
+    removed = [year for year in history.sources if year not in year_files]
+    if removed:
+        history, changed = history.drop_years(removed), True
+    for year, file_path in sorted(year_files.items()):
+        digest = source_hash(None, file_path)
+        if digest is None or history.sources.get(year) == digest:
+            continue
+        history, changed = history.add_year(load_journal(file_path), year, source=digest), True
+
+    if changed:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            history.to_feather(path)
+        except (ImportError, OSError):
+            pass  # 저장 실패 시 이번 세션만 메모리 이력 사용
+    return history
@@ -0,0 +1,193 @@
+"""
+거래처 정규화/ID 사전 모듈
+'（주）아트박스' / '(주)아트박스' / '아트박스 ', '농협카드(6215)' / '농협카드' 처럼
+표기만 다른 거래처명을 같은 키로 모으고, 사업자번호(bisocial_no)·거래처코드(cd_trade)까지 묶어
+정수 거래처 ID를 부여합니다. 분개장/카드/이력 간 거래처 조인은 문자열 대신 이 ID로 합니다.
+
+정규화 순서: NFKC(전각 괄호·㈜ 등) → 공백 제거 → 법인 형태 제거 → 카드 끝자리 접미사 제거 → casefold
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 이름 앞뒤/중간 어디에 있어도 떼어내는 법인 형태 (긴 것부터)
+CORPORATE_FORMS = (
+    '농업회사법인', '영농조합법인', '어업회사법인', '영어조합법인', '사회복지법인', '유한책임회사',
+    '주식회사', '유한회사', '합자회사', '합명회사', '재단법인', '사단법인', '의료법인', '학교법인', '협동조합',
+)
+CORPORATE_ABBREVIATIONS = ('주', '유', '재', '사', '의', '합', '학', '복', '농', '영')
+CARD_SUFFIX = re.compile(r'\(\d{3,4}\)$')  # 농협카드(6215)
+
+_CORPORATE = re.compile(
+    '|'.join([re.escape(f) for f in CORPORATE_FORMS]
+             + [r'\((?:' + '|'.join(CORPORATE_ABBREVIATIONS) + r'|' + '|'.join(CORPORATE_FORMS) + r')\)'])
+)
+_SPACE = re.compile(r'\s+')
+_NON_ALNUM = re.compile(r'[^0-9A-Za-z]')
+
+
+@lru_cache(maxsize=1 << 16)
+def normalize_merchant(name) -> str:
+    """
+    거래처명 정규화 키 (메모이즈)
+
+    Args:
+        name: 원본 거래처명 (결측이면 빈 문자열)
+
+    Returns:
+        정규화 키 (법인 형태만 있는 이름은 공백 제거한 원래 이름)
+    """
+    if name is None or (isinstance(name, float) and np.isnan(name)):
+        return ''
+    text = _SPACE.sub('', unicodedata.normalize('NFKC', str(name)))
+    key = CARD_SUFFIX.sub('', _CORPORATE.sub('', text))
+    return (key or text).casefold()
+
+
+def normalize_merchants(values) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    거래처명 배열의 정규화 키 정수 코드 (고유값에만 정규화 적용)
+
+    Args:
+        values: 거래처명 (Series / 배열, category면 카테고리 코드 사용)
+
+    Returns:
+        (행별 코드 - 빈 이름은 -1, 코드별 정규화 키 배열)
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(np.asarray(values, dtype=object))
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), np.asarray(series.cat.categories, dtype=object)
+    else:
+        codes, uniques = pd.factorize(series)
+        uniques = np.asarray(uniques, dtype=object)
+    keys = np.array([normalize_merchant(u) for u in uniques], dtype=object)
+    key_codes, key_uniques = pd.factorize(keys)
+    key_codes = np.append(key_codes, -1)  # 결측(-1) 위치
+    row_codes = key_codes[np.where(codes >= 0, codes, len(keys))]
+    key_uniques = np.asarray(key_uniques, dtype=object)
+    blank = np.flatnonzero(key_uniques == '')
+    if len(blank):
+        row_codes = np.where(row_codes == blank[0], -1, row_codes)
+    return row_codes, key_uniques
+
+
+def _identifier(df: pd.DataFrame, col: str, strip_zeros: bool) -> np.ndarray:
+    """사업자번호/거래처코드 문자열 (숫자 외 문자 제거, 코드는 앞자리 0 제거, 없으면 빈 문자열)"""
+    if col not in df.columns:
+        return np.full(len(df), '', dtype=object)
+    text = df[col].astype(object).fillna('').astype(str).str.replace(_NON_ALNUM, '', regex=True)
+    if strip_zeros:
+        text = text.str.lstrip('0')
+    return text.to_numpy(dtype=object)
+
+
+class MerchantDictionary:
+    """
+    정수 거래처 ID 사전
+    같은 사업자번호, 같은 거래처코드, 같은 정규화 이름 중 하나라도 이미 알려진 ID가 있으면 그 ID를 쓰고
+    (우선순위: 사업자번호 > 거래처코드 > 이름), 없으면 새 ID를 부여합니다.
+
+    Attributes:
+        labels: ID별 대표 거래처명 (처음 본 원본 이름)
+    """
+
+    def __init__(self):
+        self.labels: List[str] = []
+        self._names: Dict[str, int] = {}
+        self._biz: Dict[str, int] = {}
+        self._codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def copy(self) -> "MerchantDictionary":
+        other = MerchantDictionary()
+        other.labels = list(self.labels)
+        other._names, other._biz, other._codes = dict(self._names), dict(self._biz), dict(self._codes)
+        return other
+
+    def _resolve(self, name: str, code: str, biz: str, label: str, learn: bool) -> int:
+        found = self._biz.get(biz) if biz else None
+        if found is None and code:
+            found = self._codes.get(code)
+        if found is None and name:
+            found = self._names.get(name)
+        if not learn:
+            return -1 if found is None else found
+        if found is None:
+            if not (name or code or biz):
+                return -1
+            found = len(self.labels)
+            self.labels.append(label)
+        # 아직 다른 ID에 묶이지 않은 키만 연결 (먼저 본 연결 우선)
+        if biz:
+            self._biz.setdefault(biz, found)
+        if code:
+            self._codes.setdefault(code, found)
+        if name:
+            self._names.setdefault(name, found)
+        return found
+
+    def _ids(self, df: pd.DataFrame, learn: bool) -> np.ndarray:
+        if df is None or len(df) == 0:
+            return np.array([], dtype='int64')
+        names = df['nm_trade'] if 'nm_trade' in df.columns else pd.Series('', index=df.index)
+        name_codes, keys = normalize_merchants(names)
+        codes = _identifier(df, 'cd_trade', strip_zeros=True)
+        biz = _identifier(df, 'bisocial_no', strip_zeros=False)
+        # 고유 (이름, 코드, 사업자번호) 조합에만 사전 조회 (행 수와 무관하게 거래처 수만큼)
+        code_ids, code_uniques = pd.factorize(codes)
+        biz_ids, biz_uniques = pd.factorize(biz)
+        triple = (name_codes.astype('int64') + 1) * (len(code_uniques) + 1) * (len(biz_uniques) + 1) \
+            + code_ids.astype('int64') * (len(biz_uniques) + 1) + biz_ids
+        uniques, first, inverse = np.unique(triple, return_index=True, return_inverse=True)
+        raw = names.astype(object).to_numpy()
+        out = np.empty(len(uniques), dtype='int64')
+        for i, pos in enumerate(first):
+            name = keys[name_codes[pos]] if name_codes[pos] >= 0 else ''
+            label = '' if pd.isna(raw[pos]) else str(raw[pos]).strip()
+            out[i] = self._resolve(name, code_uniques[code_ids[pos]], biz_uniques[biz_ids[pos]], label, learn)
+        return out[inverse.ravel()]
+
+    def register(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        행별 거래처 ID를 부여합니다. (처음 보는 거래처/코드/사업자번호는 사전에 추가)
+
+        Args:
+            df: nm_trade (선택: cd_trade, bisocial_no) 컬럼을 가진 DataFrame
+
+        Returns:
+            int64 ID 배열 (이름·코드·사업자번호가 모두 없으면 -1)
+        """
+        return self._ids(df, learn=True)
+
+    def lookup(self, df: pd.DataFrame) -> np.ndarray:
+        """사전을 바꾸지 않고 행별 거래처 ID를 찾습니다. (모르는 거래처는 -1)"""
+        return self._ids(df, learn=False)
+
+    def id_of(self, name, code: str = '', biz: str = '') -> int:
+        """거래처 하나의 ID (모르면 -1)"""
+        code = _NON_ALNUM.sub('', str(code or '')).lstrip('0')
+        biz = _NON_ALNUM.sub('', str(biz or ''))
+        return self._resolve(normalize_merchant(name), code, biz, '', learn=False)
+
+
+def build_merchant_dictionary(*frames: Optional[pd.DataFrame]) -> MerchantDictionary:
+    """
+    여러 분개장/카드 테이블을 차례로 등록한 거래처 ID 사전을 만듭니다.
+
+    Args:
+        frames: nm_trade / cd_trade / bisocial_no 컬럼을 가진 DataFrame (None·빈 표는 건너뜀)
+
+    Returns:
+        MerchantDictionary
+    """
+    dictionary = MerchantDictionary()
+    for frame in frames:
+        if frame is not None and len(frame):
+            dictionary.register(frame)
+    return dictionary
@@ -0,0 +1,103 @@
+"""
+거래처명 검색 인덱스 모듈
+고유 거래처명에 대한 문자 n-gram(기본 bigram) 역색인으로
+키워드/유사 거래처 조회 시 후보 거래처만 검사합니다.
+한글은 음절 단위 문자이므로 음절 bigram이 그대로 색인됩니다.
+"""
+import re
+from typing import Dict, Iterable, List, Set, Union
+
+REGEX_META = set('.^$*+?{}[]\\|()')
+
+
+def _grams(text: str, n: int) -> Set[str]:
+    """길이 1..n 의 모든 문자 n-gram 집합 (짧은 검색어도 색인으로 처리)"""
+    grams = set()
+    for size in range(1, n + 1):
+        grams.update(text[i:i + size] for i in range(len(text) - size + 1))
+    return grams
+
+
+def literal_alternatives(pattern: str):
+    """
+    'A|B|C' 처럼 리터럴의 OR로만 구성된 패턴이면 리터럴 리스트를, 아니면 None을 반환합니다.
+
+    Args:
+        pattern: 정규식 문자열
+
+    Returns:
+        리터럴 리스트 또는 None
+    """
+    parts = pattern.split('|')
+    if any(REGEX_META.intersection(part) for part in parts):
+        return None
+    return parts
+
+
+class MerchantNgramIndex:
+    """
+    고유 거래처명에 대한 n-gram 역색인입니다.
+    검색 결과는 입력 순서(분개장 첫 등장 순서)의 위치 리스트로 반환합니다.
+    """
+
+    def __init__(self, names: Iterable[str], n: int = 2):
+        self.n = n
+        self.names: List[str] = [str(name) for name in names]
+        self.lowered: List[str] = [name.lower() for name in self.names]
+        self.postings: Dict[str, Set[int]] = {}
+        for pos, name in enumerate(self.lowered):
+            for gram in _grams(name, n):
+                self.postings.setdefault(gram, set()).add(pos)
+
+    def search_literal(self, term: str, case_sensitive: bool = False) -> List[int]:
+        """
+        검색어를 부분 문자열로 포함하는 거래처 위치를 반환합니다.
+
+        Args:
+            term: 검색어 (정규식 아님)
+            case_sensitive: 대소문자 구분 여부
+
+        Returns:
+            거래처 위치 리스트 (오름차순)
+        """
+        if term == "":
+            return list(range(len(self.names)))
+
+        key = term.lower()
+        if len(key) <= self.n:
+            candidates = self.postings.get(key, set())
+        else:
+            grams = {key[i:i + self.n] for i in range(len(key) - self.n + 1)}
+            posting_lists = sorted((self.postings.get(g, set()) for g in grams), key=len)
+            candidates = set.intersection(*posting_lists) if posting_lists[0] else set()
+
+        # bigram 교집합은 후보일 뿐이므로 실제 포함 여부를 확인
+        haystack = self.names if case_sensitive else self.lowered
+        needle = term if case_sensitive else key
+        return sorted(pos for pos in candidates if needle in haystack[pos])
+
+    def search(self, pattern: Union[str, "re.Pattern"]) -> List[int]:
+        """
+        정규식 패턴을 포함하는 거래처 위치를 반환합니다.
+        리터럴 OR 패턴('카페|커피')은 색인으로, 그 외 정규식은 고유 거래처명 전체를 검사합니다.
+
+        Args:
+            pattern: 정규식 문자열 또는 컴파일된 패턴 (re.IGNORECASE 지원)
+
+        Returns:
+            거래처 위치 리스트 (오름차순)
+        """
+        if isinstance(pattern, re.Pattern):
+            source, case_sensitive = pattern.pattern, not (pattern.flags & re.IGNORECASE)
+        else:
+            source, case_sensitive = pattern, True
+
+        literals = literal_alternatives(source)
+        if literals is None:
+            regex = re.compile(source, 0 if case_sensitive else re.IGNORECASE)
+            return [pos for pos, name in enumerate(self.names) if regex.search(name)]
+
+        found: Set[int] = set()
+        for literal in literals:
+            found.update(self.search_literal(literal, case_sensitive))
+        return sorted(found)
@@ -0,0 +1,172 @@
+"""
+단계별 성능 계측 모듈
+파이프라인 단계(로드, 전처리, 카드 누락, 탭 렌더링 ...)마다 소요 시간, 처리 행 수, 메모리(RSS) 증감을 기록합니다.
+꺼져 있으면(기본, APP_PROFILE 미설정) 각 단계는 분기 하나만 거치고 그대로 실행됩니다.
+
+사용 예:
+    profiler = Profiler()
+    with profiler.stage("load_card") as record:
+        df = load(...)
+        record.rows = len(df)
+    df = profiler.timed("preprocess_journal", lambda: preprocess(raw), rows=len)
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import pandas as pd
+
+from .config import PROFILE_ENABLED
+
+
+@dataclass
+class StageRecord:
+    """
+    단계 하나의 계측 결과
+
+    Attributes:
+        stage: 단계 이름
+        ms: 소요 시간 (ms)
+        rows: 처리 행 수 (모르면 None)
+        mem_mb: 단계 전후 RSS 증감 (MB, 측정 불가 시 None)
+        depth: 중첩 깊이 (0 = 최상위 단계)
+    """
+    stage: str
+    ms: float = 0.0
+    rows: Optional[int] = None
+    mem_mb: Optional[float] = None
+    depth: int = 0
+
+
+_rss_reader: Optional[Callable[[], Optional[float]]] = None
+
+
+def _make_rss_reader() -> Callable[[], Optional[float]]:
+    """현재 프로세스 RSS(MB) 읽기 함수 (psutil → /proc/self/statm → 측정 불가 순)"""
+    try:
+        import psutil
+        process = psutil.Process()
+        return lambda: process.memory_info().rss / (1 << 20)
+    except ImportError:
+        pass
+    statm = Path("/proc/self/statm")
+    if statm.exists():
+        page = os.sysconf("SC_PAGE_SIZE")
+        return lambda: int(statm.read_text().split()[1]) * page / (1 << 20)
+    return lambda: None
+
+
+def current_rss_mb() -> Optional[float]:
+    """현재 프로세스 RSS (MB, 측정 불가 시 None)"""
+    global _rss_reader
+    if _rss_reader is None:
+        _rss_reader = _make_rss_reader()
+    return _rss_reader()
+
+
+class Profiler:
+    """
+    단계별 계측기 (실행 한 번에 하나)
+
+    Attributes:
+        enabled: 계측 여부 (기본: config.PROFILE_ENABLED)
+        records: 시작 순서대로 쌓인 단계 기록 (바깥 단계가 안쪽 단계보다 앞, 소요 시간은 끝날 때 채움)
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = PROFILE_ENABLED if enabled is None else enabled
+        self.records: List[StageRecord] = []
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None):
+        """
+        with 블록 하나를 단계로 계측합니다. (꺼져 있으면 기록하지 않는 빈 기록을 넘김)
+
+        Args:
+            name: 단계 이름
+            rows: 처리 행 수 (블록 안에서 record.rows로 정해도 됨)
+        """
+        if not self.enabled:
+            yield StageRecord(name, rows=rows)
+            return
+        record = StageRecord(name, rows=rows, depth=self._depth)
+        self.records.append(record)
+        self._depth += 1
+        rss_before = current_rss_mb()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.ms = round((time.perf_counter() - started) * 1000, 2)
+            rss_after = current_rss_mb()
+            if rss_before is not None and rss_after is not None:
+                record.mem_mb = round(rss_after - rss_before, 2)
+            self._depth -= 1
+
+    def timed(self, name: str, fn: Callable[[], object], rows: Union[int, Callable[[object], int], None] = None):
+        """
+        fn()을 단계로 계측하고 결과를 그대로 반환합니다.
+
+        Args:
+            name: 단계 이름
+            fn: 실행할 함수
+            rows: 처리 행 수, 또는 결과 → 행 수 함수 (예: len)
+        """
+        if not self.enabled:
+            return fn()
+        with self.stage(name, None if callable(rows) else rows) as record:
+            result = fn()
+            if callable(rows):
+                record.rows = rows(result)
+        return result
+
+    def totals(self) -> Dict[str, float]:
+        """단계 이름별 소요 시간 합계 (ms, 같은 이름이 여러 번이면 합산)"""
+        out: Dict[str, float] = {}
+        for record in self.records:
+            out[record.stage] = out.get(record.stage, 0.0) + record.ms
+        return out
+
+    @property
+    def total_ms(self) -> float:
+        """최상위 단계 소요 시간 합계"""
+        return round(sum(r.ms for r in self.records if r.depth == 0), 2)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        실행 순서대로 단계 표 (중첩 단계는 이름 들여쓰기)
+
+        Returns:
+            DataFrame (단계, 소요(ms), 비율(%), 행 수, 처리량(행/초), 메모리 증감(MB))
+        """
+        columns = ["단계", "소요(ms)", "비율(%)", "행 수", "처리량(행/초)", "메모리 증감(MB)"]
+        if not self.records:
+            return pd.DataFrame(columns=columns)
+        records = self.records
+        total = self.total_ms or 1.0
+        return pd.DataFrame({
+            "단계": ["  " * r.depth + r.stage for r in records],
+            "소요(ms)": [r.ms for r in records],
+            "비율(%)": [round(r.ms / total * 100, 1) for r in records],
+            "행 수": pd.array([r.rows for r in records], dtype="Int64"),
+            "처리량(행/초)": pd.array([round(r.rows / r.ms * 1000) if r.rows and r.ms > 0 else None for r in records],
+                                 dtype="Int64"),
+            "메모리 증감(MB)": [r.mem_mb for r in records],
+        }, columns=columns)
+
+    def to_dict(self) -> Dict[str, object]:
+        """JSON 내보내기용 {total_ms, stages: [...]} (시작 순서)"""
+        return {"total_ms": self.total_ms, "stages": [asdict(r) for r in self.records]}
+
+    def to_json(self, path: Optional[Union[str, Path]] = None) -> str:
+        """JSON 문자열을 반환하고, 경로가 있으면 파일로도 저장합니다."""
+        text = json.dumps(self.to_dict(), ensure_ascii=False, indent=1)
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(text + "\n", encoding="utf-8")
+        return text
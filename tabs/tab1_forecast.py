@@ -1,31 +1,15 @@
+import pandas as pd
 import streamlit as st
 
-def render(revenue_ytd, expense_ytd, rev_24_total, card_gap_amt):
+def render(forecast, cube=None, seasonal=None, montecarlo=None, balances=None, statement=None):
+    # forecast: ForecastResult, cube: MonthlyCube, seasonal: SeasonalForecast, montecarlo: MonteCarloResult,
+    # balances: TrialBalance.roll_forward 결과, statement: IncomeStatement (src.analysis, 계산은 app.py에서 수행/캐시)
     st.subheader("2025년 연간 손익 추정 (Landing Forecast)")
     
-    months_passed = 9
-    rev_proj_avg = revenue_ytd / months_passed * 12
-    
-    if rev_24_total > 0:
-        rev_24_ytd_approx = rev_24_total / 12 * months_passed
-        growth_rate = revenue_ytd / rev_24_ytd_approx
-        rev_proj_trend = rev_24_total * growth_rate
-    else:
-        rev_proj_trend = rev_proj_avg
-
-    final_rev_baseline = max(rev_proj_avg, rev_proj_trend)
-    method_used = "평균법" if final_rev_baseline == rev_proj_avg else "추세법"
-    
-    # 비용 분석 (3단 분리)
-    exp_booked = expense_ytd
-    exp_missing = card_gap_amt
-    
-    # 미래 비용 예측 (현재 월평균 + 누락분 반영된 월평균)
-    monthly_real_burn = (expense_ytd + card_gap_amt) / months_passed
-    exp_future = monthly_real_burn * (12 - months_passed)
-    
-    final_exp_projected = exp_booked + exp_missing + exp_future
-    final_profit = final_rev_baseline - final_exp_projected
+    final_rev_baseline, method_used = forecast.final_rev_baseline, forecast.method_used
+    exp_booked, exp_missing, exp_future = forecast.exp_booked, forecast.exp_missing, forecast.exp_future
+    final_exp_projected, final_profit = forecast.final_exp_projected, forecast.final_profit
+    months_passed = forecast.months_passed
     
     # UI 출력
     col1, col2, col3 = st.columns(3)
@@ -40,20 +24,75 @@ def render(revenue_ytd, expense_ytd, rev_24_total, card_gap_amt):
     c1, c2 = st.columns(2)
     with c1:
         st.info("📊 **매출 예측: 보수적 접근**")
-        st.markdown(f"- 1~9월 실적 기반 연환산(**평균법**)과 전년 대비 성장률(**추세법**) 중 더 높은 **{final_rev_baseline:,.0f}원**을 채택했습니다.")
+        st.markdown(f"- 1~{months_passed}월 실적 기반 연환산(**평균법**)과 전년 대비 성장률(**추세법**) 중 더 높은 **{final_rev_baseline:,.0f}원**을 채택했습니다.")
     with c2:
         st.warning("💸 **비용 구조: 숨겨진 비용 발굴**")
         st.markdown(f"""
         - **기록됨(Booked):** {exp_booked:,.0f} 원
         - **누락됨(Missing):** {exp_missing:,.0f} 원 🚨 (카드 미처리)
-        - **미래(Future):** {exp_future:,.0f} 원 (남은 3개월 예상)
+        - **미래(Future):** {exp_future:,.0f} 원 (남은 {12 - months_passed}개월 예상)
         """)
     
     st.success(f"💡 **최종 진단:** 장부상 이익은 과대평가 상태입니다. 누락분과 미래 비용을 모두 반영한 **{final_profit:,.0f}원**이 실제 예상 이익입니다.")
 
-    # 계산된 값 반환 (Tab 3 등에서 쓰기 위해)
-    return {
-        "final_rev_baseline": final_rev_baseline,
-        "proj_expense_simple": expense_ytd / months_passed * 12, # 단순 연환산 (누락 미반영)
-        "months_passed": months_passed
-    }
\ No newline at end of file
+    # 월별 추이 (큐브에서 바로 읽음)
+    if cube is not None and not cube.empty:
+        st.markdown("### 📅 월별 매출/비용 추이")
+        monthly = pd.DataFrame({
+            "매출": cube.revenue_by_month(),
+            "비용": cube.expense_by_month(),
+        }, index=[f"{m}월" for m in range(1, 13)])
+        last_month = cube.last_date // 100 % 100 or 12
+        st.bar_chart(monthly.iloc[:last_month])
+        st.caption(f"마감 기준: {months_passed}개월 (마지막 전표일 {cube.last_date})")
+
+
+    # 계절성 반영 예측 (전년도 분개장이 있을 때)
+    if seasonal is not None:
+        st.divider()
+        st.markdown("### 🌦️ 계절성 반영 예측 (전년 월별 패턴 기준)")
+        s_rev, s_exp, s_profit = seasonal.totals()
+        s1, s2, s3 = st.columns(3)
+        s1.metric("예상 연매출", f"{s_rev:,.0f} 원", f"{s_rev - final_rev_baseline:+,.0f} 원 vs 단순추정")
+        s2.metric("예상 연간 비용 (누락 제외)", f"{s_exp:,.0f} 원")
+        s3.metric("예상 영업이익 (누락 반영)", f"{s_profit - exp_missing:,.0f} 원")
+        st.caption("매출은 전년 월별 모양, 고정비는 최근 마감월 복사, 변동비는 전년 매출 대비 비율로 남은 달을 채웁니다.")
+        with st.expander("계정별 예측 상세"):
+            st.dataframe(seasonal.to_frame().round(0), use_container_width=True, hide_index=True)
+
+    # 몬테카를로 시뮬레이션 (점 추정 대신 분포)
+    if montecarlo is not None and st.toggle("🎲 시뮬레이션 모드 (P10/P50/P90)"):
+        st.divider()
+        st.markdown("### 🎲 몬테카를로 연간 추정")
+        bands = montecarlo.percentiles()
+        m1, m2, m3 = st.columns(3)
+        for col, label in zip((m1, m2, m3), bands.columns):
+            col.metric(f"예상 세액 {label}", f"{bands.loc['예상 세액', label]:,.0f} 원")
+        st.dataframe(bands.style.format("{:,.0f}"), use_container_width=True)
+        st.caption(
+            f"남은 {12 - montecarlo.months_passed}개월의 계정별 월 순액을 실적 {montecarlo.pool_months}개월에서 "
+            f"복원추출한 {len(montecarlo):,}개 경로 기준입니다. (카드 누락분은 연환산 반영)"
+        )
+
+    # 재무상태 (전년도 시산표 기초 잔액 + 당해 증감)
+    if balances is not None and not balances.empty:
+        st.divider()
+        st.markdown("### 🏦 재무상태 (기초 잔액 + 당해 증감)")
+        cash = balances[balances["분류"] == "당좌자산"]
+        by_kind = balances.groupby("구분", sort=False)["현재잔액"].sum()
+        b1, b2, b3 = st.columns(3)
+        b1.metric("당좌자산 잔액", f"{cash['현재잔액'].sum():,.0f} 원", f"{cash['당해증감'].sum():+,.0f} 원 (당해)")
+        b2.metric("자산 합계", f"{by_kind.get('자산', 0):,.0f} 원")
+        b3.metric("부채 합계", f"{-by_kind.get('부채', 0):,.0f} 원")
+        with st.expander("계정별 잔액"):
+            st.dataframe(balances, use_container_width=True, hide_index=True)
+
+    # 손익계산서 전기 대비 (구간 합계만)
+    if statement is not None and not statement.empty:
+        with st.expander("📑 손익계산서 전기 대비"):
+            yoy = statement.compare()
+            yoy = yoy[yoy["구간합계"]].drop(columns=["cd_gr", "cd_acctit", "구간합계"])
+            st.dataframe(
+                yoy.style.format({"당기": "{:,.0f}", "전기": "{:,.0f}", "증감": "{:+,.0f}", "증감률": "{:+.1%}"}, na_rep="-"),
+                use_container_width=True, hide_index=True
+            )
@@ -1,13 +1,22 @@
 import streamlit as st
-import utils  # 같은 폴더에 있는 utils.py 임포트
+from src.modules.ai_batch import categorize_in_batches
+from src.modules.config import get_ai_cache_path
 
-def render(card_gap_amt, missing_df, api_key):
+def render(card_gap_amt, missing_df, api_key, df_history=None, matches_df=None):
     st.subheader("신용카드 미처리 내역 (Gap Analysis)")
     
     c1, c2 = st.columns([3, 1])
     
     with c1:
         st.error(f"🚨 **총 누락 의심 금액 (확정전표 기준): {card_gap_amt:,.0f} 원**")
+
+        # 허용 범위 매칭 근거 (누락 0원이어도 어떤 전표와 짝지었는지 검토할 수 있도록)
+        if matches_df is not None and not matches_df.empty:
+            split_count = int(matches_df['부가세 분할'].sum())
+            st.caption(f"장부와 매칭된 카드 {len(matches_df):,}건 · 부가세 분할 전표 매칭 {split_count:,}건 · "
+                       f"평균 신뢰도 {matches_df['신뢰도'].mean():.0%}")
+            with st.expander("매칭 내역 검토 (신뢰도 낮은 순)"):
+                st.dataframe(matches_df.sort_values('신뢰도', kind='stable').head(500), width=1000)
         
         if not missing_df.empty:
             # 필터링 기능
@@ -30,13 +39,17 @@ def render(card_gap_amt, missing_df, api_key):
         st.info("전년도 이력과 업종 정보를 기반으로 계정과목을 추천합니다.")
         if st.button("미분류 내역 AI 분석"):
             if api_key:
-                cols_to_ai = ['거래처', '업종(업태/종목)', '금액', '전표상태', '전년도이력']
-                # 상위 10개 샘플 분석
-                sample_data = missing_df[cols_to_ai].head(10).to_dict(orient='records') if not missing_df.empty else "데이터 없음"
-                
-                with st.spinner("Gemini 2.0 Flash 분석 중..."):
-                    result = utils.categorize_expenses_with_ai(api_key, str(sample_data))
+                if missing_df.empty:
+                    st.write("데이터 없음")
+                else:
+                    # 전체 미분류 내역을 거래처 단위로 배치 분석
+                    # (전년도 패턴으로 확정 가능한 거래처와 이미 분류한 거래처는 AI 호출 생략)
+                    with st.spinner("Gemini 2.0 Flash 배치 분석 중..."):
+                        result_df, stats = categorize_in_batches(
+                            api_key, missing_df, cache_path=get_ai_cache_path(), df_journal=df_history
+                        )
                     st.success("분석 완료!")
-                    st.code(result, language='json')
+                    st.caption(" · ".join(f"{k} {v}" for k, v in stats.items()))
+                    st.dataframe(result_df, width=1000)
             else:
                 st.error("API 키가 설정되지 않았습니다.")
\ No newline at end of file
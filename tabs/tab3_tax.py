@@ -1,46 +1,22 @@
 import streamlit as st
-import plotly.graph_objects as go
-import utils
 
-def render(forecast_data, card_gap_amt, other_income, deduction, disallowed):
+from src import analysis
+
+def render(tax_results, sweep=None):
+    # tax_results: {시나리오: src.analysis.TaxResult} (계산은 app.py에서 수행/캐시)
+    # sweep: src.analysis.TaxSweep (카드 누락 반영률 × 연말 추가 지출 민감도)
     st.subheader("📝 2025년 귀속 종합소득세 시뮬레이션")
     
-    # Tab 1에서 계산된 값 가져오기
-    final_rev_baseline = forecast_data['final_rev_baseline']
-    proj_expense_simple = forecast_data['proj_expense_simple']
-    months_passed = forecast_data['months_passed']
-    
     scenario = st.select_slider(
         "시나리오 선택",
-        options=["S1(극단적 보수)", "S2(보수적)", "S3(합리적 보수)", "S4(전략적)"],
+        options=list(tax_results),
         value="S3(합리적 보수)"
     )
     
-    # 시나리오 로직
-    if scenario == "S1(극단적 보수)":
-        final_rev = final_rev_baseline
-        final_exp = proj_expense_simple
-        desc = "현재 장부상 비용만 인정 (누락분 0원)"
-    elif scenario == "S2(보수적)":
-        final_rev = final_rev_baseline
-        final_exp = proj_expense_simple + (card_gap_amt * 0.5)
-        desc = "카드 누락분의 50%만 반영"
-    elif scenario == "S3(합리적 보수)":
-        final_rev = final_rev_baseline
-        annual_card_gap = card_gap_amt / months_passed * 12
-        final_exp = proj_expense_simple + annual_card_gap
-        desc = "카드 누락분과 미래 비용을 모두 반영한 현실적 수치 ⭐"
-    else: # S4
-        annual_card_gap = card_gap_amt / months_passed * 12
-        final_rev = final_rev_baseline * 0.95 
-        final_exp = proj_expense_simple + annual_card_gap + 4000000
-        desc = "매출 감소 + 연말 전략적 지출(+400만)"
-
-    # 세금 계산
-    tax_base = final_rev + other_income - final_exp - deduction + disallowed
-    if tax_base < 0: tax_base = 0
-    calc_tax = utils.calculate_tax(tax_base)
-    total_tax = calc_tax * 1.1
+    result = tax_results[scenario]
+    final_rev, final_exp, desc = result.scenario.final_rev, result.scenario.final_exp, result.scenario.desc
+    other_income, deduction, disallowed = result.other_income, result.deduction, result.disallowed
+    tax_base, total_tax = result.tax_base, result.total_tax
     
     # 결과 표시
     c1, c2 = st.columns(2)
@@ -57,6 +33,7 @@ def render(forecast_data, card_gap_amt, other_income, deduction, disallowed):
             """)
 
     with c2:
+        import plotly.graph_objects as go  # 차트 렌더링 시점에만 로드
         fig = go.Figure(go.Waterfall(
             name = "Tax", orientation = "v",
             measure = ["relative", "relative", "relative", "relative", "total", "total"],
@@ -67,4 +44,24 @@ def render(forecast_data, card_gap_amt, other_income, deduction, disallowed):
             increasing = {"marker":{"color":"red"}},
             totals = {"marker":{"color":"blue"}}
         ))
-        st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        st.plotly_chart(fig, use_container_width=True)
+
+    # 연말 추가 지출에 따른 세액 곡선 (구간표 벡터 계산이라 시나리오 변경 시 즉시 갱신)
+    st.divider()
+    st.subheader("📉 연말 추가 지출 vs 예상 세액")
+    drop = result.bracket_drop
+    if drop is not None and drop.spend_needed > 0:
+        st.metric(
+            f"{drop.spend_needed:,.0f} 원 더 지출하면 세율 구간 하락",
+            f"{drop.current_rate:.0%} → {drop.lower_rate:.0%}",
+            delta=f"-{drop.tax_saved:,.0f} 원 (세액)", delta_color="inverse"
+        )
+    else:
+        st.caption("현재 최저 세율 구간입니다.")
+    curve = analysis.tax_curve(tax_base).to_frame()
+    st.line_chart(curve.set_index('추가 지출')[['예상 세액']])
+
+    if sweep is not None and len(sweep):
+        with st.expander("🧮 민감도 표 (카드 누락 반영률 × 연말 추가 지출)"):
+            table = sweep.to_frame().pivot_table(index='추가 지출', columns='누락 반영률', values='예상 세액')
+            st.dataframe(table.style.format("{:,.0f}"), use_container_width=True)
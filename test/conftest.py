@@ -0,0 +1,26 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트를 import 경로에 추가 (utils, src.modules)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# test_api.py 는 실제 Gemini API를 호출하는 수동 점검 스크립트이므로 자동 수집에서 제외
+collect_ignore = ["test_api.py"]
+
+# 기준값(benchmarks/baselines) 대비 시간 비교는 측정 머신에 따라 달라지므로 RUN_BENCHMARKS=1 일 때만 실행
+BENCHMARK_ENV = "RUN_BENCHMARKS"
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", f"benchmark: 기준값 대비 성능 회귀 검사 ({BENCHMARK_ENV}=1 일 때만 실행)")
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv(BENCHMARK_ENV, "").strip() in ("", "0"):
+        skip = pytest.mark.skip(reason=f"벤치마크는 {BENCHMARK_ENV}=1 일 때만 실행")
+        for item in items:
+            if "benchmark" in item.keywords:
+                item.add_marker(skip)
@@ -0,0 +1,69 @@
+import pandas as pd
+
+from src import analysis
+
+
+def test_account_index_matches_prefix_rules():
+    codes = pd.Series(["40100", "45100", "81100", "93000", "50100", "60100", "13500", "401", "abc", "", None])
+    # 색인 도입 전 접두어 규칙 (4: 매출, 5/8/9: 비용)
+    revenue, expense = (codes.str.startswith(p, na=False).to_numpy() for p in ("4", ("5", "8", "9")))
+    for series in (codes, codes.astype("category")):
+        kinds = analysis.account_kinds(series)
+        assert ((kinds == analysis.KIND_REVENUE) == revenue).all()
+        assert ((kinds == analysis.KIND_EXPENSE) == expense).all()
+    assert list(analysis.account_keys(["401", "4010001", "abc"])) == [40100, 40100, -1]
+    assert analysis.account_kinds(["13500", "25500", "33100"]).tolist() == [
+        analysis.KIND_ASSET, analysis.KIND_LIABILITY, analysis.KIND_EQUITY]
+
+
+def test_trial_balance_hierarchy_and_opening_balances():
+    def row(gubun, name, code="", l=0, r=0, llp=0, rrp=0, index1=0):
+        return {"gubun": gubun, "nm_acctitpr": name, "cd_acctit": code, "l_prc": l, "r_prc": r,
+                "llp": llp, "rrp": rrp, "index1": index1}
+    tb = analysis.load_trial_balance({
+        "bigclass_rows": [{"nm_group": "유동자산"}, {"nm_group": "매출"}],
+        "main_rows": [
+            row(1, "유동자산", index1=1), row(2, "당좌자산", index1=2),
+            row(3, "현금", "10100", 500, 300, 200, 0),
+            row(1, "자본금", index1=10), row(3, "자본금", "33100", 0, 200, 0, 200),
+            row(0, "매출", index1=15), row(3, "용역매출", "40100", 90, 90),
+        ],
+    })
+    assert list(tb.accounts["cd_acctit"]) == ["10100", "33100", "40100"]
+    assert list(tb.accounts["중분류"]) == ["당좌자산", "자본금", "매출"]
+    assert tb.opening_balances().to_dict() == {"10100": 200, "33100": -200}
+    assert tb.index.classify(["10100", "12000"])["중분류"].tolist() == ["당좌자산", "유동자산"]
+
+    cube = analysis.build_monthly_cube(pd.DataFrame({
+        "da_date": ["20250110", "20250110", "20250205"], "cd_acctit": ["10100", "40100", "25500"],
+        "nm_acctit": ["현금", "용역매출", "부가세예수금"], "mn_bungae1": [110, 0, 0], "mn_bungae2": [0, 100, 10],
+    }))
+    balances = tb.roll_forward(cube).set_index("계정코드")
+    assert list(balances.index) == ["10100", "25500", "33100"]
+    assert balances.loc["10100", "현재잔액"] == 310 and balances.loc["25500", "현재잔액"] == -10
+    assert balances.loc["25500", "구분"] == "부채"
+
+
+def test_income_statement_tree_lookup_and_yoy():
+    rows = [
+        {"cd_gr": 65000, "key_index": 4, "ord_lcate": "040", "ord_scate": "830000", "cd_acctit": "830",
+         "nm_acctit": "    소모품비", "mn_total1": 30, "mn_btotal1": 60},
+        {"cd_gr": 61000, "key_index": 1, "ord_lcate": "010", "ord_scate": "0000", "cd_acctit": "0",
+         "nm_acctit": "Ⅰ. 매출", "mn_total2": 100, "mn_btotal2": 200},
+        {"cd_gr": 65000, "key_index": 4, "ord_lcate": "040", "ord_scate": "0000", "cd_acctit": "0",
+         "nm_acctit": "Ⅳ. 판관비", "mn_total2": 30, "mn_btotal2": 60},
+        {"cd_gr": 66500, "key_index": 7, "ord_lcate": "070", "ord_scate": "0000", "cd_acctit": "0",
+         "nm_acctit": "Ⅶ. 기타비용", "mn_total2": 0, "mn_btotal2": 5},
+    ]
+    statement = analysis.parse_income_statement_tree(rows)
+    assert list(statement.frame["nm_acctit"]) == ["Ⅰ. 매출", "Ⅳ. 판관비", "소모품비", "Ⅶ. 기타비용"]
+    assert statement.subtotal(analysis.GR_REVENUE, "전기") == 200
+    assert statement.item(analysis.GR_SGA, 83000) == statement.item(analysis.GR_SGA, "830") == 30
+    assert statement.subtotal(analysis.GR_NET_INCOME) == 0
+
+    # 계정명 문구와 무관하게 코드로 전년 매출/비용을 찾음
+    assert analysis.parse_income_statement(rows) == (200, 65)
+    assert analysis.prior_year_totals(analysis.parse_income_statement_tree(rows)) == (200, 65)
+    assert analysis.prior_year_totals(analysis.parse_income_statement_tree(None)) == (0, 0)
+    yoy = statement.compare().set_index("nm_acctit")
+    assert yoy.loc["Ⅰ. 매출", "증감"] == -100 and yoy.loc["Ⅰ. 매출", "증감률"] == -0.5
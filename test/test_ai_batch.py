@@ -0,0 +1,97 @@
+import json
+
+import pandas as pd
+
+from src.modules.ai_batch import categorize_in_batches, parse_ai_response
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """genai.GenerativeModel 대체: 프롬프트의 거래처를 모두 '소모품비'로 분류"""
+    calls = []
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+
+    def generate_content(self, prompt):
+        StubModel.calls.append(self.model_name)
+        items = json.loads(prompt.split("[입력 데이터]")[1].split("[출력 형식]")[0])
+        answer = {item["거래처"]: {"추천계정": "소모품비", "이유": "stub"} for item in items}
+        return StubResponse("```json\n" + json.dumps(answer, ensure_ascii=False) + "\n```")
+
+
+def make_items(n):
+    return pd.DataFrame({
+        "거래처": [f"거래처{i % (n // 2)}" for i in range(n)],
+        "업종(업태/종목)": ["도소매 / 문구"] * n,
+        "전년도이력": [""] * n,
+    })
+
+
+def test_batches_dedupe_and_cache(tmp_path):
+    StubModel.calls = []
+    cache_path = tmp_path / "ai.json"
+    items = make_items(100)
+
+    result, stats = categorize_in_batches("key", items, cache_path=cache_path, batch_size=8, model_factory=StubModel)
+    assert stats["거래처 수"] == 50
+    assert stats["AI 배치 수"] == 7
+    assert len(StubModel.calls) == 7
+    assert (result["추천계정"] == "소모품비").all()
+    assert (result["출처"] == "AI").all()
+
+    # 재실행 시 모델을 다시 호출하지 않음
+    result, stats = categorize_in_batches("key", items, cache_path=cache_path, batch_size=8, model_factory=StubModel)
+    assert stats["캐시 적중"] == 50
+    assert len(StubModel.calls) == 7
+    assert (result["출처"] == "캐시").all()
+
+
+def test_retry_then_failure_is_reported():
+    class FlakyModel(StubModel):
+        failures = 0
+
+        def generate_content(self, prompt):
+            if FlakyModel.failures < 2:
+                FlakyModel.failures += 1
+                raise RuntimeError("503")
+            return super().generate_content(prompt)
+
+    result, stats = categorize_in_batches("key", make_items(4), backoff=0, model_factory=FlakyModel)
+    assert stats["실패 거래처"] == 0
+
+    class BrokenModel(StubModel):
+        def generate_content(self, prompt):
+            raise RuntimeError("quota")
+
+    result, stats = categorize_in_batches("key", make_items(4), attempts=2, backoff=0, model_factory=BrokenModel)
+    assert stats["실패 거래처"] == 2
+    assert (result["출처"] == "실패").all()
+
+
+def test_parse_plain_values():
+    assert parse_ai_response('{"스타벅스": "접대비"}') == {"스타벅스": {"추천계정": "접대비", "이유": ""}}
+
+
+def test_history_resolves_without_model():
+    StubModel.calls = []
+    journal = pd.DataFrame({
+        "nm_trade": ["스타벅스 광주점"] * 3 + ["쿠팡"] * 2,
+        "nm_acctit": ["접대비"] * 3 + ["소모품비", "복리후생비"],
+    })
+    items = pd.DataFrame({
+        "거래처": ["스타벅스 광주점", "쿠팡", "새거래처"],
+        "업종(업태/종목)": [""] * 3,
+        "전년도이력": [""] * 3,
+    })
+    result, stats = categorize_in_batches("key", items, model_factory=StubModel, df_journal=journal)
+    assert stats["이력 확정"] == 1
+    assert StubModel.calls == ["gemini-2.0-flash"]
+    by_name = result.set_index("거래처")
+    assert by_name.loc["스타벅스 광주점", "추천계정"] == "접대비"
+    assert by_name.loc["스타벅스 광주점", "출처"] == "이력"
+    assert by_name.loc["쿠팡", "출처"] == "AI"
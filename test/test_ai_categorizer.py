@@ -0,0 +1,91 @@
+import re
+
+import pandas as pd
+import pytest
+
+from src.modules import ai_categorizer
+from src.modules.data_loader import optimize_journal_dtypes
+
+
+# 인덱스 도입 전(행 전체 스캔) 구현 - 동등성 기준
+def baseline_company_patterns(df):
+    patterns = {}
+    for trade_name in df['nm_trade'].dropna().unique():
+        if not trade_name or trade_name.strip() == "":
+            continue
+        most_common = df[df['nm_trade'] == trade_name]['nm_acctit'].mode()
+        if len(most_common) > 0:
+            patterns[trade_name] = most_common[0]
+    return patterns
+
+
+def baseline_similar_patterns(df, keyword):
+    pattern = re.compile(keyword, re.IGNORECASE)
+    rows = df[df['nm_trade'].astype(object).str.contains(pattern, na=False)]
+    result = {}
+    for acctit in rows['nm_acctit'].dropna().unique():
+        result[acctit] = rows[rows['nm_acctit'] == acctit]['nm_trade'].unique().tolist()
+    return result
+
+
+def baseline_confidence(df, trade_name, suggested_account):
+    exact = df[df['nm_trade'] == trade_name]
+    if not exact.empty:
+        total, matching = len(exact), int((exact['nm_acctit'] == suggested_account).sum())
+        return matching / total * 100, f"동일 거래처 {total}건 중 {matching}건이 해당 계정 사용"
+    keywords = trade_name.split()
+    if keywords:
+        similar = df[df['nm_trade'].astype(object).str.contains(keywords[0], na=False)]
+        if not similar.empty:
+            total, matching = len(similar), int((similar['nm_acctit'] == suggested_account).sum())
+            return matching / total * 100, f"유사 거래처('{keywords[0]}' 포함) {total}건 중 {matching}건이 해당 계정 사용"
+    return 50.0, "과거 패턴 없음 (AI 일반 지식 기반)"
+
+
+JOURNAL = pd.DataFrame({
+    "nm_trade": ["스타벅스 강남점", "스타벅스 강남점", "스타벅스 강남점", "이디야커피", "스타벅스 역삼점",
+                 "GS25 역삼", "GS25 역삼", None, "카페 드롭탑", "이디야커피", "  ", "카페 드롭탑"],
+    "nm_acctit": ["복리후생비(판)", "접대비(판)", None, "복리후생비(판)", "접대비(판)",
+                  "소모품비(판)", "복리후생비(판)", "잡비", "복리후생비(판)", None, "잡비", "접대비(판)"],
+})
+
+
+@pytest.fixture(params=["object", "category"])
+def journal(request):
+    return JOURNAL if request.param == "object" else optimize_journal_dtypes(JOURNAL)
+
+
+def test_index_lookups_match_row_scan_baseline(journal):
+    assert ai_categorizer.analyze_company_patterns(journal) == baseline_company_patterns(JOURNAL)
+    for keyword in ["스타벅스", "커피|카페", "gs", "없는가게"]:
+        assert ai_categorizer.find_similar_trade_patterns(journal, keyword) == baseline_similar_patterns(JOURNAL, keyword)
+
+    trades = ["스타벅스 강남점", "이디야커피", "GS25 역삼", "스타벅스 신촌점", "카페 신규", "새가게"]
+    accounts = ["복리후생비(판)", "접대비(판)", "소모품비(판)"]
+    for trade in trades:
+        for account in accounts:
+            assert ai_categorizer.calculate_confidence(journal, trade, account) == \
+                pytest.approx(baseline_confidence(JOURNAL, trade, account))
+
+
+@pytest.mark.filterwarnings("ignore:This pattern is interpreted as a regular expression")
+def test_keyword_fallback_is_literal_not_regex():
+    journal = pd.DataFrame({"nm_trade": ["(주)아트박스 본점"], "nm_acctit": ["소모품비(판)"]})
+    # 정규식이면 '(주)'가 그룹으로 해석돼 '주아트박스'만 찾으므로 기존 구현은 0건
+    assert baseline_confidence(journal, "(주)아트박스 신촌", "소모품비(판)")[0] == 50.0
+    assert ai_categorizer.calculate_confidence(journal, "(주)아트박스 신촌", "소모품비(판)") == \
+        (100.0, "유사 거래처('(주)아트박스' 포함) 1건 중 1건이 해당 계정 사용")
+
+
+def test_trade_index_cache_follows_content_not_identity():
+    journal = JOURNAL.copy()
+    before = ai_categorizer.get_trade_index(journal)
+    assert ai_categorizer.get_trade_index(journal) is before
+    assert ai_categorizer.get_trade_index(journal.copy()) is before  # 같은 내용의 다른 객체도 재사용
+
+    journal.loc[journal["nm_trade"] == "GS25 역삼", "nm_acctit"] = "소모품비(판)"  # 같은 길이로 제자리 수정
+    after = ai_categorizer.get_trade_index(journal)
+    assert after is not before
+    assert ai_categorizer.calculate_confidence(journal, "GS25 역삼", "소모품비(판)")[0] == 100.0
+    assert len(ai_categorizer._trade_index_cache) <= ai_categorizer.TRADE_INDEX_CACHE_SIZE
+    assert ai_categorizer.calculate_confidence(journal, "GS25 역삼", "소모품비(판)", index=before)[0] == 50.0
@@ -0,0 +1,56 @@
+import shutil
+from pathlib import Path
+
+import batch_close
+
+JSONS = Path(__file__).resolve().parent.parent / "jsons"
+
+
+def make_clients(root, names):
+    for name in names:
+        client = root / name
+        client.mkdir()
+        for file in ["2025.json", "신용카드_2025.json", "손익계산서_24년_25년.json", "rec_prd.json"]:
+            shutil.copy(JSONS / file, client / file)
+    (root / "no_journal").mkdir()
+
+
+def test_run_batch_process_pool_matches_sequential(tmp_path):
+    make_clients(tmp_path, ["a", "b"])
+    clients = batch_close.list_clients(tmp_path)
+    assert [c.name for c in clients] == ["a", "b"]
+
+    sequential, _ = batch_close.run_batch(clients, workers=1, mc_paths=500)
+    pooled, stats = batch_close.run_batch(clients, workers=2, mc_paths=500)
+
+    metrics = ["고객사"] + batch_close.METRIC_COLUMNS
+    assert sequential[metrics].equals(pooled[metrics])
+    assert (pooled["오류"] == "").all()
+    assert pooled["분개장 메모리"].str.contains("MB → ").all() and pooled["dtype 절감률"].str.endswith("%").all()
+    assert list(pooled["타소득"]) == [7343097, 7343097] and list(pooled["소득공제"]) == [16581120, 16581120]
+    assert (pooled["세액 P10"] <= pooled["세액 P50"]).all() and (pooled["세액 P50"] <= pooled["세액 P90"]).all()
+    assert stats["고객사 수"] == 2 and stats["처리량(고객사/분)"] > 0
+    assert set(stats["단계별 합계(ms)"]) == {f"{s}(ms)" for s in batch_close.STAGES}
+
+
+def test_failed_client_is_reported(tmp_path):
+    client = tmp_path / "broken"
+    client.mkdir()
+    (client / "2025.json").write_text('{"data": [', encoding="utf-8")
+
+    summary, stats = batch_close.run_batch([client], workers=1)
+    assert stats["실패"] == 1
+    assert summary.loc[0, "오류"] != ""
+
+
+def test_profile_dir_exports_stage_breakdown(tmp_path):
+    import json
+
+    make_clients(tmp_path, ["a"])
+    summary, _ = batch_close.run_batch(batch_close.list_clients(tmp_path), workers=1,
+                                       profile_dir=tmp_path / "profiles")
+    profile = json.loads((tmp_path / "profiles" / "a.json").read_text(encoding="utf-8"))
+    stages = {s["stage"]: s for s in profile["stages"]}
+    assert set(stages) <= set(batch_close.STAGES) and "analyze_card_gap" in stages
+    assert stages["analyze_card_gap"]["rows"] == 1210 and stages["preprocess_journal"]["rows"] == 3520
+    assert summary.loc[0, "analyze_card_gap(ms)"] == round(stages["analyze_card_gap"]["ms"], 1)
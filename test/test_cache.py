@@ -0,0 +1,106 @@
+import os
+
+from src.modules.cache import AnalysisCache, file_fingerprint, source_key
+
+
+class FakeUpload:
+    """Streamlit UploadedFile 대역 (getvalue/name만 사용)"""
+
+    def __init__(self, name: str, content: bytes):
+        self.name = name
+        self.content = content
+
+    def getvalue(self) -> bytes:
+        return self.content
+
+
+def test_cache_hits_return_same_object_and_evict_least_recent():
+    cache = AnalysisCache(max_entries=2)
+    first = cache.get_or_compute("a", lambda: ["a"])
+    assert cache.get_or_compute("a", lambda: ["other"]) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.get_or_compute("b", lambda: ["b"])
+    cache.get_or_compute("a", lambda: ["a2"])  # a를 최근 사용으로 갱신
+    cache.get_or_compute("c", lambda: ["c"])   # 가장 오래 안 쓴 b가 빠짐
+    assert len(cache) == 2
+    assert cache.get_or_compute("a", lambda: ["a3"]) is first
+    assert cache.get_or_compute("b", lambda: ["b2"]) == ["b2"]
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_compute_runs_outside_the_lock():
+    cache = AnalysisCache()
+
+    def outer():
+        # 계산 중에는 잠금이 풀려 있어 다른 키 조회(중첩 호출)도 교착 없이 진행
+        assert not cache._lock.locked()
+        return cache.get_or_compute("inner", lambda: 1) + 1
+
+    assert cache.get_or_compute("outer", outer) == 2
+    assert len(cache) == 2
+
+
+def test_fingerprints_follow_content_and_source_key_follows_name(tmp_path):
+    v1, v2 = FakeUpload("2025.json", b"[1]"), FakeUpload("2025.json", b"[1, 2]")
+    assert file_fingerprint(v1, "unused.json") != file_fingerprint(v2, "unused.json")
+    assert file_fingerprint(v1, "unused.json") == file_fingerprint(FakeUpload("copy.json", b"[1]"), "unused.json")
+    assert source_key(v1, "unused.json") == source_key(v2, "unused.json") == "upload:2025.json"
+
+    path = tmp_path / "2025.json"
+    path.write_text("[1]", encoding="utf-8")
+    before = file_fingerprint(None, str(path))
+    assert before == file_fingerprint(None, str(path))
+    path.write_text("[1, 2]", encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert file_fingerprint(None, str(path)) != before
+    assert source_key(None, str(path)) == "path:" + str(path)
+    assert file_fingerprint(None, str(tmp_path / "missing.json")) is None
+
+
+def test_cache_is_bounded_by_estimated_bytes():
+    import numpy as np
+    import pandas as pd
+
+    from src.modules.cache import estimate_size
+
+    frame = pd.DataFrame({"amount": np.arange(1000, dtype="int64"), "name": ["거래처"] * 1000})
+    assert estimate_size(frame) == frame.memory_usage(deep=True).sum() > 8000
+    assert estimate_size((frame, {"k": frame})) >= estimate_size(frame)  # 같은 객체는 한 번만
+
+    cache = AnalysisCache(max_entries=100, max_bytes=estimate_size(frame) * 2 + 1000)
+    big = cache.get_or_compute("big", lambda: frame)
+    for i in range(50):  # 작은 결과가 많이 쌓여도 큰 표는 남음
+        cache.get_or_compute(("small", i), lambda: i)
+    assert cache.get_or_compute("big", lambda: None) is big
+    cache.get_or_compute("big2", lambda: frame.copy())
+    cache.get_or_compute("big3", lambda: frame.copy())  # 바이트 한도 초과 → 가장 오래 안 쓴 항목부터 제거
+    assert cache.bytes <= cache.max_bytes and len(cache) < 53
+    assert cache.get_or_compute("big3", lambda: None) is not None
+
+    huge = AnalysisCache(max_bytes=1)
+    assert huge.get_or_compute("only", lambda: frame) is frame and len(huge) == 1  # 방금 넣은 항목은 유지
+    huge.clear()
+    assert huge.bytes == 0
+
+
+def test_upload_fingerprint_is_memoized_per_file_id():
+    calls = []
+
+    class Upload(FakeUpload):
+        def getvalue(self):
+            calls.append(self.file_id)
+            return self.content
+
+    first = Upload("2025.json", b"[1]")
+    first.file_id = "upload-1"
+    assert file_fingerprint(first, "unused.json") == file_fingerprint(first, "unused.json")
+    assert calls == ["upload-1"]  # 재실행마다 바이트를 다시 해시하지 않음
+
+    second = Upload("2025.json", b"[1, 2]")
+    second.file_id = "upload-2"  # 다시 올리면 새 file_id
+    assert file_fingerprint(second, "unused.json") != file_fingerprint(first, "unused.json")
+    assert calls == ["upload-1", "upload-2"]
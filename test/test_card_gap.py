@@ -0,0 +1,122 @@
+import pandas as pd
+
+from src import analysis
+
+
+def test_card_gap_returns_dataclass():
+    journal = pd.DataFrame({"da_date": ["20250301"], "mn_bungae1": [10000]})
+    card = pd.DataFrame({
+        "da_sbook": ["20250301", "20250302", "20250303"],
+        "mn_total": [10000, 5000, 7000],
+        "ty_jungstat": [2, 2, 1],
+        "nm_trade": ["A", "B", "C"],
+    })
+    gap = analysis.analyze_card_gap(journal, card, {"B": "소모품비(판)"})
+    assert gap.total_gap == 5000 and gap.count == 1
+    assert gap.missing.loc[0, "비고(AI힌트)"] == "💡전년도: 소모품비(판)"
+    assert analysis.analyze_card_gap(journal, [], {}).count == 0
+
+
+def test_card_matcher_window_tolerance_and_greedy_assignment():
+    from src.modules.card_matcher import match_card_to_journal
+
+    # 전표 1: 소모품비 10,000 + 부가세대급금 1,000 (부가세 분할), 전표 2·3: 단일 차변 라인
+    journal = pd.DataFrame({
+        "da_date": ["20250105"] * 3 + ["20250110"] * 2 + ["20250120"] * 2,
+        "no_acct": ["00001"] * 3 + ["00002"] * 2 + ["00003"] * 2,
+        "nm_acctit": ["소모품비(판)", "부가세대급금", "미지급금", "복리후생비(판)", "미지급금", "접대비(판)", "미지급금"],
+        "nm_trade": ["문구사", "문구사", "문구사", "식당", "식당", "한식당", "한식당"],
+        "mn_bungae1": [10000, 1000, 0, 30000, 0, 20000, 0],
+        "mn_bungae2": [0, 0, 11000, 0, 30000, 0, 20000],
+    })
+
+    def match(da_sbook, mn_total, nm_trade=None, **kwargs):
+        card = pd.DataFrame({"da_sbook": da_sbook, "mn_total": mn_total,
+                             "nm_trade": nm_trade or [""] * len(da_sbook)})
+        return match_card_to_journal(journal, card, **kwargs)
+
+    # 부가세 분할: 카드 11,000 ↔ 전표 1의 차변 합계 (두 라인 모두 사용)
+    vat = match(["20250105"], [11000], ["문구사"], date_window=2)
+    assert len(vat) == 1 and vat.loc[0, "split"] and set(vat.loc[0, "journal_index"]) == {0, 1}
+
+    # 허용 일수: ±2일은 매칭, 3일 차이는 범위 밖
+    assert match(["20250112"], [30000], date_window=2).loc[0, "day_diff"] == -2
+    assert match(["20250108"], [30000], date_window=2).loc[0, "day_diff"] == 2
+    assert match(["20250113"], [30000], date_window=2).empty
+    assert match(["20250112"], [30000], date_window=1).empty
+
+    # 허용 금액 오차
+    assert match(["20250120"], [20300], date_window=0).empty
+    assert match(["20250120"], [20300], date_window=0, amount_tol=500).loc[0, "amount_diff"] == -300
+    assert match(["20250120"], [20600], date_window=0, amount_tol=500).empty
+
+    # 장부 라인 하나를 두 카드가 다투면 신뢰도 높은(거래처 일치) 카드 하나만 배정
+    both = match(["20250110", "20250110"], [30000, 30000], ["주유소", "식당"], date_window=2)
+    assert both["card_index"].tolist() == [1] and both.loc[0, "trade_match"]
+    assert match(["20250110"], [30000], ["주유소"], date_window=2)["card_index"].tolist() == [0]
+
+
+def test_card_gap_exact_mode_is_date_amount_anti_join():
+    journal = pd.DataFrame({
+        "da_date": ["20250105", "20250105", "20250105", "20250110"],
+        "no_acct": ["00001", "00001", "00001", "00002"],
+        "mn_bungae1": [10000, 1000, 0, 30000],
+    })
+    card = pd.DataFrame({
+        "da_sbook": ["20250105", "20250111", "20250110", "20250110"],
+        "mn_total": [11000, 30000, 30000, 30000],
+        "ty_jungstat": [2, 2, 2, 2],
+        "nm_trade": ["문구사", "식당", "식당", "식당"],
+    })
+    keys = set(zip(journal["da_date"], journal["mn_bungae1"]))
+    expected = [amt for date, amt in zip(card["da_sbook"], card["mn_total"]) if (date, amt) not in keys]
+
+    exact = analysis.analyze_card_gap(journal, card, {}, date_window=None)
+    # 정확 일치 모드: 부가세 분할·일자 차이는 누락, 같은 키의 카드는 중복이어도 모두 매칭
+    assert exact.missing["금액"].tolist() == expected == [11000, 30000]
+    assert exact.missing["일자"].tolist() == ["20250105", "20250111"]
+    # 허용 범위 모드: 분할 전표는 매칭, 30,000 장부 라인 하나에는 카드 하나만 배정 (1:1)
+    windowed = analysis.analyze_card_gap(journal, card, {}, date_window=2)
+    assert windowed.total_gap == 60000 and windowed.count == 2
+    # 매칭된 카드는 근거와 함께 남김 (누락 0원이어도 어떤 전표와 짝지었는지 확인 가능)
+    assert windowed.matches["일자"].tolist() == ["20250105", "20250110"]
+    assert windowed.matches["부가세 분할"].tolist() == [True, False] and windowed.split_count == 1
+    assert windowed.matches["신뢰도"].between(0.5, 1).all() and exact.matches.empty
+
+
+def baseline_exact_gap(df_journal, df_card, history_map):
+    """anti-join 이전의 행 단위(iterrows) 구현 - 결측 금액은 0으로 본다 (기존 코드는 int(NaN)에서 실패)"""
+    journal_keys = set(df_journal["da_date"] + "_" + df_journal["mn_bungae1"].astype(int).astype(str))
+    rows, total_gap = [], 0
+    for _, row in df_card.iterrows():
+        amount = 0 if pd.isna(row.get("mn_total", 0)) else row.get("mn_total", 0)
+        key = str(row.get("da_sbook", "")) + "_" + str(int(amount))
+        status_code = row.get("ty_jungstat", 0)
+        if status_code == 2 and key not in journal_keys:
+            merchant = str(row.get("nm_trade", "")).strip()
+            rows.append({"일자": str(row.get("da_sbook", "")), "거래처": merchant, "금액": row.get("mn_total", 0),
+                         "전표상태": analysis.get_status_name(status_code),
+                         "전년도이력": history_map.get(merchant, "")})
+            total_gap += amount
+    return total_gap, pd.DataFrame(rows)
+
+
+def test_card_gap_exact_anti_join_matches_row_scan_baseline():
+    journal = pd.DataFrame({
+        "da_date": ["20250105", "20250105", "20250110", "20250110", "20250201"],
+        "mn_bungae1": [11000, 11000, 30000, 0, 5000],  # 같은 (일자, 금액) 키 중복
+    })
+    card = pd.DataFrame({
+        "da_sbook": ["20250105", "20250105", 20250110, "20250110", "20250111", "20250201", "20250202", "20250203",
+                     "20250204", "20250110"],
+        "mn_total": [11000, 11000, 30000, float("nan"), 30000, 5000, float("nan"), 7000, 7000, 0],
+        "ty_jungstat": [2, 2, 2, 2, 2, 1, 2, 3, 2, 2],  # 1: 미확정, 3: 제외
+        "nm_trade": ["문구사", "문구사", "식당", "식당", "식당", "주유소", "마트", "카페", "카페", "식당"],
+    })
+    history = {"식당": "복리후생비(판)", "카페": "접대비(판)"}
+
+    total_gap, expected = baseline_exact_gap(journal, card, history)
+    gap = analysis.analyze_card_gap(journal, card, history, date_window=None)
+    assert gap.total_gap == total_gap == 30000 + 7000
+    assert gap.count == len(expected) == 3  # 결측 금액은 0원: 1/10 카드는 0원 장부 라인과 매칭, 2/2 카드는 0원 누락
+    pd.testing.assert_frame_equal(gap.missing[expected.columns], expected, check_dtype=False)
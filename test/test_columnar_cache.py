@@ -0,0 +1,55 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.modules.columnar_cache import load_or_build
+
+pytest.importorskip("pyarrow")  # 없으면 load_or_build가 항상 build()로 우회
+
+
+def write_source(path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+
+
+def builder(path, calls):
+    def build():
+        calls.append(str(path))
+        return pd.DataFrame(json.loads(path.read_text(encoding="utf-8")))
+    return build
+
+
+def test_hit_miss_after_change_and_corrupt_rebuild(tmp_path):
+    source, cache_dir, calls = tmp_path / "2025.json", tmp_path / "cache", []
+    write_source(source, [{"nm_trade": "스타벅스", "mn_total": 1000}])
+
+    first = load_or_build("card", None, source, builder(source, calls), cache_dir)
+    again = load_or_build("card", None, source, builder(source, calls), cache_dir)
+    assert len(calls) == 1  # 두 번째는 캐시 적중
+    pd.testing.assert_frame_equal(first, again)
+
+    write_source(source, [{"nm_trade": "이디야", "mn_total": 2000}])
+    changed = load_or_build("card", None, source, builder(source, calls), cache_dir)
+    assert len(calls) == 2 and changed["nm_trade"].tolist() == ["이디야"]
+    assert len(list(cache_dir.glob("*.feather"))) == 1  # 이전 내용의 캐시는 정리
+
+    (cached,) = cache_dir.glob("*.feather")
+    cached.write_bytes(b"not a feather file")
+    rebuilt = load_or_build("card", None, source, builder(source, calls), cache_dir)
+    assert len(calls) == 3 and rebuilt["mn_total"].tolist() == [2000]
+    assert load_or_build("card", None, source, builder(source, calls), cache_dir)["mn_total"].tolist() == [2000]
+    assert len(calls) == 3  # 손상 파일을 새로 써서 다시 적중
+
+
+def test_same_stem_sources_keep_separate_caches(tmp_path):
+    cache_dir, calls = tmp_path / "cache", []
+    a, b = tmp_path / "client_a" / "2025.json", tmp_path / "client_b" / "2025.json"
+    write_source(a, [{"mn_total": 1}])
+    write_source(b, [{"mn_total": 2}])
+
+    for _ in range(2):
+        assert load_or_build("card", None, a, builder(a, calls), cache_dir)["mn_total"].tolist() == [1]
+        assert load_or_build("card", None, b, builder(b, calls), cache_dir)["mn_total"].tolist() == [2]
+    assert calls == [str(a), str(b)]  # 서로의 캐시를 지우지 않아 두 번째 바퀴는 모두 적중
+    assert len(list(cache_dir.glob("2025.card.*.feather"))) == 2
@@ -0,0 +1,127 @@
+import pandas as pd
+import pytest
+
+from src import analysis
+
+
+def test_monthly_cube_matches_financials_and_derives_months():
+    journal = pd.DataFrame({
+        "da_date": ["20250115", "20250210", "20250228", "20250305"],
+        "month": ["01", "02", "02", "03"],
+        "cd_acctit": ["40100", "81100", "40100", "83000"],
+        "nm_acctit": ["상품매출", "복리후생비(판)", "상품매출", "소모품비(판)"],
+        "mn_bungae1": [0, 12000, 1000, 5000],
+        "mn_bungae2": [100000, 0, 50000, 0],
+    })
+    cube = analysis.build_monthly_cube(journal)
+
+    assert cube.financials(closed_only=False) == analysis.calculate_financials(journal)
+    assert list(cube.revenue_by_month()[:3]) == [100000, 49000, 0]
+    assert cube.months_passed == 2  # 3월은 5일까지만 입력 → 진행 중
+    assert cube.to_frame()["count"].sum() == len(journal)
+
+    # 진행 중인 3월(소모품비 5,000)은 누적 실적에서 빠져 분자·분모가 같은 2개월 기준
+    assert cube.financials() == (149000, 12000)
+
+    forecast = analysis.forecast_from_cube(cube, 0, 0)
+    assert forecast.months_passed == 2
+    assert forecast.final_rev_baseline == 149000 / 2 * 12
+    assert forecast.exp_booked == 12000 and forecast.exp_future == 12000 / 2 * 10
+
+
+def _journal(year, monthly):
+    """{(계정코드, 계정명): [1~12월 금액]} → 분개장 (매출은 대변, 비용은 차변)"""
+    rows = []
+    for (code, name), amounts in monthly.items():
+        for month, amount in enumerate(amounts, start=1):
+            if amount:
+                revenue = code.startswith("4")
+                rows.append({
+                    "da_date": f"{year}{month:02d}28", "month": f"{month:02d}", "cd_acctit": code, "nm_acctit": name,
+                    "mn_bungae1": 0 if revenue else amount, "mn_bungae2": amount if revenue else 0,
+                })
+    return pd.DataFrame(rows)
+
+
+def test_seasonal_forecast_modes():
+    prior = _journal(2024, {
+        ("40100", "매출"): [100] * 11 + [300],           # 12월 성수기
+        ("81900", "임차료"): [50] * 12,                  # 고정비
+        ("83000", "소모품비"): [10, 30] * 6,             # 변동비 (연 240 / 매출 1400)
+    })
+    current = _journal(2025, {
+        ("40100", "매출"): [200] * 9 + [0, 0, 0],
+        ("81900", "임차료"): [50] * 8 + [60] + [0, 0, 0],
+        ("83000", "소모품비"): [20] * 9 + [0, 0, 0],
+        ("82200", "차량유지비"): [9] * 9 + [0, 0, 0],    # 전년 이력 없음
+    })
+    current.loc[len(current)] = {"da_date": "20251005", "month": "10", "cd_acctit": "40100", "nm_acctit": "매출",
+                                 "mn_bungae1": 0, "mn_bungae2": 1}
+
+    sf = analysis.forecast_seasonal(analysis.build_monthly_cube(current), analysis.build_monthly_cube(prior))
+    assert sf.months_passed == 9
+    frame = sf.to_frame().set_index("계정코드")
+    assert dict(frame["방식"]) == {"40100": "계절성", "81900": "고정비", "83000": "변동비(매출비율)", "82200": "월평균"}
+
+    # 매출: 전년 모양 × 2배 성장 → 10~11월 200, 12월 600
+    assert list(sf.projected[list(sf.accounts).index("40100")][9:]) == [200, 200, 600]
+    assert frame.loc["81900", "예측"] == 60 * 3
+    assert frame.loc["83000", "예측"] == pytest.approx(240 / 1400 * 1000)
+    assert frame.loc["82200", "예측"] == 27
+    revenue, expense, profit = sf.totals()
+    assert revenue == 1800 + 1000 and profit == revenue - expense
+
+
+def test_monte_carlo_bands_are_batched_and_reproducible():
+    prior = analysis.build_monthly_cube(_journal(2024, {
+        ("40100", "매출"): [100] * 11 + [300],
+        ("81900", "임차료"): [50] * 12,
+    }))
+    current = analysis.build_monthly_cube(_journal(2025, {
+        ("40100", "매출"): [200] * 9 + [0, 0, 0],
+        ("81900", "임차료"): [50] * 9 + [0, 0, 0],
+    }))
+    assert current.months_passed == 8  # 9월 28일까지 → 9월은 진행 중
+
+    _, is_revenue, pool = analysis.bootstrap_pool(current, prior)
+    assert pool.shape == (2, 12 + 8) and list(is_revenue) == [True, False]
+
+    result = analysis.simulate_landing(current, prior, n_paths=2000, seed=7)
+    again = analysis.simulate_landing(current, prior, n_paths=2000, seed=7)
+    assert len(result) == 2000 and result.pool_months == 20
+    assert (result.total_tax == again.total_tax).all()
+    assert (result.expense == 50 * 12).all()
+    # 남은 4개월 매출은 표본 월(100/200/300) 범위 안에서만 움직임
+    assert result.revenue.min() >= 1600 + 4 * 100 and result.revenue.max() <= 1600 + 4 * 300
+
+    bands = result.percentiles()
+    assert list(bands.columns) == ["P10", "P50", "P90"]
+    assert (bands["P10"] <= bands["P50"]).all() and (bands["P50"] <= bands["P90"]).all()
+    assert result.total_tax == pytest.approx(analysis.income_tax(result.tax_base) * 1.1)
+
+
+def test_monte_carlo_resamples_whole_months_jointly():
+    def landing(scale):
+        # 매출이 큰 달은 원재료비도 큰 달 (원가율 60%), 매출 변동폭만 scale배
+        revenue = [1000 + scale * d for d in (-300, 300, -100, 100, -200, 200, 0, 0, -300, 300, -100, 100)]
+        prior = analysis.build_monthly_cube(_journal(2024, {
+            ("40100", "매출"): revenue,
+            ("50100", "원재료비"): [r * 0.6 for r in revenue],
+        }))
+        current = analysis.build_monthly_cube(_journal(2025, {
+            ("40100", "매출"): [1000] * 9 + [0, 0, 0],
+            ("50100", "원재료비"): [600] * 9 + [0, 0, 0],
+        }))
+        return analysis.simulate_landing(current, prior, n_paths=4000, seed=3)
+
+    flat, base, wide = landing(0), landing(1), landing(2)
+    # 같은 달을 통째로 뽑으므로 경로마다 원가율이 그대로 (계정별로 따로 뽑으면 어긋남)
+    assert base.expense == pytest.approx(base.revenue * 0.6)
+
+    # 월 간 변동이 없으면 밴드 폭 0, 변동폭을 두 배로 하면 밴드 폭도 두 배
+    def width(result):
+        bands = result.percentiles()
+        return bands.loc["매출", "P90"] - bands.loc["매출", "P10"]
+
+    assert width(flat) == 0 and width(base) > 0
+    assert width(wide) == pytest.approx(2 * width(base))
@@ -0,0 +1,56 @@
+import io
+import json
+
+import pytest
+
+from src.modules.data_loader import FLUSH_ROWS, iter_json_array, load_json_columns
+
+RECORDS = [
+    {"nm_trade": "（주）아트박스 ]}", "mn_total": 12000, "memo": "따옴표\" ]}, [{ 포함"},
+    {"nm_trade": "농협카드(6215)", "mn_total": -1.5, "memo": None},
+    {"nested": {"a": [1, {"b": "}]"}]}, "mn_total": 1e3},
+]
+
+
+def stream(payload: bytes, chunk_size: int, **kwargs):
+    return list(iter_json_array(io.BytesIO(payload), chunk_size=chunk_size, **kwargs))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 4096])
+def test_iter_json_array_survives_chunk_boundaries(chunk_size):
+    payload = json.dumps(RECORDS, ensure_ascii=False, indent=1).encode("utf-8")
+    # 한글(3바이트)·문자열 안의 ']' / '}'가 청크 경계에 걸려도 같은 결과
+    assert stream(payload, chunk_size) == RECORDS
+    assert stream(b"\xef\xbb\xbf" + payload, chunk_size) == RECORDS  # BOM
+
+    wrapped = {"meta": {"data": [0], "note": "]}"}, "count": 3, "data": RECORDS}
+    assert stream(json.dumps(wrapped, ensure_ascii=False).encode("utf-8"), chunk_size) == RECORDS
+    assert stream(b" [ ] ", chunk_size) == [] and stream(b'{"data": []}', chunk_size) == []
+
+
+@pytest.mark.parametrize("payload", [
+    b'[{"a": 1} {"a": 2}]',      # 쉼표 누락
+    b'[{"a": 1},',               # 잘린 파일
+    b'{"meta": {"data": [1]}}',  # 최상위 배열 키 없음
+    b'"data"',                   # 배열도 객체도 아님
+])
+def test_iter_json_array_rejects_malformed_input(payload):
+    with pytest.raises(ValueError):
+        stream(payload, 2)
+
+
+def test_load_json_columns_flushes_chunks_and_keeps_seen_columns(tmp_path):
+    rows = FLUSH_ROWS * 2 + 1
+    # late 컬럼은 첫 청크에 전혀 없어도 병합 후 숫자로 추론됨
+    records = [{"id": i, "name": f"거래처{i % 7}", **({"late": i} if i >= FLUSH_ROWS else {})} for i in range(rows)]
+    path = tmp_path / "big.json"
+    path.write_text(json.dumps({"data": records}, ensure_ascii=False), encoding="utf-8")
+
+    df = load_json_columns(path, columns=["id", "late", "missing"])
+    assert list(df.columns) == ["id", "late"]  # 어떤 레코드에도 없던 컬럼은 제외
+    assert len(df) == rows and df["id"].tolist() == list(range(rows))
+    assert df["late"].isna().sum() == FLUSH_ROWS and df["late"].iloc[-1] == rows - 1
+    assert df["late"].dtype.kind == "f"
+
+    everything = load_json_columns(path, flush_rows=1000)
+    assert list(everything.columns) == ["id", "name", "late"] and len(everything) == rows
@@ -0,0 +1,52 @@
+import pandas as pd
+
+import utils
+from src.modules.data_loader import compare_memory, optimize_journal_dtypes
+
+
+def make_journal():
+    return pd.DataFrame({
+        "da_date": ["20250105", "20250105", "20250210", "20250311"],
+        "month": [1, 1, 2, 3],
+        "no_acct": ["1", "1", "2", "3"],
+        "cd_acctit": ["40100", "81100", "83000", "13500"],
+        "nm_acctit": ["상품매출", "복리후생비(판)", "소모품비(판)", "부가세대급금"],
+        "nm_trade": ["A상사", "스타벅스", "다이소", "다이소"],
+        "cd_trade": ["001", "002", "003", "003"],
+        "mn_bungae1": [0, 12000, 5000, 500],
+        "mn_bungae2": [100000, 0, 0, 0],
+        "dt_insert": ["x"] * 4,
+    })
+
+
+def test_optimize_journal_dtypes_compacts_without_mutating():
+    df = make_journal()
+    snapshot = df.copy()
+    out = optimize_journal_dtypes(df)
+
+    pd.testing.assert_frame_equal(df, snapshot)
+    assert "dt_insert" not in out.columns
+    assert isinstance(out["nm_trade"].dtype, pd.CategoricalDtype)
+    assert out["mn_bungae1"].dtype == "int32"
+    assert out["month"].dtype == "int8"
+
+
+def test_calculate_financials_same_result_and_no_mutation():
+    df = make_journal()
+    snapshot = df.copy()
+
+    assert utils.calculate_financials(df) == (100000, 17000)
+    pd.testing.assert_frame_equal(df, snapshot)
+    assert utils.calculate_financials(optimize_journal_dtypes(df)) == (100000, 17000)
+
+
+def test_compare_memory_reports_before_and_after():
+    df = pd.concat([make_journal()] * 200, ignore_index=True)
+    report = compare_memory(df, optimize_journal_dtypes(df))
+
+    assert list(report) == ["변환 전", "변환 후", "절감률"]
+    before, after = (float(report[key].removesuffix(" MB")) for key in ("변환 전", "변환 후"))
+    assert after < before
+    saved = float(report["절감률"].removesuffix("%"))
+    assert 50 < saved < 100
+    assert compare_memory(pd.DataFrame(), pd.DataFrame())["절감률"] == "0.0%"
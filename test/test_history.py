@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src import analysis
+
+
+def test_merchant_history_decay_and_feather(tmp_path):
+    def journal(rows):
+        return pd.DataFrame(rows, columns=["nm_trade", "nm_acctit"])
+
+    y2023 = journal([("식당 ", "복리후생비(판)")] * 3 + [("주유소", "차량유지비(판)")])
+    y2024 = journal([("식당", "접대비(판)")] * 2 + [("문구사", "소모품비(판)"), ("", "잡비(판)")])
+    assert analysis.build_history_map(y2024) == {"식당": "접대비(판)", "문구사": "소모품비(판)"}
+
+    history = analysis.build_merchant_history({2023: y2023, 2024: y2024}, decay=0.5)
+    assert history.years == [2023, 2024]
+    # 식당: 2023년 3건 × 0.5 = 1.5 < 2024년 2건 → 최근 계정
+    assert history.to_map() == {"식당": "접대비(판)", "주유소": "차량유지비(판)", "문구사": "소모품비(판)"}
+    top = history.top_accounts().set_index("merchant")
+    assert top.loc["식당", "score"] == 2 and top.loc["식당", "share"] == pytest.approx(2 / 3.5)
+    assert analysis.MerchantHistory(decay=1.0).add_year(y2023, 2023).add_year(y2024, 2024).to_map()["식당"] == "복리후생비(판)"
+
+    # 같은 연도를 다시 넣으면 교체, 다른 연도는 그대로
+    replaced = history.add_year(journal([("식당", "회의비(판)")] * 5), 2024, source="v2")
+    assert replaced.to_map()["식당"] == "회의비(판)" and "주유소" in replaced.to_map()
+    assert replaced.sources == {2023: "", 2024: "v2"}
+    assert replaced.drop_years([2024]).to_map() == {"식당": "복리후생비(판)", "주유소": "차량유지비(판)"}
+
+    path = tmp_path / "history.feather"
+    replaced.to_feather(path)
+    loaded = analysis.MerchantHistory.from_feather(path)
+    assert loaded.sources == replaced.sources and loaded.decay == 0.5
+    assert loaded.to_map() == replaced.to_map()
+
+
+def test_history_store_reingests_only_changed_years(tmp_path):
+    from src.modules.history_store import load_merchant_history
+
+    files = {}
+    for year, account in ((2023, "복리후생비(판)"), (2024, "접대비(판)")):
+        files[year] = tmp_path / f"{year}.json"
+        files[year].write_text(account, encoding="utf-8")
+    loads = []
+
+    def load(path):
+        loads.append(Path(path).stem)
+        return pd.DataFrame({"nm_trade": ["식당"], "nm_acctit": [Path(path).read_text(encoding="utf-8")]})
+
+    store = tmp_path / "history.feather"
+    assert load_merchant_history(files, load, store).to_map() == {"식당": "접대비(판)"}
+    assert load_merchant_history(files, load, store).years == [2023, 2024]
+    assert loads == ["2023", "2024"]
+
+    files[2024].write_text("회의비(판)", encoding="utf-8")
+    del files[2023]
+    history = load_merchant_history(files, load, store)
+    assert loads == ["2023", "2024", "2024"]
+    assert history.years == [2024] and history.to_map() == {"식당": "회의비(판)"}
@@ -0,0 +1,32 @@
+import pytest
+
+from benchmarks import hot_paths
+
+
+def test_synthetic_data_is_shaped_like_exports():
+    journal, card = hot_paths.synthetic_data(3_000, seed=1)
+    assert len(journal) == 3_000 and list(journal.columns[:3]) == ["da_date", "month", "no_acct"]
+    # 12/31 손익 대체 행은 전처리에서 빠짐
+    assert len(hot_paths.utils.preprocess_journal(journal)) < len(journal)
+    assert set(card["ty_jungstat"]) <= {1, 2, 3} and card["sq_sbook"].is_unique
+    assert card["cd_trade"].str.len().eq(10).all()
+    assert hot_paths.parse_size("100k") == 100_000 and hot_paths.parse_size("1m") == 1_000_000
+
+
+def test_measure_reports_every_stage_and_flags_regressions():
+    result = hot_paths.measure([2_000], runs=1)
+    stages = result["2000"]
+    assert list(stages) == hot_paths.STAGES
+    assert all(r["ms"] > 0 and r["rows_per_s"] > 0 and r["peak_mb"] >= 0 for r in stages.values())
+
+    slower = {"2000": {**stages, "analyze_card_gap": {**stages["analyze_card_gap"],
+                                                      "ms": stages["analyze_card_gap"]["ms"] * 3 + 100}}}
+    problems = hot_paths.check_regression(slower, result)
+    assert len(problems) == 1 and "analyze_card_gap" in problems[0]
+    assert hot_paths.check_regression(result, {}) == []
+
+
+@pytest.mark.benchmark
+def test_hot_paths_do_not_regress_at_10k():
+    result = hot_paths.measure([10_000], runs=2)
+    assert hot_paths.check_regression(result, hot_paths.load_baseline()) == []
@@ -0,0 +1,103 @@
+import pandas as pd
+
+from src import analysis
+
+
+def test_incremental_update_equals_full_recompute():
+    def voucher(date, no, merchant, account, code, amount, vat=0):
+        debit = [(code, account, amount)] + ([("13500", "부가세대급금", vat)] if vat else [])
+        rows = [{"da_date": date, "month": date[4:6], "no_acct": no, "cd_acctit": c, "nm_acctit": n,
+                 "nm_trade": merchant, "mn_bungae1": a, "mn_bungae2": 0} for c, n, a in debit]
+        rows.append({"da_date": date, "month": date[4:6], "no_acct": no, "cd_acctit": "25300", "nm_acctit": "미지급금",
+                     "nm_trade": merchant, "mn_bungae1": 0, "mn_bungae2": amount + vat})
+        return rows
+
+    jan = voucher("20250105", "00001", "문구사", "소모품비(판)", "83000", 10000, 1000) \
+        + voucher("20250110", "00002", "식당", "복리후생비(판)", "81100", 30000) \
+        + voucher("20250120", "00003", "식당", "접대비(판)", "81300", 20000)
+    feb = voucher("20250203", "00001", "주유소", "차량유지비(판)", "82200", 50000) \
+        + voucher("20250228", "00002", "식당", "접대비(판)", "81300", 45000)
+    v1 = pd.DataFrame(jan)
+    v2 = pd.DataFrame(jan + feb)
+    v2.loc[v2["no_acct"].eq("00002") & v2["da_date"].eq("20250110"), ["mn_bungae1", "mn_bungae2"]] = [[31000, 0], [0, 31000]]
+    v2 = v2[~(v2["no_acct"].eq("00003") & v2["da_date"].eq("20250120"))].reset_index(drop=True)
+
+    card = pd.DataFrame({
+        "da_sbook": ["20250106", "20250110", "20250120", "20250203", "20250228"],
+        "mn_total": [11000, 31000, 20000, 50000, 45000],
+        "ty_jungstat": [2, 2, 2, 2, 1],
+        "nm_trade": ["문구사", "식당", "식당", "주유소", "식당"],
+        "sq_sbook": [1, 2, 3, 4, 5],
+    })
+
+    inc = analysis.IncrementalAnalysis(date_window=2, track_history=True)
+    first = inc.update(v1, card.iloc[:3])
+    assert first.stats.full
+    snapshot = inc.update(v2, card)
+    stats = snapshot.stats
+    assert not stats.full
+    assert (stats.added_vouchers, stats.removed_vouchers, stats.added_cards) == (3, 2, 2)
+
+    full = analysis.build_monthly_cube(v2)
+    for name in ("accounts", "names", "debit", "credit", "count"):
+        assert (getattr(inc.cube, name) == getattr(full, name)).all()
+    assert inc.cube.months_passed == full.months_passed == 2
+    assert inc.history_map == analysis.build_history_map(v2) == {"문구사": "소모품비(판)", "식당": "미지급금", "주유소": "차량유지비(판)"}
+
+    gap = snapshot.gap({})
+    expected = analysis.analyze_card_gap(v2, card, {}, date_window=2)
+    assert gap.total_gap == expected.total_gap == 20000  # 삭제된 1/20 전표의 카드만 누락
+    assert gap.missing.equals(expected.missing)
+    pd.testing.assert_frame_equal(gap.matches, expected.matches)
+    assert gap.split_count == expected.split_count == 1  # 1/6 카드 11,000 ↔ 소모품비 + 부가세대급금
+    assert inc.gap({}).missing.equals(expected.missing)
+
+    # 이전 스냅샷은 이후 update에 영향받지 않음 (다른 세션이 같은 상태를 갱신해도 자기 결과를 읽음)
+    assert (first.cube.debit == analysis.build_monthly_cube(v1).debit).all()
+    assert first.gap({}).total_gap == analysis.analyze_card_gap(v1, card.iloc[:3], {}, date_window=2).total_gap == 31000
+    assert not first.matched.flags.writeable
+    assert inc.update(v2, card) is snapshot
+
+
+def test_incremental_update_hashes_only_appended_rows():
+    def journal(n, start=0):
+        rows = []
+        for i in range(start, start + n):
+            date = f"2025{i % 12 + 1:02d}{i % 27 + 1:02d}"
+            rows += [{"da_date": date, "month": date[4:6], "no_acct": f"{i:05d}", "cd_acctit": "83000",
+                      "nm_acctit": "소모품비(판)", "nm_trade": f"거래처{i % 9}", "mn_bungae1": 1000 + i, "mn_bungae2": 0},
+                     {"da_date": date, "month": date[4:6], "no_acct": f"{i:05d}", "cd_acctit": "25300",
+                      "nm_acctit": "미지급금", "nm_trade": f"거래처{i % 9}", "mn_bungae1": 0, "mn_bungae2": 1000 + i}]
+        return pd.DataFrame(rows)
+
+    def card(n):
+        return pd.DataFrame({"da_sbook": [f"2025{i % 12 + 1:02d}{i % 27 + 1:02d}" for i in range(n)],
+                             "mn_total": [1000 + i for i in range(n)], "ty_jungstat": 2, "sq_sbook": range(n)})
+
+    v1, v2 = journal(100), pd.concat([journal(100), journal(10, start=100)], ignore_index=True)
+    inc = analysis.IncrementalAnalysis(date_window=2)
+    assert inc.update(v1, card(80)).stats.hashed_rows == 200 + 80
+    stats = inc.update(v2, card(90)).stats
+    assert not stats.full and stats.hashed_rows == 20 + 10  # 기준점 뒤에 붙은 행만 해시
+    assert (stats.added_vouchers, stats.added_cards) == (10, 10)
+    assert (inc.cube.debit == analysis.build_monthly_cube(v2).debit).all()
+    expected = analysis.analyze_card_gap(v2, card(90), {}, date_window=2)
+    assert inc.gap({}).total_gap == expected.total_gap
+    pd.testing.assert_frame_equal(inc.gap({}).matches, expected.matches)
+
+    # 앞부분이 바뀐 내보내기(행 삭제)는 표본 검사에서 걸려 전체를 다시 해시
+    v3 = v2.drop(index=[0, 1]).reset_index(drop=True)
+    assert inc.update(v3, card(90)).stats.hashed_rows == len(v3)  # 카드는 그대로라 다시 해시하지 않음
+    assert (inc.cube.debit == analysis.build_monthly_cube(v3).debit).all()
+
+    # rescan=True면 표본 밖 과거 행의 수정도 반영
+    v4 = v3.copy()
+    v4.loc[4, "mn_bungae1"] += 7
+    snapshot = inc.update(v4, card(90), rescan=True)
+    assert snapshot.stats.hashed_rows == len(v4) + 90 and snapshot.stats.added_vouchers == 1
+    assert (inc.cube.debit == analysis.build_monthly_cube(v4).debit).all()
+
+    # 보관 중인 분개장을 제자리에서 고친 경우는 전체 재계산
+    v4.loc[6, "mn_bungae1"] += 5
+    assert inc.update(v4, card(90), rescan=True).stats.full
+    assert (inc.cube.debit == analysis.build_monthly_cube(v4).debit).all()
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from src import analysis
+
+
+def test_merchant_ids_normalize_and_join():
+    from src.modules.ai_categorizer import calculate_confidence
+    from src.modules.merchant_ids import build_merchant_dictionary, normalize_merchant
+
+    assert normalize_merchant("（주）아트박스") == normalize_merchant("㈜ 아트박스 ") == normalize_merchant("아트박스 주식회사") == "아트박스"
+    assert normalize_merchant("농협카드(6215)") == "농협카드"
+    assert normalize_merchant("롤링파스타(수완점)") == "롤링파스타(수완점)"
+    assert normalize_merchant("주식회사") == "주식회사" and normalize_merchant(None) == ""
+
+    journal = pd.DataFrame({
+        "nm_trade": ["(주)아트박스", "(주)아트박스", "동네약국", "공급사A"],
+        "cd_trade": ["000735", "000735", "", "000900"],
+        "nm_acctit": ["소모품비(판)", "소모품비(판)", "복리후생비(판)", "원재료"],
+    })
+    card = pd.DataFrame({
+        "nm_trade": ["（주）아트박스", "동네 약국", "A공급 본점", "새가게"],
+        "cd_trade": ["0000000735", "", "0000000900", ""],
+        "bisocial_no": ["2148106825", "", "", "1234567890"],
+    })
+    merchants = build_merchant_dictionary(journal, card)
+    ids = merchants.lookup(card)
+    assert list(ids[:3]) == list(merchants.lookup(journal)[[0, 2, 3]])  # 이름 표기 차이, 거래처코드로 연결
+    assert merchants.id_of("", biz="214-81-06825") == ids[0]
+    assert len(merchants) == 4
+
+    history = {"(주)아트박스": "소모품비(판)", "동네약국": "복리후생비(판)", "공급사A": "원재료"}
+    card["da_sbook"], card["mn_total"], card["ty_jungstat"] = "20250301", 1000, 2
+    missing = analysis.analyze_card_gap(pd.DataFrame({"da_date": ["20250101"], "mn_bungae1": [1]}), card, history,
+                                        merchants=merchants).missing
+    assert missing["전년도이력"].tolist() == ["소모품비(판)", "복리후생비(판)", "원재료", ""]
+    # 이름 정규화만으로도 조인 (사전 없이)
+    assert analysis.analyze_card_gap(pd.DataFrame({"da_date": ["20250101"], "mn_bungae1": [1]}), card,
+                                     history).missing["전년도이력"].tolist()[:2] == ["소모품비(판)", "복리후생비(판)"]
+
+    assert calculate_confidence(journal, "㈜아트박스", "소모품비(판)") == (100.0, "동일 거래처 2건 중 2건이 해당 계정 사용")
@@ -0,0 +1,35 @@
+import re
+
+import pandas as pd
+import pytest
+
+from src.modules.merchant_search import MerchantNgramIndex, literal_alternatives
+
+NAMES = pd.Series([
+    "스타벅스 강남점", "이디야커피", "(주)아트박스", "카페 드롭탑", "A+B마트", "cafe.com", "Cafe Mama",
+    "카", "GS25", "다이소(6215)", "커피빈|역삼", "홈플러스마트", "주유소",
+])
+
+
+@pytest.mark.parametrize("pattern", [
+    "카",               # 한 글자
+    "커피", "마트", "ca",  # bigram
+    "스타벅스|이디야|홈플", "카페|",  # 리터럴 OR (빈 대안은 전체 일치)
+    "(주)", "A+B", r"\d{4}", "마트$", "^카", "cafe.com", r"커피빈\|역삼",  # 정규식 메타 문자 → 전체 검사
+])
+@pytest.mark.filterwarnings("ignore:This pattern is interpreted as a regular expression")
+def test_index_search_matches_str_contains(pattern):
+    index = MerchantNgramIndex(NAMES)
+    expected = NAMES[NAMES.str.contains(pattern, regex=True)].index.tolist()
+    assert index.search(pattern) == expected
+
+    ignore_case = NAMES[NAMES.str.contains(pattern, regex=True, case=False)].index.tolist()
+    assert index.search(re.compile(pattern, re.IGNORECASE)) == ignore_case
+
+
+def test_literal_alternatives_splits_only_plain_or_patterns():
+    assert literal_alternatives("스타벅스|이디야") == ["스타벅스", "이디야"]
+    assert literal_alternatives("카페") == ["카페"]
+    assert literal_alternatives("(주)") is None and literal_alternatives("마트$") is None
+    assert MerchantNgramIndex(NAMES).search_literal("CAFE") == [5, 6]
+    assert MerchantNgramIndex(NAMES).search_literal("CAFE", case_sensitive=True) == []
@@ -0,0 +1,34 @@
+import json
+import time
+
+from src.modules.profiling import Profiler
+
+
+def test_profiler_records_nested_stages_and_exports_json(tmp_path):
+    profiler = Profiler(enabled=True)
+    with profiler.stage("load") as record:
+        rows = profiler.timed("parse", lambda: list(range(1000)), rows=len)
+        record.rows = len(rows)
+        time.sleep(0.002)
+    assert profiler.timed("tax", lambda: 42) == 42
+
+    assert [(r.stage, r.depth, r.rows) for r in profiler.records] == [("load", 0, 1000), ("parse", 1, 1000), ("tax", 0, None)]
+    load = profiler.records[0]
+    assert load.ms >= profiler.records[1].ms and load.ms >= 2
+    assert profiler.total_ms == round(load.ms + profiler.records[2].ms, 2)
+
+    frame = profiler.to_frame()
+    assert frame["단계"].tolist() == ["load", "  parse", "tax"]
+    assert frame["처리량(행/초)"].iloc[1] > 0 and frame["행 수"].isna().iloc[2]
+
+    path = tmp_path / "profile.json"
+    assert json.loads(profiler.to_json(path)) == json.loads(path.read_text(encoding="utf-8"))
+    assert json.loads(path.read_text(encoding="utf-8"))["stages"][1]["stage"] == "parse"
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler(enabled=False)
+    with profiler.stage("load", rows=3) as record:
+        record.rows = 5
+    assert profiler.timed("tax", lambda: 1, rows=len) == 1
+    assert profiler.records == [] and profiler.to_frame().empty and profiler.total_ms == 0
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks import startup
+
+
+def test_ai_sdk_and_plotly_not_loaded_by_app_modules():
+    code = ("import sys, utils, src.modules, tabs.tab2_card, tabs.tab3_tax; "
+            "print('google.generativeai' in sys.modules, 'plotly' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], cwd=startup.ROOT_DIR,
+                         capture_output=True, text=True, check=True)
+    # plotly는 streamlit이 자체 로드하므로 genai만 엄격히 검사
+    assert out.stdout.split()[0] == "False"
+
+
+def test_check_regression_uses_overhead_against_baseline():
+    result = {"eager_heavy": [], "overhead_ms": 200.0, "total_ms": 1500.0}
+    assert startup.check_regression(result, {"overhead_ms": 100.0}) == []  # 허용 100 × 1.5 + 100
+    assert startup.check_regression(result, {}) == []
+    problems = startup.check_regression({**result, "overhead_ms": 300.0, "eager_heavy": ["google.generativeai"]},
+                                        {"overhead_ms": 100.0})
+    assert len(problems) == 2 and "google.generativeai" in problems[0]
+    assert startup.median([3.0, 1.0, 2.0]) == 2.0 and startup.median([1.0, 2.0, 4.0, 10.0]) == 3.0
+
+
+@pytest.mark.benchmark
+def test_app_cold_start_does_not_regress():
+    result = startup.measure()
+    assert startup.check_regression(result, startup.load_baseline()) == []
@@ -0,0 +1,71 @@
+import pytest
+
+from src import analysis
+
+
+def test_forecast_and_tax_scenarios():
+    forecast = analysis.forecast_landing(90_000_000, 45_000_000, 100_000_000, 900_000, months_passed=9)
+    assert forecast.final_rev_baseline == 120_000_000
+    assert forecast.method_used == "평균법"
+    assert forecast.exp_future == (45_000_000 + 900_000) / 9 * 3
+
+    results = analysis.simulate_all_scenarios(forecast, 900_000, 0, 0, 0)
+    assert list(results) == analysis.SCENARIOS
+    s3 = results["S3(합리적 보수)"]
+    assert s3.scenario.final_exp == 60_000_000 + 1_200_000
+    assert s3.tax_base == 120_000_000 - 61_200_000
+    assert s3.total_tax == analysis.calculate_tax(s3.tax_base) * 1.1
+    assert results["S1(극단적 보수)"].tax_base > s3.tax_base
+
+
+def test_vectorized_tax_engine_matches_scenarios():
+    assert analysis.calculate_tax(0) == 0
+    assert analysis.calculate_tax(14000000) == pytest.approx(840000)
+    assert analysis.calculate_tax(60000000) == pytest.approx(60000000 * 0.24 - 5760000)
+    assert list(analysis.income_tax([-1, 50000000, 600000000])) == pytest.approx([0, 6240000, 600000000 * 0.42 - 35940000])
+
+    forecast = analysis.forecast_landing(90000000, 45000000, 0, 900000)
+    results = analysis.simulate_all_scenarios(forecast, 900000, 1000000, 2000000, 500000)
+    sweep = analysis.sweep_scenarios(
+        forecast, 900000, 1000000, 2000000, 500000,
+        revenue_haircut=[0.0, 0.05], gap_ratio=[0.0, 1.0], extra_spend=[0, 4000000]
+    )
+    assert len(sweep) == 8
+    frame = sweep.to_frame().set_index(['매출 감소율', '누락 반영률', '추가 지출'])
+    assert frame.loc[(0.0, 1.0, 0), '예상 세액'] == pytest.approx(results["S3(합리적 보수)"].total_tax)
+    assert frame.loc[(0.05, 1.0, 4000000), '예상 세액'] == pytest.approx(results["S4(전략적)"].total_tax)
+
+
+def test_bracket_drop_point_and_curve():
+    drop = analysis.bracket_drop_point(60000000)
+    assert (drop.current_rate, drop.lower_rate) == (0.24, 0.15)
+    assert drop.spend_needed == pytest.approx(10000000)
+    assert drop.tax_saved == pytest.approx((analysis.calculate_tax(60000000) - analysis.calculate_tax(50000000)) * 1.1)
+    assert analysis.bracket_drop_point(5000000).spend_needed == 0
+
+    curve = analysis.tax_curve(60000000, max_spend=20000000, points=5)
+    assert list(curve.marginal_rate) == [0.24, 0.24, 0.15, 0.15, 0.15]
+    assert (curve.total_tax[:-1] >= curve.total_tax[1:]).all()
+
+
+def test_tax_return_parser_and_inputs():
+    rec = {
+        "PAGE_1": {"GRP_4": [
+            {"page": 1, "grp": 4, "code": 1, "mn_1": 1000, "mn_2": 400, "mn_3": 600, "str_5": "111", "str_4": "본점"},
+            {"page": 1, "grp": 4, "code": 2, "mn_1": 300, "mn_2": 100, "mn_3": 200, "str_5": "222", "str_4": "부업"},
+            {"page": 1, "grp": 4, "code": 3, "mn_1": 0, "str_5": ""},
+        ], "GRP_5": []},
+        "PAGE_9": {"GRP_1": [
+            {"page": 9, "grp": 1, "code": 1, "mn_1": "850"},
+            {"page": 9, "grp": 1, "code": 2, "mn_1": 150},
+        ]},
+    }
+    table = analysis.parse_tax_return(rec)
+    assert table.get(1, 4, 2, "str_4") == "부업"
+    assert table.get(1, 4, 3, "mn_1") == 0 and table.codes(1, 4) == [1, 2]
+    assert list(analysis.business_income(table)["소득금액"]) == [600, 200]
+
+    # 타소득 = 종합소득금액 - 주사업장 소득금액, 소득공제 = 신고서 합계
+    assert analysis.tax_inputs_from_return(table) == (250, 150)
+    assert analysis.tax_inputs_from_return(table, main_business="222") == (650, 150)
+    assert analysis.tax_inputs_from_return(analysis.parse_tax_return(None)) == (0, 0)
@@ -1,8 +1,28 @@
 import pandas as pd
 import json
 import os
-import google.generativeai as genai
-from collections import Counter
+from src.modules.data_loader import load_json_columns
+# 계산 로직은 src.analysis로 이동 - 기존 호출부(utils.calculate_financials 등)를 위해 다시 내보냄 (__all__ 참고)
+from src.analysis import (
+    SCENARIOS, STATUS_NAMES, build_history_map, calculate_financials,
+    calculate_tax, get_status_name, parse_income_statement
+)
+from src.analysis import analyze_card_gap as _analyze_card_gap
+
+__all__ = [
+    'JOURNAL_COLUMNS', 'CARD_COLUMNS',
+    'load_json_file', 'load_local_or_uploaded', 'load_frame_local_or_uploaded', 'preprocess_journal',
+    'analyze_card_gap', 'categorize_expenses_with_ai',
+    # src.analysis 재내보내기
+    'SCENARIOS', 'STATUS_NAMES', 'build_history_map', 'calculate_financials', 'calculate_tax', 'get_status_name',
+    'parse_income_statement',
+]
+
+# 분석에 사용하는 컬럼 (대용량 분개장/카드 파일은 이 컬럼만 스트리밍으로 읽음)
+JOURNAL_COLUMNS = ['da_date', 'month', 'no_acct', 'cd_acctit', 'nm_acctit', 'nm_trade', 'cd_trade',
+                   'mn_bungae1', 'mn_bungae2', 'nm_remark', 'nm_gubun_prn']
+CARD_COLUMNS = ['da_sbook', 'mn_total', 'ty_jungstat', 'nm_trade', 'cd_trade',
+                'bizcond', 'bizcate', 'nm_acctit_cha', 'sq_sbook', 'bisocial_no']
 
 # --- 데이터 로드 ---
 def load_json_file(uploaded_file):
@@ -25,10 +45,19 @@ def load_local_or_uploaded(uploaded_file, default_path):
                 return None
     return None
 
+def load_frame_local_or_uploaded(uploaded_file, default_path, columns=None):
+    # json.load 없이 배열을 원소 단위로 읽어 필요한 컬럼만 DataFrame으로 구성
+    if uploaded_file is None and not os.path.exists(default_path):
+        return pd.DataFrame()
+    try:
+        return load_json_columns(uploaded_file if uploaded_file is not None else default_path, columns)
+    except Exception:
+        return pd.DataFrame()
+
 # --- 데이터 전처리 ---
 def preprocess_journal(data):
-    if not data: return pd.DataFrame()
-    df = pd.DataFrame(data)
+    if data is None or len(data) == 0: return pd.DataFrame()
+    df = data.copy(deep=False) if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
     cols = ['mn_bungae1', 'mn_bungae2']
     for c in cols:
         if c in df.columns:
@@ -44,113 +73,16 @@ def preprocess_journal(data):
         return df[~mask].copy()
     return df
 
-def calculate_financials(df):
-    if df.empty: return 0, 0
-    if 'cd_acctit' in df.columns:
-        df['cd_acctit'] = df['cd_acctit'].astype(str)
-        rev_df = df[df['cd_acctit'].str.startswith('4', na=False)]
-        revenue = (rev_df['mn_bungae2'] - rev_df['mn_bungae1']).sum()
-        exp_df = df[df['cd_acctit'].str.startswith(('5','8','9'), na=False)]
-        expense = (exp_df['mn_bungae1'] - exp_df['mn_bungae2']).sum()
-        return revenue, expense
-    return 0, 0
-
-def parse_income_statement(pl_data):
-    rev_24 = 0
-    exp_24 = 0
-    if not pl_data: return 0, 0
-    for item in pl_data:
-        name = item.get('nm_acctit', '')
-        val_24 = item.get('mn_btotal2', 0)
-        if "매출액" in name and "매출원가" not in name:
-             rev_24 = val_24
-        elif "판매비와" in name or "판관비" in name:
-             exp_24 += val_24
-        elif "영업외비용" in name:
-             exp_24 += val_24
-    return rev_24, exp_24
-
-# --- 카드 분석 ---
-def build_history_map(df_2024):
-    if df_2024.empty or 'nm_trade' not in df_2024.columns: return {}
-    history = {}
-    grouped = df_2024.groupby('nm_trade')['nm_acctit'].apply(list)
-    for merchant, accounts in grouped.items():
-        if not merchant or merchant.strip() == "": continue
-        most_common = Counter(accounts).most_common(1)[0][0]
-        history[merchant.strip()] = most_common
-    return history
-
-def get_status_name(code):
-    mapping = {1: "미추천", 2: "확정", 3: "확정가능", 5: "삭제전표", 6: "불공제"}
-    return mapping.get(code, f"기타({code})")
-
-def analyze_card_gap(df_journal, card_data, history_map):
-    if df_journal.empty or not card_data: return 0, pd.DataFrame()
-    
-    # 데이터 구조 확인 (리스트인지 딕셔너리인지)
-    card_list = card_data if isinstance(card_data, list) else card_data.get('data', [])
-    if not card_list: return 0, pd.DataFrame()
-    
-    df_card = pd.DataFrame(card_list)
-    
-    if 'da_date' in df_journal.columns and 'mn_bungae1' in df_journal.columns:
-        journal_keys = set(df_journal['da_date'] + "_" + df_journal['mn_bungae1'].astype(int).astype(str))
-    else:
-        journal_keys = set()
-    
-    unmatched_items = []
-    total_gap = 0
-    
-    for _, row in df_card.iterrows():
-        key = str(row.get('da_sbook','')) + "_" + str(int(row.get('mn_total', 0)))
-        status_code = row.get('ty_jungstat', 0)
-        
-        if status_code == 2 and key not in journal_keys:
-            merchant = str(row.get('nm_trade', '')).strip()
-            
-            # 업종 정보 (질문하신 내용 반영)
-            biz_cond = str(row.get('bizcond', '')).strip()
-            biz_cate = str(row.get('bizcate', '')).strip()
-            industry = f"{biz_cond} / {biz_cate}" if biz_cond or biz_cate else ""
-            
-            # 비고란 로직 (전년도 > 추천 > 미분류)
-            history_hint = history_map.get(merchant, "")
-            acct_hint = str(row.get('nm_acctit_cha', '')).strip()
-            
-            remark_display = ""
-            if history_hint:
-                remark_display = f"💡전년도: {history_hint}"
-            elif acct_hint:
-                remark_display = f"추천: {acct_hint}"
-            else:
-                remark_display = "미분류"
-
-            unmatched_items.append({
-                "일자": row.get('da_sbook', ''),
-                "거래처": merchant,
-                "업종(업태/종목)": industry,
-                "금액": row.get('mn_total', 0),
-                "전표상태": get_status_name(status_code),
-                "비고(AI힌트)": remark_display,
-                "전년도이력": history_hint
-            })
-            total_gap += row.get('mn_total', 0)
-            
-    return total_gap, pd.DataFrame(unmatched_items)
-
-# --- 세금 및 AI ---
-def calculate_tax(base):
-    if base <= 0: return 0
-    elif base <= 14000000: return base * 0.06
-    elif base <= 50000000: return base * 0.15 - 1260000
-    elif base <= 88000000: return base * 0.24 - 5760000
-    elif base <= 150000000: return base * 0.35 - 15440000
-    else: return base * 0.38 - 19940000
+# 손익 집계/예측/세금/카드 누락 계산은 src.analysis 패키지로 이동 (UI 독립)
+def analyze_card_gap(df_journal, card_data, history_map, date_window=None, amount_tol=0):
+    result = _analyze_card_gap(df_journal, card_data, history_map, date_window, amount_tol)
+    return result.total_gap, result.missing
 
+# --- AI ---
 def categorize_expenses_with_ai(api_key, unknown_items):
     if not api_key: return "API 키가 필요합니다."
     try:
+        import google.generativeai as genai  # 무거운 SDK는 AI 호출 시점에만 로드
         genai.configure(api_key=api_key)
         prompt = f"""
         당신은 회계 전문가입니다. 아래 신용카드 사용 내역을 보고 적절한 '계정과목'을 추천해주세요.